@@ -2,13 +2,34 @@
 PawStars 만세력 기반 강아지 삼주 분석 FastAPI 서버
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
 from datetime import datetime
 
-from app.routers import pets, pillars
+from app.middleware.admission import AdmissionControlMiddleware, admission_controller
+from app.middleware.compression import CompressionMiddleware, PrecompressedJSON
+from app.middleware.request_log import RequestLogMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.routers import calendar, pets, pillars
+from app.services.event_log import describe_error, event_log, mark
+from app.services.pet_registry import pet_registry
+from app.services.pillars_service import get_pillars_service
+from app.services.tracing import tracer
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 수명 주기: 시작 시 만세력 로드/인덱스 생성을 백그라운드로 시작하고(포트는 바로 열림),
+    종료 시 등록부의 대기 중인 쓰기와 남은 로그 이벤트/추적 스팬을 저장
+    """
+    get_pillars_service().start_warmup()
+    yield
+    pet_registry.flush()
+    event_log.flush()
+    tracer.flush()
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -43,6 +64,7 @@ app = FastAPI(
     3. `/pet/compatibility` - 두 반려견 궁합 분석
     """,
     version="1.0.0",
+    lifespan=lifespan,
     contact={
         "name": "PawStars Team",
         "url": "https://github.com/your-repo/pawstars",
@@ -53,6 +75,9 @@ app = FastAPI(
     }
 )
 
+# 요청 수용 제어 (과부하 시 503 + Retry-After로 조기 거절, CORS보다 안쪽에 두어 거절 응답에도 CORS 헤더 포함)
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -62,48 +87,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (gzip, brotli 설치 시 br, PAWSTARS_COMPRESS_MIN_BYTES 이상만)
+app.add_middleware(CompressionMiddleware)
+
+# 요청 추적 (traceparent 전파, 표본 추출된 요청만 스팬 기록, 요청 로그 안쪽에 두어 trace_id를 함께 기록)
+app.add_middleware(TracingMiddleware, tracer=tracer)
+
+# 요청 로그 (가장 바깥, JSON lines 이벤트를 큐에 넣기만 하고 기록은 백그라운드 스레드에서)
+app.add_middleware(RequestLogMiddleware)
+
 # 라우터 등록
 app.include_router(pets.router)
 app.include_router(pillars.router)
+app.include_router(calendar.router)
+
+# 루트 정보 (배포 사이에 바뀌지 않으므로 한 번만 직렬화/압축)
+ROOT_INFO = PrecompressedJSON({
+    "message": "🐾 PawStars 강아지 삼주 분석 API",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "pet_register": "/pet/register",
+        "pillars_query": "/pillars/?date=YYYY-MM-DD",
+        "compatibility": "/pet/compatibility",
+        "daily_fortune": "/pet/daily-fortune/{pet_name}",
+        "traits": "/pet/traits",
+        "docs": "/docs",
+        "redoc": "/redoc"
+    }
+})
 
 @app.get("/", tags=["root"])
-async def root():
+async def root(request: Request):
     """
     API 루트 엔드포인트
     서버 상태 및 기본 정보 반환
     """
-    return {
-        "message": "🐾 PawStars 강아지 삼주 분석 API",
-        "version": "1.0.0",
-        "status": "running",
-        "timestamp": datetime.now().isoformat(),
-        "endpoints": {
-            "pet_register": "/pet/register",
-            "pillars_query": "/pillars/?date=YYYY-MM-DD",
-            "compatibility": "/pet/compatibility",
-            "daily_fortune": "/pet/daily-fortune/{pet_name}",
-            "docs": "/docs",
-            "redoc": "/redoc"
-        }
-    }
+    return ROOT_INFO.response(request.headers.get("accept-encoding", ""))
 
 @app.get("/health", tags=["health"])
 async def health_check():
     """
     헬스 체크 엔드포인트
-    서버 상태 및 의존성 확인
+    서버 상태 및 의존성 확인 (워밍업 중에는 기다리지 않고 상태만 반환)
     """
     try:
+        service = get_pillars_service()
+        warmup = service.warmup_status()
+        if not service.ready:
+            mark(warming_up=True)
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "status": "starting" if warmup["state"] != "failed" else "unhealthy",
+                    "timestamp": datetime.now().isoformat(),
+                    "services": {
+                        "pillars_service": warmup["state"],
+                        "warmup": warmup
+                    }
+                }
+            )
+        
         # 만세력 서비스 상태 확인
-        from app.services.pillars_service import pillars_service
-        date_range = pillars_service.get_available_date_range()
+        date_range = service.get_available_date_range()
         
         return {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "services": {
                 "pillars_service": "ok",
-                "data_range": date_range
+                "data_range": date_range,
+                "calendar": service.calendar_status(),
+                "warmup": warmup
             }
         }
     except Exception as e:
@@ -116,17 +171,61 @@ async def health_check():
             }
         )
 
+@app.get("/health/live", tags=["health"])
+async def liveness_check():
+    """
+    생존 확인 엔드포인트 (프로세스가 요청에 응답할 수 있으면 항상 200)
+    """
+    return {"status": "alive", "timestamp": datetime.now().isoformat()}
+
+@app.get("/health/ready", tags=["health"])
+async def readiness_check():
+    """
+    준비 상태 엔드포인트 (만세력 워밍업이 끝나야 200, 그 전에는 503)
+    """
+    warmup = get_pillars_service().warmup_status()
+    ready = warmup["state"] == "ready"
+    if not ready:
+        mark(warming_up=True)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "timestamp": datetime.now().isoformat(),
+            "warmup": warmup
+        }
+    )
+
+@app.get("/metrics", tags=["health"])
+async def metrics():
+    """
+    운영 지표 엔드포인트
+    동일 요청 병합(single-flight) 카운터, 요청 수용 제어 상태, 로그 큐 상태 등 반환
+    """
+    from app.services.single_flight import single_flight
+    
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "calendar": get_pillars_service().calendar_status(),
+        "single_flight": single_flight.get_stats(),
+        "admission": admission_controller.get_stats(),
+        "logging": event_log.get_stats(),
+        "tracing": tracer.get_stats()
+    }
+
 # 전역 예외 처리
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """
-    전역 예외 처리기
+    전역 예외 처리기 (내부 오류 내용은 서버 로그에만 남기고 응답에는 포함하지 않음)
     """
+    event_log.emit("unhandled_exception", level="error", method=request.method, path=request.url.path,
+                   error=describe_error(exc))
     return JSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
-            "detail": str(exc),
+            "detail": "서버 내부 오류가 발생했습니다.",
             "timestamp": datetime.now().isoformat()
         }
     )
@@ -138,6 +237,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        access_log=False
     )
 
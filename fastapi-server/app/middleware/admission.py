@@ -0,0 +1,284 @@
+"""
+적응형 요청 수용 제어(admission control) 미들웨어
+경로 등급(가벼운 조회 / 검색·집계)별로 동시 처리 수를 제한하고 대기열 대기 시간을 추적
+지연 시간 목표를 넘기면 동시 처리 한도를 줄여(AIMD) 초과 요청을 대기 없이 503 + Retry-After로 거절
+수용된 요청의 p99 지연을 안정적으로 유지하는 것이 목적
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from starlette.responses import JSONResponse
+
+from app.services.event_log import mark
+from app.services.playgroup_service import MAX_TIME_BUDGET
+
+# 제어하지 않는 경로 (상태 확인, 문서)
+EXEMPT_PATHS = ("/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+# 무거운 경로 (구간 스캔, 검색, 일괄 처리). 나머지는 모두 가벼운 조회로 분류
+HEAVY_PATH_PREFIXES = (
+    "/pillars/search",
+    "/pillars/query",
+    "/pillars/stats",
+    "/pet/auspicious-days",
+    "/pet/matches"
+)
+
+# 일괄 업로드 경로 (요청 하나가 업로드 시간만큼 길게 이어지므로 지연 목표 대신 고정 동시 처리 수로 제한)
+BULK_PATH_PREFIXES = (
+    "/pet/roster",
+)
+
+# 최적화 경로 (요청이 지정한 제한 시간 동안 일부러 계산을 계속하므로 지연 목표 대신 고정 동시 처리 수로 제한)
+OPTIMIZE_PATH_PREFIXES = (
+    "/pet/playgroups",
+)
+
+# 한도 조정 주기 (초)와 조정에 필요한 최소 표본 수
+ADJUST_INTERVAL = 1.0
+MIN_SAMPLES = 20
+
+def classify_route(path: str) -> Optional[str]:
+    """
+    요청 경로의 등급 ("cheap", "heavy", "bulk", "optimize", 제어 제외는 None)
+    """
+    if path in EXEMPT_PATHS or path.startswith("/docs") or path.startswith("/health"):
+        return None
+    if path.startswith(BULK_PATH_PREFIXES):
+        return "bulk"
+    if path.startswith(OPTIMIZE_PATH_PREFIXES):
+        return "optimize"
+    if path.startswith(HEAVY_PATH_PREFIXES):
+        return "heavy"
+    return "cheap"
+
+def _percentile(sorted_values: List[float], ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(ratio * len(sorted_values)))]
+
+class AdaptiveLimiter:
+    """
+    등급 하나의 동시 처리 한도와 대기열
+
+    - 한도 이내면 즉시 수용, 넘으면 max_queue까지 대기열에서 queue_timeout초 대기
+    - 대기열이 가득 찼거나 대기 시간이 초과되면 거절
+    - 직전 주기에 처리 지연이나 대기 시간이 목표를 넘었으면 대기열을 한도 크기로 줄임
+    - ADJUST_INTERVAL마다 처리 지연 p99가 latency_target을 넘으면 한도를 10% 줄이고,
+      목표 이내이면서 한도까지 사용 중이었으면 1씩 늘림
+    """
+
+    def __init__(self, name: str, limit: int, min_limit: int, max_limit: int,
+                 max_queue: int, queue_timeout: float, latency_target: float):
+        self.name = name
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # 조정 주기 동안의 표본
+        self._window_start = time.monotonic()
+        self._latencies: List[float] = []
+        self._queue_waits: List[float] = []
+        self._peak_in_flight = 0
+        self.latency_p99 = 0.0
+        self.queue_wait_p99 = 0.0
+        self.overloaded = False
+
+    async def acquire(self) -> bool:
+        """
+        처리 슬롯 확보 (거절되면 False)
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self._admit(0.0)
+            return True
+
+        # 지연 목표를 넘긴 상태면 대기열을 한도만큼으로 줄여 초과 요청을 기다리게 하지 않고 바로 거절
+        queue_cap = min(self.max_queue, self.limit) if self.overloaded else self.max_queue
+        if len(self._waiters) >= queue_cap:
+            self.shed += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard_waiter(future)
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            # 슬롯을 넘겨받은 직후 취소되면 슬롯을 반납
+            if future.done() and not future.cancelled():
+                self.in_flight -= 1
+                self._wake_waiters()
+            else:
+                self._discard_waiter(future)
+            raise
+
+        # 슬롯은 release 쪽에서 in_flight에 이미 반영됨
+        self.admitted += 1
+        self._queue_waits.append(time.monotonic() - started)
+        return True
+
+    def _admit(self, queue_wait: float):
+        self.in_flight += 1
+        self.admitted += 1
+        self._peak_in_flight = max(self._peak_in_flight, self.in_flight)
+        self._queue_waits.append(queue_wait)
+
+    def _discard_waiter(self, future: asyncio.Future):
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+    def _wake_waiters(self):
+        while self._waiters and self.in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                self._peak_in_flight = max(self._peak_in_flight, self.in_flight)
+                future.set_result(None)
+
+    def release(self, latency: float):
+        """
+        처리 슬롯 반납 및 지연 시간 기록
+        """
+        self.in_flight -= 1
+        self._latencies.append(latency)
+        self._maybe_adjust()
+        self._wake_waiters()
+
+    def _maybe_adjust(self):
+        now = time.monotonic()
+        if now - self._window_start < ADJUST_INTERVAL or len(self._latencies) < MIN_SAMPLES:
+            return
+
+        self.latency_p99 = _percentile(sorted(self._latencies), 0.99)
+        self.queue_wait_p99 = _percentile(sorted(self._queue_waits), 0.99)
+
+        self.overloaded = (
+            self.latency_p99 > self.latency_target or self.queue_wait_p99 > self.latency_target
+        )
+        if self.latency_p99 > self.latency_target:
+            self.limit = max(self.min_limit, min(self.limit - 1, int(self.limit * 0.9)))
+        elif self._peak_in_flight >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+        self._window_start = now
+        self._latencies = []
+        self._queue_waits = []
+        self._peak_in_flight = self.in_flight
+
+    def retry_after(self) -> int:
+        """
+        거절 응답의 Retry-After (초): 대기열이 한 번 비워지는 데 걸릴 예상 시간
+        """
+        backlog = (len(self._waiters) + self.in_flight) / max(1, self.limit)
+        return max(1, min(30, math.ceil(backlog * max(self.latency_p99, self.latency_target))))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "latency_p99_ms": round(self.latency_p99 * 1000, 2),
+            "queue_wait_p99_ms": round(self.queue_wait_p99 * 1000, 2),
+            "overloaded": self.overloaded,
+            "latency_target_ms": round(self.latency_target * 1000, 2)
+        }
+
+class AdmissionController:
+    """
+    경로 등급별 AdaptiveLimiter 묶음
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get("PAWSTARS_ADMISSION_CONTROL", "1") != "0"
+        self.limiters = {
+            "cheap": AdaptiveLimiter(
+                "cheap", limit=64, min_limit=4, max_limit=256, max_queue=256,
+                queue_timeout=0.5,
+                latency_target=float(os.environ.get("PAWSTARS_CHEAP_LATENCY_TARGET_MS", "100")) / 1000
+            ),
+            "heavy": AdaptiveLimiter(
+                "heavy", limit=8, min_limit=1, max_limit=32, max_queue=32,
+                queue_timeout=2.0,
+                latency_target=float(os.environ.get("PAWSTARS_HEAVY_LATENCY_TARGET_MS", "1000")) / 1000
+            ),
+            # 처리 시간이 업로드 크기에 비례하므로 지연 목표를 두지 않음 (한 시간 = 사실상 무제한)
+            "bulk": AdaptiveLimiter(
+                "bulk", limit=int(os.environ.get("PAWSTARS_BULK_CONCURRENCY", "2")), min_limit=1,
+                max_limit=int(os.environ.get("PAWSTARS_BULK_CONCURRENCY", "2")), max_queue=4,
+                queue_timeout=1.0, latency_target=3600.0
+            ),
+            # 처리 시간이 요청의 time_budget_ms(최대 MAX_TIME_BUDGET초)로 정해지므로 한도를 고정하고,
+            # 지연 목표는 최대 제한 시간에 반려견 분석 시간을 더한 값 이상으로 둠 (heavy 한도에 영향 없음)
+            "optimize": AdaptiveLimiter(
+                "optimize", limit=int(os.environ.get("PAWSTARS_OPTIMIZE_CONCURRENCY", "2")), min_limit=1,
+                max_limit=int(os.environ.get("PAWSTARS_OPTIMIZE_CONCURRENCY", "2")), max_queue=4,
+                queue_timeout=1.0, latency_target=MAX_TIME_BUDGET + 5.0
+            )
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            **{name: limiter.get_stats() for name, limiter in self.limiters.items()}
+        }
+
+class AdmissionControlMiddleware:
+    """
+    ASGI 미들웨어: 요청 경로 등급의 슬롯을 확보한 요청만 앱으로 전달
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        route_class = classify_route(scope["path"]) if scope["type"] == "http" else None
+        if route_class is None or not self.controller.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiters[route_class]
+        if not await limiter.acquire():
+            mark(shed=route_class)
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "error": "Service Unavailable",
+                    "detail": "요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                    "timestamp": datetime.now().isoformat()
+                },
+                headers={"Retry-After": str(limiter.retry_after())}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - started)
+
+# 전역 인스턴스 생성
+admission_controller = AdmissionController()
@@ -0,0 +1,235 @@
+"""
+응답 압축 미들웨어
+Accept-Encoding 협상으로 br(brotli 설치 시) 또는 gzip을 선택하고, 일정 크기 이상의 응답만 압축
+스트리밍 응답은 전체를 모으지 않고 청크 단위로 이어서 압축하며,
+배포 사이에 바뀌지 않는 응답(루트 정보, 성향 카탈로그)은 PrecompressedJSON으로 한 번만 압축해 재사용
+"""
+
+import gzip
+import json
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip만 사용
+    brotli = None
+
+# 이 크기(바이트) 미만의 응답은 압축하지 않음
+DEFAULT_MINIMUM_SIZE = int(os.environ.get("PAWSTARS_COMPRESS_MIN_BYTES", "1024"))
+
+# 스트리밍 응답에서 압축기를 비우는(flush) 입력 크기 단위
+STREAM_FLUSH_BYTES = 8 * 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/"
+)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding 헤더에서 사용할 압축 방식 선택 ("br", "gzip" 또는 None)
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = (("br",) if brotli is not None else ()) + ("gzip",)
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress_bytes(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    바이트 전체를 한 번에 압축
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+class _StreamCompressor:
+    """
+    스트리밍 응답용 증분 압축기
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self.pending = 0
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # 입력이 일정량 쌓일 때마다 비워서 클라이언트가 스트림을 점진적으로 받을 수 있게 함
+        self.pending += len(data)
+        flush = self.pending >= STREAM_FLUSH_BYTES
+        if flush:
+            self.pending = 0
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            return out + self._compressor.flush() if flush else out
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.finish()
+        return self._compressor.compress(data) + self._compressor.flush()
+
+class CompressionMiddleware:
+    """
+    ASGI 응답 압축 미들웨어
+
+    - 이미 Content-Encoding이 있는 응답(미리 압축된 응답)과 압축 대상이 아닌 형식은 그대로 전달
+    - 단일 본문 응답은 minimum_size 이상일 때만 압축
+    - 스트리밍 응답은 Content-Length를 제거하고 청크마다 이어서 압축
+    """
+
+    def __init__(self, app, minimum_size: int = DEFAULT_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size))
+
+class _CompressingSender:
+    """
+    응답 하나의 send 래퍼 (시작 메시지를 첫 본문까지 보류하여 압축 여부 결정)
+    """
+
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            await self._first_body(body, more_body, message)
+            return
+
+        if more_body:
+            data = self.compressor.compress(body)
+            if data:
+                await self.send({"type": "http.response.body", "body": data, "more_body": True})
+        else:
+            await self.send({"type": "http.response.body", "body": self.compressor.finish(body), "more_body": False})
+
+    async def _first_body(self, body: bytes, more_body: bool, message):
+        start, self.start_message = self.start_message, None
+        start["headers"] = list(start.get("headers", []))
+        headers = MutableHeaders(scope=start)
+
+        if "content-encoding" in headers or not _is_compressible(headers.get("content-type", "")):
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            if len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            compressed = compress_bytes(body, self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": False})
+            return
+
+        # 스트리밍: 크기를 미리 알 수 있고 작으면 압축하지 않음
+        content_length = headers.get("content-length")
+        if content_length is not None and int(content_length) < self.minimum_size:
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        self.compressor = _StreamCompressor(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        await self.send(start)
+        data = self.compressor.compress(body)
+        if data:
+            await self.send({"type": "http.response.body", "body": data, "more_body": True})
+
+class PrecompressedJSON:
+    """
+    바뀌지 않는 JSON 응답 본문을 인코딩별로 한 번만 만들어 재사용
+    """
+
+    def __init__(self, content: Any):
+        # JSONResponse와 같은 직렬화 방식
+        self.body = json.dumps(
+            content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        self.variants: Dict[str, bytes] = {"gzip": compress_bytes(self.body, "gzip", level=9)}
+        if brotli is not None:
+            self.variants["br"] = compress_bytes(self.body, "br", level=11)
+
+    def response(self, accept_encoding: str = "") -> Response:
+        """
+        요청의 Accept-Encoding에 맞는 미리 압축된 응답
+        """
+        encoding = negotiate_encoding(accept_encoding)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding in self.variants:
+            headers["Content-Encoding"] = encoding
+            return Response(self.variants[encoding], media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
@@ -0,0 +1,52 @@
+"""
+요청 로그 미들웨어
+요청마다 라우트, 상태 코드, 처리 시간, 단계별 시간, 캐시 적중 여부, 만세력 버전을 이벤트 로그 큐에 넣음
+(uvicorn 접근 로그 대신 사용, 기록은 백그라운드 스레드가 담당)
+"""
+
+import time
+
+from app.services.event_log import begin_request, event_log
+from app.services.pillars_service import get_pillars_service
+
+class RequestLogMiddleware:
+    """
+    ASGI 미들웨어: 가장 바깥에 두어 수용 제어 거절(503)과 압축까지 포함한 시간을 기록
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = begin_request()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            route = scope.get("route")
+            stages = context.pop("stages")
+            fields = {
+                "method": scope["method"],
+                "route": getattr(route, "path", None),
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+                "data_version": get_pillars_service().loaded_data_version
+            }
+            if stages:
+                fields["stages_ms"] = {name: round(seconds * 1000, 3) for name, seconds in stages.items()}
+            fields.update(context)
+            event_log.request(status_code, duration_ms, fields)
@@ -0,0 +1,56 @@
+"""
+요청 추적 미들웨어
+traceparent 헤더를 이어받아 요청 루트 스팬을 열고, 표본 추출된 요청은 응답에 traceparent를 돌려줌
+(루트 스팬 이름은 라우팅이 끝난 뒤 "METHOD /route/{param}" 형식으로 정함)
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.services.event_log import describe_error, mark
+from app.services.tracing import Tracer
+
+class TracingMiddleware:
+    """
+    ASGI 미들웨어: 요청 로그 미들웨어 안쪽에 두어 요청 이벤트에 trace_id를 함께 기록
+    """
+
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = self.tracer.start_request(
+            f"{scope['method']} {scope['path']}",
+            Headers(scope=scope).get("traceparent"),
+            {"http.method": scope["method"], "url.path": scope["path"]}
+        )
+        if started is None:
+            await self.app(scope, receive, send)
+            return
+
+        root = started[0]
+        mark(trace_id=root.trace_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                headers = MutableHeaders(scope=message)
+                headers["traceparent"] = root.traceparent
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            error = describe_error(e)
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+                root.set_attribute("http.route", route.path)
+            self.tracer.finish_request(started, error)
@@ -2,36 +2,107 @@
 API 요청/응답 스키마 정의
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, field_validator, model_validator
+from pydantic_core import PydanticCustomError
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import date, datetime
+
+from app.utils.lunar_calendar import resolve_calendar_date
+
+def _value_error(field: str, value: Any, message: str) -> Dict[str, Any]:
+    """
+    모델 검증기에서 특정 필드 위치로 보고할 오류 (필드 검증기의 ValueError와 같은 형태)
+    """
+    return {
+        "type": PydanticCustomError("value_error", "Value error, {error}", {"error": message}),
+        "loc": (field,),
+        "input": value
+    }
 
 class PetRegistrationRequest(BaseModel):
     """반려견 등록 요청 스키마"""
     name: str = Field(..., min_length=1, max_length=50, description="반려견 이름")
     breed: str = Field(..., min_length=1, max_length=100, description="견종")
     gender: str = Field(..., description="성별 (male 또는 female)")
-    birth_date: str = Field(..., description="생년월일 (YYYY-MM-DD 형식)")
+    birth_date: str = Field(..., description="생년월일 (YYYY-MM-DD 형식, calendar_type이 lunar이면 음력)")
+    calendar_type: str = Field(default="solar", description="생년월일 달력 종류 (solar: 양력, lunar: 음력)")
+    is_leap_month: bool = Field(default=False, description="음력 윤달 여부 (calendar_type이 lunar일 때만)")
+    birth_time: Optional[str] = Field(None, description="출생 시각 (HH:MM 형식, 입력 시 시주까지 사주 분석)")
+    zasi_mode: Optional[str] = Field(None, description="야자시(23시대) 처리 방식 (next_day 또는 same_day, 기본값: 서버 설정)")
+    issue_token: bool = Field(default=False, description="프로필 토큰 발급 여부 (운세/궁합 조회 시 생년월일 대신 사용)")
+    owner_id: Optional[str] = Field(None, min_length=1, max_length=100, description="보호자 ID (지정하면 반려견 등록부에 저장)")
+    
+    _birth_day: Optional[date] = PrivateAttr(None)
+    _birth_clock: Optional[Tuple[int, int]] = PrivateAttr(None)
     
-    @validator('gender')
+    @field_validator('gender')
+    @classmethod
     def validate_gender(cls, v):
         if v not in ['male', 'female']:
             raise ValueError('성별은 male 또는 female이어야 합니다')
         return v
     
-    @validator('birth_date')
-    def validate_birth_date(cls, v):
-        try:
-            datetime.strptime(v, '%Y-%m-%d')
-        except ValueError:
-            raise ValueError('생년월일은 YYYY-MM-DD 형식이어야 합니다')
+    @field_validator('zasi_mode')
+    @classmethod
+    def validate_zasi_mode(cls, v):
+        if v is not None and v not in ['next_day', 'same_day']:
+            raise ValueError('야자시 처리 방식은 next_day 또는 same_day이어야 합니다')
+        return v
+    
+    @field_validator('calendar_type')
+    @classmethod
+    def validate_calendar_type(cls, v):
+        if v not in ['solar', 'lunar']:
+            raise ValueError('달력 종류는 solar 또는 lunar이어야 합니다')
         return v
+    
+    @model_validator(mode='after')
+    def parse_birth_moment(self):
+        """
+        생년월일/출생 시각을 한 번만 파싱하여 분석 파이프라인에 전달 (birth_day, birth_clock)
+        음력 생년월일은 여기서 양력으로 변환
+        """
+        errors = []
+        if self.calendar_type == 'lunar':
+            try:
+                self._birth_day = resolve_calendar_date(self.birth_date, 'lunar', self.is_leap_month)
+            except ValueError as e:
+                errors.append(_value_error('birth_date', self.birth_date, str(e)))
+        else:
+            if self.is_leap_month:
+                errors.append(_value_error('is_leap_month', self.is_leap_month, '윤달은 음력 생년월일에만 지정할 수 있습니다'))
+            try:
+                self._birth_day = datetime.strptime(self.birth_date, '%Y-%m-%d').date()
+            except ValueError:
+                errors.append(_value_error('birth_date', self.birth_date, '생년월일은 YYYY-MM-DD 형식이어야 합니다'))
+        
+        if self.birth_time is not None:
+            try:
+                parsed = datetime.strptime(self.birth_time, '%H:%M')
+                self._birth_clock = (parsed.hour, parsed.minute)
+            except ValueError:
+                errors.append(_value_error('birth_time', self.birth_time, '출생 시각은 HH:MM 형식이어야 합니다'))
+        
+        if errors:
+            raise ValidationError.from_exception_data(type(self).__name__, errors)
+        return self
+    
+    @property
+    def birth_day(self) -> date:
+        """파싱된 생년월일 (양력)"""
+        return self._birth_day
+    
+    @property
+    def birth_clock(self) -> Optional[Tuple[int, int]]:
+        """파싱된 출생 시각 (시, 분)"""
+        return self._birth_clock
 
 class PillarsInfo(BaseModel):
-    """삼주 정보 스키마"""
+    """삼주 정보 스키마 (출생 시각이 있으면 시주 포함)"""
     year: str = Field(..., description="년주")
     month: str = Field(..., description="월주")
     day: str = Field(..., description="일주")
+    hour: Optional[str] = Field(None, description="시주 (출생 시각 입력 시)")
 
 class ShinsalInfo(BaseModel):
     """신살 정보 스키마"""
@@ -45,8 +116,10 @@ class PetAnalysisResponse(BaseModel):
     breed: str = Field(..., description="견종")
     gender: str = Field(..., description="성별")
     birth_date: str = Field(..., description="생년월일")
+    birth_time: Optional[str] = Field(None, description="출생 시각")
     pillars: PillarsInfo = Field(..., description="삼주 정보")
     five_element: str = Field(..., description="오행")
+    element_balance: Optional[Dict[str, int]] = Field(None, description="전체 간지의 오행 분포")
     temperament: str = Field(..., description="성향 분석")
     activity_tip: str = Field(..., description="활동 팁")
     shinsal: Dict[str, bool] = Field(..., description="신살 보유 현황")
@@ -54,6 +127,8 @@ class PetAnalysisResponse(BaseModel):
     shinsal_summary: str = Field(..., description="신살 종합 요약")
     analysis_date: str = Field(..., description="분석 일시")
     jeolki: str = Field(default="", description="절기 정보")
+    profile_token: Optional[str] = Field(None, description="서명된 프로필 토큰 (issue_token 요청 시)")
+    pet_id: Optional[str] = Field(None, description="반려견 등록부 ID (owner_id 지정 시)")
 
 class PillarsQueryResponse(BaseModel):
     """삼주 조회 응답 스키마"""
@@ -67,12 +142,42 @@ class DateRangeResponse(BaseModel):
     start_date: str = Field(..., description="시작 날짜")
     end_date: str = Field(..., description="종료 날짜")
 
+class GanziQueryResponse(BaseModel):
+    """간지 조건 검색 응답 스키마"""
+    total: int = Field(..., description="조건을 만족하는 전체 날짜 수")
+    constraints: Dict[str, str] = Field(..., description="적용된 조건 (한자로 정규화)")
+    dates: List[str] = Field(..., description="조건을 만족하는 날짜 (limit/offset 적용)")
+
+class PopulationStatsGroup(BaseModel):
+    """모집단 통계 그룹 스키마"""
+    group: str = Field(..., description="그룹 (YYYY 또는 YYYY-MM)")
+    count: int = Field(..., description="일수")
+    elements: Dict[str, int] = Field(..., description="일간 오행 분포")
+    shinsal: Dict[str, int] = Field(..., description="신살별 해당 일수")
+    element_shinsal: Dict[str, Dict[str, int]] = Field(..., description="일간 오행별 신살 해당 일수 (두 조건을 함께 만족하는 일수)")
+    day_pillars: Optional[Dict[str, int]] = Field(None, description="일주 분포")
+
+class PopulationStatsResponse(BaseModel):
+    """모집단 통계 응답 스키마"""
+    start_date: str = Field(..., description="집계 시작 날짜")
+    end_date: str = Field(..., description="집계 종료 날짜")
+    group_by: str = Field(..., description="집계 단위 (year 또는 month)")
+    total: int = Field(..., description="전체 일수")
+    elements: Dict[str, int] = Field(..., description="전체 일간 오행 분포")
+    shinsal: Dict[str, int] = Field(..., description="전체 신살별 해당 일수")
+    element_shinsal: Dict[str, Dict[str, int]] = Field(..., description="전체 일간 오행별 신살 해당 일수")
+    groups: List[PopulationStatsGroup] = Field(..., description="그룹별 분포")
+
 class CompatibilityRequest(BaseModel):
     """궁합 분석 요청 스키마"""
     pet1_name: str = Field(..., description="첫 번째 반려견 이름")
-    pet1_birth_date: str = Field(..., description="첫 번째 반려견 생년월일")
+    pet1_birth_date: Optional[str] = Field(None, description="첫 번째 반려견 생년월일")
+    pet1_profile_token: Optional[str] = Field(None, description="첫 번째 반려견 프로필 토큰 (생년월일 대신 사용)")
+    pet1_id: Optional[str] = Field(None, description="첫 번째 반려견 등록부 ID (생년월일 대신 사용)")
     pet2_name: str = Field(..., description="두 번째 반려견 이름")
-    pet2_birth_date: str = Field(..., description="두 번째 반려견 생년월일")
+    pet2_birth_date: Optional[str] = Field(None, description="두 번째 반려견 생년월일")
+    pet2_profile_token: Optional[str] = Field(None, description="두 번째 반려견 프로필 토큰 (생년월일 대신 사용)")
+    pet2_id: Optional[str] = Field(None, description="두 번째 반려견 등록부 ID (생년월일 대신 사용)")
 
 class CompatibilityResponse(BaseModel):
     """궁합 분석 응답 스키마"""
@@ -91,6 +196,136 @@ class DailyFortuneResponse(BaseModel):
     daily_pillars: PillarsInfo = Field(..., description="오늘의 삼주")
     jeolki: str = Field(default="", description="절기 정보")
 
+class AuspiciousDaysRequest(BaseModel):
+    """좋은 날 찾기 요청 스키마"""
+    name: str = Field(..., min_length=1, max_length=50, description="반려견 이름")
+    birth_date: Optional[str] = Field(None, description="반려견 생년월일 (YYYY-MM-DD)")
+    profile_token: Optional[str] = Field(None, description="프로필 토큰 (생년월일 대신 사용)")
+    pet_id: Optional[str] = Field(None, description="반려견 등록부 ID (생년월일 대신 사용)")
+    start_date: Optional[str] = Field(None, description="탐색 시작 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    days: int = Field(default=90, ge=1, le=366, description="탐색 일수 (최대 366일)")
+    top_k: int = Field(default=5, ge=1, le=50, description="반환할 날짜 수")
+    purpose: Optional[str] = Field(None, description="목적 (grooming, travel, vet)")
+
+class AuspiciousDay(BaseModel):
+    """좋은 날 스키마"""
+    date: str = Field(..., description="날짜")
+    score: int = Field(..., description="반려견 사주와의 관계 점수 (높을수록 좋음)")
+    day_pillar: str = Field(..., description="그날의 일주")
+    relation: str = Field(..., description="반려견 일지와 그날 일지의 관계 (육합, 삼합, 충 등)")
+    jeolki: str = Field(default="", description="절기 정보")
+
+class AuspiciousDaysResponse(BaseModel):
+    """좋은 날 찾기 응답 스키마"""
+    pet_name: str = Field(..., description="반려견 이름")
+    pet_pillars: PillarsInfo = Field(..., description="반려견 사주")
+    start_date: str = Field(..., description="탐색 시작 날짜")
+    end_date: str = Field(..., description="탐색 종료 날짜")
+    purpose: Optional[str] = Field(None, description="목적")
+    days: List[AuspiciousDay] = Field(..., description="점수 순 좋은 날 목록")
+
+class LuckTimelineRequest(BaseModel):
+    """세운/대운 타임라인 요청 스키마"""
+    name: str = Field(..., min_length=1, max_length=50, description="반려견 이름")
+    birth_date: Optional[str] = Field(None, description="반려견 생년월일 (YYYY-MM-DD)")
+    profile_token: Optional[str] = Field(None, description="프로필 토큰 (생년월일 대신 사용, 대운 생략)")
+    pet_id: Optional[str] = Field(None, description="반려견 등록부 ID (생년월일 대신 사용)")
+    gender: str = Field(default="male", description="성별 (male 또는 female, 대운 순행/역행 판단)")
+    start_year: Optional[int] = Field(None, ge=1900, le=2200, description="시작 연도 (기본값: 올해)")
+    years: int = Field(default=20, ge=1, le=120, description="연수 (최대 120년)")
+    
+    @field_validator('gender')
+    @classmethod
+    def validate_gender(cls, v):
+        if v not in ['male', 'female']:
+            raise ValueError('성별은 male 또는 female이어야 합니다')
+        return v
+
+class LuckYear(BaseModel):
+    """연도별 세운 스키마"""
+    year: int = Field(..., description="연도")
+    age: Optional[int] = Field(None, description="나이 (연도 - 태어난 해)")
+    pillar: str = Field(..., description="연주 (입춘 기준)")
+    ten_god: str = Field(..., description="반려견 일간 기준 십신")
+    relation: str = Field(..., description="반려견 일지와 연지의 관계 (육합, 삼합, 충 등)")
+    score: int = Field(..., description="반려견 사주와 연주의 관계 점수")
+    decade_pillar: Optional[str] = Field(None, description="그해의 대운")
+    total_score: int = Field(..., description="세운 점수 + 대운 점수")
+
+class LuckDecade(BaseModel):
+    """대운 스키마"""
+    start_age: int = Field(..., description="시작 나이")
+    end_age: int = Field(..., description="끝 나이")
+    start_year: int = Field(..., description="시작 연도")
+    end_year: int = Field(..., description="끝 연도")
+    pillar: str = Field(..., description="대운 간지")
+    ten_god: str = Field(..., description="반려견 일간 기준 십신")
+    score: int = Field(..., description="반려견 사주와 대운의 관계 점수")
+
+class LuckTimelineResponse(BaseModel):
+    """세운/대운 타임라인 응답 스키마"""
+    pet_name: str = Field(..., description="반려견 이름")
+    pet_pillars: PillarsInfo = Field(..., description="반려견 사주")
+    start_year: int = Field(..., description="시작 연도")
+    end_year: int = Field(..., description="끝 연도")
+    decade_direction: Optional[str] = Field(None, description="대운 방향 (순행/역행, 생년월일이 없으면 null)")
+    decade_start_age: Optional[int] = Field(None, description="대운 시작 나이")
+    years: List[LuckYear] = Field(..., description="연도별 세운")
+    decades: List[LuckDecade] = Field(..., description="구간에 걸친 대운")
+
+class PlaygroupDog(BaseModel):
+    """놀이 그룹 편성 대상 반려견 스키마"""
+    name: str = Field(..., min_length=1, max_length=50, description="반려견 이름")
+    birth_date: Optional[str] = Field(None, description="반려견 생년월일 (YYYY-MM-DD)")
+    profile_token: Optional[str] = Field(None, description="프로필 토큰 (생년월일 대신 사용)")
+    pet_id: Optional[str] = Field(None, description="반려견 등록부 ID (생년월일 대신 사용)")
+    breed: str = Field(default="믹스", min_length=1, max_length=100, description="견종")
+
+class PlaygroupRequest(BaseModel):
+    """놀이 그룹 편성 요청 스키마"""
+    dogs: List[PlaygroupDog] = Field(..., min_length=1, max_length=1000, description="편성할 반려견 명단 (최대 1000마리)")
+    min_group_size: int = Field(default=2, ge=1, le=100, description="그룹 최소 크기")
+    max_group_size: int = Field(default=8, ge=1, le=100, description="그룹 최대 크기")
+    time_budget_ms: int = Field(default=2000, ge=10, le=10000, description="최적화 제한 시간 (밀리초, 최대 10초)")
+    seed: int = Field(default=0, ge=0, description="탐색 난수 시드 (같은 입력과 시드면 재현 가능)")
+
+class PlaygroupMember(BaseModel):
+    """놀이 그룹 구성원 스키마"""
+    index: int = Field(..., description="요청 명단에서의 순서 (0부터)")
+    name: str = Field(..., description="반려견 이름")
+    five_element: str = Field(..., description="일간 오행")
+    day_pillar: str = Field(..., description="일주")
+
+class Playgroup(BaseModel):
+    """놀이 그룹 스키마"""
+    group: int = Field(..., description="그룹 번호 (1부터)")
+    size: int = Field(..., description="구성원 수")
+    score: int = Field(..., description="그룹 안 쌍별 궁합 점수 합")
+    conflict_pairs: int = Field(..., description="궁합 점수가 음수인 쌍 수")
+    members: List[PlaygroupMember] = Field(..., description="구성원")
+
+class PlaygroupResponse(BaseModel):
+    """놀이 그룹 편성 응답 스키마"""
+    dog_count: int = Field(..., description="반려견 수")
+    group_count: int = Field(..., description="그룹 수")
+    total_score: int = Field(..., description="전체 그룹 점수 합 (최적화 목표)")
+    greedy_score: int = Field(..., description="탐욕 초기해의 점수 합")
+    improvements: int = Field(..., description="지역 탐색에서 적용한 이동/교환 수")
+    restarts: int = Field(..., description="흔들기 후 다시 탐색한 횟수")
+    elapsed_ms: float = Field(..., description="최적화 소요 시간 (밀리초)")
+    groups: List[Playgroup] = Field(..., description="편성된 그룹")
+
+class ElementTraitInfo(BaseModel):
+    """오행 성향 스키마"""
+    personality: str = Field(..., description="성향")
+    characteristics: List[str] = Field(..., description="특징")
+    activity_tips: str = Field(..., description="활동 팁")
+
+class TraitCatalogResponse(BaseModel):
+    """성향 카탈로그 응답 스키마"""
+    elements: Dict[str, ElementTraitInfo] = Field(..., description="오행별 성향")
+    breeds: Dict[str, str] = Field(..., description="견종별 기본 성향")
+
 class ErrorResponse(BaseModel):
     """에러 응답 스키마"""
     error: str = Field(..., description="에러 메시지")
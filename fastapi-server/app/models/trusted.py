@@ -0,0 +1,83 @@
+"""
+검증 생략(trusted) 응답 생성
+서비스가 상수 테이블로 이미 만든 결과를 응답 모델로 다시 검증하지 않고 model_construct로 조립한 뒤 바로 JSON으로 직렬화
+라우트의 response_model은 그대로 두므로 OpenAPI 스키마는 바뀌지 않음
+"""
+
+from typing import Any, Dict
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.models.schemas import PetAnalysisResponse, PillarsInfo, PillarsQueryResponse, ShinsalInfo
+from app.utils.mapping_tables import SEXAGENARY_CYCLE
+
+# 60갑자 간지 문자열 (같은 값은 같은 객체를 공유)
+_PILLAR_VALUES = {ganzi: ganzi for ganzi in SEXAGENARY_CYCLE}
+
+# 신살 판정 결과 객체 (신살, 보유 여부, 설명, 효과) -> ShinsalInfo, 규칙당 보유/미보유 두 가지
+_SHINSAL_INFOS: Dict[tuple, ShinsalInfo] = {}
+_MAX_SHINSAL_INFOS = 1024
+
+def trusted_pillars(pillars: Dict[str, str]) -> PillarsInfo:
+    """
+    검증 없이 PillarsInfo 조립
+    """
+    hour = pillars.get("hour")
+    return PillarsInfo.model_construct(
+        year=_PILLAR_VALUES.get(pillars["year"], pillars["year"]),
+        month=_PILLAR_VALUES.get(pillars["month"], pillars["month"]),
+        day=_PILLAR_VALUES.get(pillars["day"], pillars["day"]),
+        hour=_PILLAR_VALUES.get(hour, hour)
+    )
+
+def trusted_shinsal_details(details: Dict[str, Dict[str, Any]]) -> Dict[str, ShinsalInfo]:
+    """
+    신살 상세 딕셔너리를 미리 만들어 둔 ShinsalInfo 객체로 변환
+    """
+    result = {}
+    for name, detail in details.items():
+        key = (name, detail["present"], detail["description"], detail["effect"])
+        info = _SHINSAL_INFOS.get(key)
+        if info is None:
+            # 규칙 파일이 여러 번 바뀌어도 무한히 쌓이지 않도록 제한
+            if len(_SHINSAL_INFOS) >= _MAX_SHINSAL_INFOS:
+                _SHINSAL_INFOS.clear()
+            info = ShinsalInfo.model_construct(
+                present=detail["present"],
+                description=detail["description"],
+                effect=detail["effect"]
+            )
+            _SHINSAL_INFOS[key] = info
+        result[name] = info
+    return result
+
+def trusted_pet_analysis(analysis: Dict[str, Any]) -> PetAnalysisResponse:
+    """
+    pet_service 분석 결과로 PetAnalysisResponse 조립 (응답 모델에 없는 키는 제외)
+    """
+    fields = {key: analysis[key] for key in PetAnalysisResponse.model_fields if key in analysis}
+    fields["pillars"] = trusted_pillars(analysis["pillars"])
+    fields["shinsal_details"] = trusted_shinsal_details(analysis["shinsal_details"])
+    return PetAnalysisResponse.model_construct(**fields)
+
+def trusted_pillars_query(result: Dict[str, Any]) -> PillarsQueryResponse:
+    """
+    만세력 조회 결과로 PillarsQueryResponse 조립
+    """
+    return PillarsQueryResponse.model_construct(
+        solar_date=result["solar_date"],
+        solar_ganzi=result["solar_ganzi"],
+        pillars=trusted_pillars(result["pillars"]),
+        jeolki=result.get("jeolki", "")
+    )
+
+def json_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    응답 모델을 검증 없이 바로 JSON 바이트로 직렬화 (FastAPI의 response_model 재검증을 거치지 않음)
+    """
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model),
+        status_code=status_code,
+        media_type="application/json"
+    )
@@ -0,0 +1,35 @@
+"""
+연도별 만세력 샤드 API 라우터
+build_calendar_shards.py로 만든 정적 파일과 같은 내용을 제공 (CDN 원본/정적 배포가 없을 때의 대체 경로)
+"""
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.services.calendar_shards import find_calendar_file
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+@router.get("/{filename}",
+            summary="만세력 샤드 파일 조회",
+            description="manifest.json 또는 연도별 샤드(YYYY.<해시>.json)를 반환합니다. "
+                        "해시가 들어간 샤드는 변경되지 않으므로 영구 캐시 헤더를 붙이며, "
+                        "만세력이 교체된 뒤에도 이전 manifest의 샤드를 manifest 캐시 시간 동안 제공합니다.")
+async def get_calendar_file(filename: str, request: Request):
+    try:
+        found = find_calendar_file(filename)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"만세력 샤드 생성 중 오류가 발생했습니다: {str(e)}"
+        )
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{filename} 샤드를 찾을 수 없습니다."
+        )
+
+    body, etag, cache_control = found
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -2,19 +2,54 @@
 반려견 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Query, Request
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import time
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from app.models.schemas import (
     PetRegistrationRequest, 
     PetAnalysisResponse, 
     CompatibilityRequest,
     CompatibilityResponse,
     DailyFortuneResponse,
+    AuspiciousDaysRequest,
+    AuspiciousDaysResponse,
+    LuckTimelineRequest,
+    LuckTimelineResponse,
+    PlaygroupRequest,
+    PlaygroupResponse,
+    TraitCatalogResponse,
     ErrorResponse
 )
+from app.models.trusted import json_response, trusted_pet_analysis
+from app.services.analysis_pipeline import render_stage
+from app.services.event_log import record_stage
+from app.services.tracing import span
 from app.services.pet_service import pet_service
+from app.services.roster_service import DuplexStreamingResponse, OUTPUT_FORMATS, OUTPUT_MEDIA_TYPES, stream_roster
+from app.services.single_flight import single_flight
+from app.middleware.compression import PrecompressedJSON
+from app.utils.mapping_tables import FIVE_ELEMENT_TRAITS, BREED_TRAITS
 
 router = APIRouter(prefix="/pet", tags=["pets"])
 
+# 명단 업로드로 받는 Content-Type
+ROSTER_CONTENT_TYPES = (
+    "multipart/form-data",
+    "text/csv",
+    "text/plain",
+    "application/octet-stream",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# 오행/견종 성향 카탈로그 (배포 사이에 바뀌지 않으므로 한 번만 직렬화/압축)
+TRAIT_CATALOG = PrecompressedJSON({
+    "elements": FIVE_ELEMENT_TRAITS,
+    "breeds": BREED_TRAITS
+})
+
 @router.post("/register", 
              response_model=PetAnalysisResponse,
              responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
@@ -28,17 +63,39 @@ async def register_pet(pet_data: PetRegistrationRequest):
     - **breed**: 견종 (1-100자)
     - **gender**: 성별 (male 또는 female)
     - **birth_date**: 생년월일 (YYYY-MM-DD 형식)
+    - **calendar_type**: solar(양력, 기본값) 또는 lunar(음력) - 음력이면 양력으로 변환하여 분석하고 결과의 birth_date는 양력
+    - **is_leap_month**: 음력 윤달 여부
+    - **birth_time**: 출생 시각 (HH:MM 형식, 선택) - 입력하면 시주를 계산하여 사주로 분석
+    - **zasi_mode**: 23시대 출생의 일주 처리 (next_day: 다음 날 일주, same_day: 당일 일주 유지)
+    - **issue_token**: true이면 운세/궁합 조회에 쓸 수 있는 프로필 토큰을 함께 발급
+    - **owner_id**: 지정하면 분석 결과를 반려견 등록부에 저장하고 pet_id를 반환
     
     반환값에는 삼주, 오행, 성향, 신살 등의 종합 분석 결과가 포함됩니다.
     """
     try:
-        result = pet_service.register_and_analyze_pet(
+        # parse -> resolve -> analyze (요청 모델이 파싱한 날짜/시각을 그대로 사용)
+        ctx = pet_service.analyze_registration(
             name=pet_data.name,
             breed=pet_data.breed,
             gender=pet_data.gender,
-            birth_date=pet_data.birth_date
+            birth_date=pet_data.birth_date,
+            birth_time=pet_data.birth_time,
+            zasi_mode=pet_data.zasi_mode,
+            birth_day=pet_data.birth_day,
+            birth_clock=pet_data.birth_clock,
+            calendar_type=pet_data.calendar_type,
+            is_leap_month=pet_data.is_leap_month
         )
-        return result
+        if pet_data.issue_token:
+            ctx.analysis["profile_token"] = pet_service.issue_profile_token(ctx.analysis)
+        if pet_data.owner_id:
+            ctx.analysis["pet_id"] = pet_service.save_pet(ctx.analysis, owner_id=pet_data.owner_id)
+        # render: 재검증 없이 바로 직렬화 (스키마는 response_model 그대로)
+        started = time.perf_counter()
+        with span("serialize"):
+            response = json_response(render_stage(ctx))
+        record_stage("render", time.perf_counter() - started)
+        return response
         
     except ValueError as e:
         raise HTTPException(
@@ -60,29 +117,37 @@ async def analyze_compatibility(compatibility_data: CompatibilityRequest):
     """
     두 반려견의 궁합 분석
     
-    각 반려견의 생년월일을 바탕으로 오행을 추출하고,
+    각 반려견의 생년월일(또는 프로필 토큰)을 바탕으로 오행을 추출하고,
     오행 상생/상극 관계를 분석하여 궁합을 판정합니다.
     """
     try:
-        # 각 반려견의 기본 분석 수행
-        pet1_analysis = pet_service.register_and_analyze_pet(
+        # 각 반려견의 기본 분석 수행 (프로필 토큰이 있으면 만세력 조회 생략)
+        pet1_analysis = pet_service.resolve_pet(
             name=compatibility_data.pet1_name,
+            birth_date=compatibility_data.pet1_birth_date,
+            profile_token=compatibility_data.pet1_profile_token,
+            pet_id=compatibility_data.pet1_id,
             breed="믹스",  # 궁합 분석에서는 견종보다 오행이 중요
-            gender="male",  # 임시값
-            birth_date=compatibility_data.pet1_birth_date
+            gender="male"  # 임시값
         )
         
-        pet2_analysis = pet_service.register_and_analyze_pet(
+        pet2_analysis = pet_service.resolve_pet(
             name=compatibility_data.pet2_name,
+            birth_date=compatibility_data.pet2_birth_date,
+            profile_token=compatibility_data.pet2_profile_token,
+            pet_id=compatibility_data.pet2_id,
             breed="믹스",
-            gender="female",  # 임시값
-            birth_date=compatibility_data.pet2_birth_date
+            gender="female"  # 임시값
         )
         
         # 궁합 분석
         compatibility_result = pet_service.get_compatibility(pet1_analysis, pet2_analysis)
-        return compatibility_result
         
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -93,31 +158,58 @@ async def analyze_compatibility(compatibility_data: CompatibilityRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"궁합 분석 중 오류 발생: {str(e)}"
         )
+    
+    # 응답 모델 검증과 직렬화 (FastAPI가 하던 과정을 추적 구간에 포함)
+    with span("serialize"):
+        return json_response(CompatibilityResponse.model_validate(compatibility_result))
+
+def _compute_daily_fortune(pet_name: str, birth_date: Optional[str], target_date: str,
+                           profile_token: Optional[str], pet_id: Optional[str]) -> Dict[str, Any]:
+    """
+    일일 운세 계산 (사전 계산 결과 우선)
+    """
+    # 사전 계산된 운세가 있으면 바로 반환
+    if pet_id:
+        precomputed = pet_service.get_precomputed_fortune(pet_id, target_date)
+        if precomputed:
+            return precomputed
+    
+    # 반려견 기본 분석 (등록부 또는 프로필 토큰이 있으면 만세력 조회 없이 복원)
+    pet_analysis = pet_service.resolve_pet(
+        name=pet_name,
+        birth_date=birth_date,
+        profile_token=profile_token,
+        pet_id=pet_id
+    )
+    
+    # 일일 운세 분석
+    return pet_service.get_daily_fortune(pet_analysis, target_date)
 
 @router.get("/daily-fortune/{pet_name}",
             response_model=DailyFortuneResponse,
             responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
             summary="일일 운세 조회",
             description="등록된 반려견의 오늘 운세를 조회합니다.")
-async def get_daily_fortune(pet_name: str, birth_date: str, target_date: str = None):
+async def get_daily_fortune(pet_name: str, birth_date: str = None, target_date: str = None,
+                            profile_token: str = None, pet_id: str = None):
     """
     반려견의 일일 운세 조회
     
     - **pet_name**: 반려견 이름
     - **birth_date**: 반려견 생년월일 (YYYY-MM-DD)
     - **target_date**: 운세를 볼 날짜 (기본값: 오늘)
+    - **profile_token**: 등록 시 발급받은 프로필 토큰 (birth_date 대신 사용)
+    - **pet_id**: 반려견 등록부 ID (저장된 분석 결과 사용)
     """
     try:
-        # 반려견 기본 분석 (캐시된 데이터가 있다면 그것을 사용하는 것이 좋음)
-        pet_analysis = pet_service.register_and_analyze_pet(
-            name=pet_name,
-            breed="믹스",
-            gender="male",
-            birth_date=birth_date
-        )
+        if target_date is None:
+            target_date = datetime.now().strftime("%Y-%m-%d")
         
-        # 일일 운세 분석
-        fortune_result = pet_service.get_daily_fortune(pet_analysis, target_date)
+        # 같은 반려견/날짜의 동시 요청은 한 번만 계산하고 결과 공유
+        fortune_result = await single_flight.run(
+            ("daily-fortune", pet_name, birth_date, profile_token, pet_id, target_date),
+            _compute_daily_fortune, pet_name, birth_date, target_date, profile_token, pet_id
+        )
         
         if "error" in fortune_result:
             raise HTTPException(
@@ -129,6 +221,11 @@ async def get_daily_fortune(pet_name: str, birth_date: str, target_date: str = N
         
     except HTTPException:
         raise
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -140,3 +237,327 @@ async def get_daily_fortune(pet_name: str, birth_date: str, target_date: str = N
             detail=f"일일 운세 조회 중 오류 발생: {str(e)}"
         )
 
+@router.post("/auspicious-days",
+             response_model=AuspiciousDaysResponse,
+             responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+             summary="좋은 날 찾기",
+             description="기간(최대 1년) 안에서 반려견 사주와 잘 맞는 날을 점수 순으로 찾습니다.")
+async def find_auspicious_days(request: AuspiciousDaysRequest):
+    """
+    반려견에게 좋은 날 찾기
+    
+    - **birth_date / profile_token / pet_id**: 반려견 지정 (하나 이상 필요)
+    - **start_date**: 탐색 시작 날짜 (기본값: 오늘)
+    - **days**: 탐색 일수 (1~366)
+    - **top_k**: 반환할 날짜 수 (1~50)
+    - **purpose**: 목적별 가산점 (grooming: 미용, travel: 여행, vet: 병원)
+    
+    각 날짜의 삼주와 반려견 사주 사이의 천간/지지 관계(합, 생극, 충)를 점수화하여 상위 날짜를 반환합니다.
+    """
+    try:
+        pet_analysis = pet_service.resolve_pet(
+            name=request.name,
+            birth_date=request.birth_date,
+            profile_token=request.profile_token,
+            pet_id=request.pet_id
+        )
+        
+        return pet_service.find_auspicious_days(
+            pet_analysis,
+            start_date=request.start_date,
+            days=request.days,
+            top_k=request.top_k,
+            purpose=request.purpose
+        )
+        
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"좋은 날 찾기 중 오류 발생: {str(e)}"
+        )
+
+@router.post("/luck-timeline",
+             response_model=LuckTimelineResponse,
+             responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+             summary="세운/대운 타임라인",
+             description="연도별 세운과 대운을 반려견 사주와의 관계 점수와 함께 한 번에 계산합니다.")
+async def get_luck_timeline(request: LuckTimelineRequest):
+    """
+    세운/대운 타임라인
+    
+    - **birth_date / profile_token / pet_id**: 반려견 지정 (하나 이상 필요, 대운은 생년월일이 있어야 계산)
+    - **gender**: 성별 (연간 음양과 함께 대운 순행/역행 판단)
+    - **start_year**: 시작 연도 (기본값: 올해)
+    - **years**: 연수 (1~120)
+    
+    연주는 육십갑자 주기 산술로 구하고, 각 연주/대운과 반려견 사주의 관계(천간/지지)를 점수화하며
+    반려견 일간 기준 십신과 일지 관계를 함께 반환합니다.
+    """
+    try:
+        pet_analysis = pet_service.resolve_pet(
+            name=request.name,
+            birth_date=request.birth_date,
+            profile_token=request.profile_token,
+            gender=request.gender,
+            pet_id=request.pet_id
+        )
+        
+        return pet_service.get_luck_timeline(
+            pet_analysis,
+            start_year=request.start_year,
+            years=request.years
+        )
+        
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"타임라인 계산 중 오류 발생: {str(e)}"
+        )
+
+@router.post("/playgroups",
+             response_model=PlaygroupResponse,
+             responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+             summary="놀이 그룹 편성",
+             description="반려견 명단을 크기 제한이 있는 놀이 그룹으로 나누어 그룹 안 궁합 점수 합을 최대화합니다.")
+async def plan_playgroups(request: PlaygroupRequest):
+    """
+    놀이 그룹 편성 (유치원/데이케어 반 편성)
+    
+    - **dogs**: 반려견 명단 (각각 name과 birth_date / profile_token / pet_id 중 하나, 최대 1000마리)
+    - **min_group_size / max_group_size**: 그룹 크기 제한
+    - **time_budget_ms**: 최적화 제한 시간 (10~10000ms)
+    - **seed**: 탐색 난수 시드
+    
+    쌍별 점수는 일간 오행 상성과 일주 천간/지지 관계(양방향)의 합이며,
+    탐욕 초기해를 이동/교환 지역 탐색으로 제한 시간 안에서 개선한 결과를 반환합니다.
+    """
+    try:
+        # 최적화는 CPU를 오래 쓰므로 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        return await run_in_threadpool(
+            pet_service.plan_playgroups,
+            [dog.model_dump() for dog in request.dogs],
+            min_group_size=request.min_group_size,
+            max_group_size=request.max_group_size,
+            time_budget=request.time_budget_ms / 1000,
+            seed=request.seed
+        )
+        
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"놀이 그룹 편성 중 오류 발생: {str(e)}"
+        )
+
+
+@router.get("/daily-fortune-jobs/{target_date}",
+            responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+            summary="일일 운세 사전 계산 현황",
+            description="사전 계산 작업의 진행 상황과 처리량을 조회합니다.")
+async def get_daily_fortune_job(target_date: str):
+    """
+    일일 운세 사전 계산 작업 현황
+    
+    - **target_date**: 운세 날짜 (YYYY-MM-DD)
+    
+    status(running/complete/failed), total, stale(이전 만세력 버전이라 건너뛴 수), processed, pets_per_sec 등을 반환합니다.
+    """
+    try:
+        job = pet_service.get_precompute_status(target_date)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"해당 날짜({target_date})의 사전 계산 작업이 없습니다."
+        )
+    return job
+
+@router.post("/roster",
+             responses={
+                 200: {"description": "행별 분석 결과 (NDJSON 또는 CSV 스트림)",
+                       "content": {"application/x-ndjson": {}, "text/csv": {}}},
+                 400: {"model": ErrorResponse},
+                 415: {"model": ErrorResponse}
+             },
+             openapi_extra={"requestBody": {"required": True, "content": {
+                 "multipart/form-data": {"schema": {"type": "object", "properties": {
+                     "file": {"type": "string", "format": "binary"}
+                 }}},
+                 "text/csv": {"schema": {"type": "string"}},
+                 "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {
+                     "schema": {"type": "string", "format": "binary"}
+                 }
+             }}},
+             summary="명단 일괄 분석",
+             description="보호소 명단(CSV/XLSX)을 업로드하면 행별 분석 결과를 업로드 도중부터 스트리밍으로 반환합니다.")
+async def upload_roster(request: Request,
+                        format: str = Query("ndjson", description="결과 형식 (ndjson 또는 csv)"),
+                        owner_id: Optional[str] = Query(None, min_length=1, max_length=100,
+                                                        description="보호자 ID (지정하면 성공한 행을 반려견 등록부에 저장)")):
+    """
+    보호소 명단 일괄 분석
+    
+    - **본문**: multipart 파일(`file`) 또는 `text/csv`/XLSX 원본
+    - **컬럼**: name/이름, breed/견종, gender/성별, birth_date/생년월일 (필수),
+      birth_time, calendar_type, is_leap_month, zasi_mode, owner_id (선택)
+    - **format**: ndjson(기본값) 또는 csv
+    - **owner_id**: 지정하면 성공한 행을 등록부에 저장 (명단의 owner_id 컬럼이 우선)
+    
+    CSV는 받는 대로 파싱하여 일정 행 수마다 분석 결과를 보내며, 행별 오류는 결과 행으로 함께 보고합니다.
+    """
+    if format not in OUTPUT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"결과 형식은 {', '.join(OUTPUT_FORMATS)} 중 하나여야 합니다."
+        )
+    
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith(ROSTER_CONTENT_TYPES):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="명단은 multipart/form-data, text/csv 또는 XLSX로 업로드해주세요."
+        )
+    
+    return DuplexStreamingResponse(
+        stream_roster(request.stream(), content_type, format, owner_id),
+        media_type=OUTPUT_MEDIA_TYPES[format]
+    )
+
+@router.get("/traits",
+            response_model=TraitCatalogResponse,
+            summary="성향 카탈로그",
+            description="오행별 성향과 견종별 기본 성향 목록을 조회합니다.")
+async def get_trait_catalog(request: Request):
+    """
+    오행/견종 성향 카탈로그
+    
+    분석 결과의 temperament, activity_tip을 만드는 데 쓰이는 원본 데이터입니다.
+    """
+    return TRAIT_CATALOG.response(request.headers.get("accept-encoding", ""))
+
+@router.get("/matches/{target_date}",
+            responses={
+                200: {"description": "일치하는 반려견 ID (NDJSON 스트림, 마지막 줄은 status=done 요약)",
+                      "content": {"application/x-ndjson": {}}},
+                400: {"model": ErrorResponse},
+                404: {"model": ErrorResponse},
+                500: {"model": ErrorResponse}
+            },
+            summary="날짜 일치 반려견 조회",
+            description="날짜의 일진과 일주/일간/오행이 같은 등록 반려견 ID를 키셋 페이지 단위로 스트리밍합니다.")
+async def stream_date_matches(target_date: str,
+                              match: str = Query("day_pillar", description="day_pillar, day_stem, element"),
+                              cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+                              limit: int = Query(10000, ge=1, le=100000, description="최대 반환 개수")):
+    """
+    날짜 일치 반려견 조회 (일주 귀환 알림 대상 찾기)
+    
+    - **target_date**: 날짜 (YYYY-MM-DD)
+    - **match**: day_pillar(일주가 같은 날, 60일 주기), day_stem(일간), element(일간 오행)
+    - **cursor / limit**: 키셋 페이지 (마지막 줄의 next_cursor가 null이면 끝)
+    
+    `{"pet_id": ...}` 줄들 뒤에 `{"status": "done", "count", "next_cursor", "value", ...}` 요약 줄을 반환합니다.
+    """
+    try:
+        _, lines = pet_service.find_date_matches(target_date, match=match, cursor=cursor, limit=limit)
+        
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"날짜 일치 반려견 조회 중 오류 발생: {str(e)}"
+        )
+    
+    # 동기 이터레이터는 스레드풀에서 한 줄씩 읽히므로 등록부 조회가 이벤트 루프를 막지 않음
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+@router.get("/owner/{owner_id}",
+            response_model=List[PetAnalysisResponse],
+            summary="보호자별 등록 반려견 조회",
+            description="보호자 ID로 반려견 등록부에 저장된 반려견 목록을 조회합니다.")
+async def list_owner_pets(owner_id: str,
+                          limit: int = Query(100, ge=1, le=500, description="최대 조회 개수"),
+                          offset: int = Query(0, ge=0, description="건너뛸 개수")):
+    """
+    보호자별 등록 반려견 목록 조회
+    
+    - **owner_id**: 등록 시 지정한 보호자 ID
+    """
+    try:
+        return pet_service.list_owner_pets(owner_id, limit=limit, offset=offset)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"반려견 목록 조회 중 오류 발생: {str(e)}"
+        )
+
+@router.get("/{pet_id}",
+            response_model=PetAnalysisResponse,
+            responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+            summary="등록된 반려견 조회",
+            description="반려견 등록부에 저장된 분석 결과를 재분석 없이 조회합니다. 만세력이 교체된 뒤에는 다시 분석하여 갱신합니다.")
+async def get_registered_pet(pet_id: str):
+    """
+    등록된 반려견 분석 결과 조회
+    
+    - **pet_id**: 등록 시 반환된 반려견 ID
+    
+    이전 만세력 버전으로 분석된 반려견은 저장된 생년월일/출생 시각으로 다시 분석하여 등록부를 갱신하고,
+    현재 만세력에 없는 날짜라 다시 분석할 수 없으면 404를 반환합니다.
+    """
+    try:
+        return json_response(trusted_pet_analysis(pet_service.get_registered_pet(pet_id)))
+        
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"반려견 조회 중 오류 발생: {str(e)}"
+        )
@@ -3,46 +3,70 @@
 """
 
 from fastapi import APIRouter, HTTPException, status, Query
-from typing import List
-from app.models.schemas import PillarsQueryResponse, DateRangeResponse, ErrorResponse
-from app.services.pillars_service import pillars_service
+from typing import List, Optional
+from app.models.schemas import (
+    PillarsQueryResponse, DateRangeResponse, GanziQueryResponse, PopulationStatsResponse, ErrorResponse
+)
+from app.models.trusted import json_response, trusted_pillars_query
+from app.services.pillars_service import get_pillars_service
+from app.services.single_flight import single_flight
+from app.services.stats_service import stats_service
+from app.services.tracing import span
 from app.utils.ganzi_parser import parse_solar_ganzi
+from app.utils.lunar_calendar import resolve_calendar_date
 
 router = APIRouter(prefix="/pillars", tags=["pillars"])
 
+def _lookup_pillars(date: str) -> Optional[PillarsQueryResponse]:
+    """
+    만세력에서 날짜를 조회하여 삼주로 파싱 (없으면 None)
+    """
+    pillars_data = get_pillars_service().get_pillars_by_date(date)
+    if not pillars_data:
+        return None
+    
+    with span("ganzi.parse_solar_ganzi"):
+        pillars = parse_solar_ganzi(pillars_data["solar_ganzi"])
+    return trusted_pillars_query({
+        "solar_date": pillars_data["solar_date"],
+        "solar_ganzi": pillars_data["solar_ganzi"],
+        "pillars": pillars,
+        "jeolki": pillars_data.get("jeolki", "")
+    })
+
 @router.get("/",
             response_model=PillarsQueryResponse,
             responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
             summary="특정 날짜의 삼주 조회",
-            description="만세력 DB에서 특정 날짜의 년주, 월주, 일주 정보를 조회합니다.")
-async def get_pillars_by_date(date: str = Query(..., description="조회할 날짜 (YYYY-MM-DD 형식)")):
+            description="만세력 DB에서 특정 날짜의 년주, 월주, 일주 정보를 조회합니다. 음력 날짜도 조회할 수 있습니다.")
+async def get_pillars_by_date(date: str = Query(..., description="조회할 날짜 (YYYY-MM-DD 형식)"),
+                              calendar_type: str = Query("solar", description="날짜의 달력 종류 (solar 또는 lunar)"),
+                              is_leap_month: bool = Query(False, description="음력 윤달 여부")):
     """
     특정 날짜의 삼주 정보 조회
     
     - **date**: 조회할 날짜 (YYYY-MM-DD 형식)
+    - **calendar_type**: solar(양력, 기본값) 또는 lunar(음력)
+    - **is_leap_month**: 음력 윤달 여부
     
     만세력 DB에서 해당 날짜의 간지 정보를 조회하고,
-    년주, 월주, 일주로 파싱하여 반환합니다.
+    년주, 월주, 일주로 파싱하여 반환합니다. 음력 날짜는 양력으로 변환하여 조회합니다.
     """
     try:
-        # 만세력에서 해당 날짜 조회
-        pillars_data = pillars_service.get_pillars_by_date(date)
+        solar_date = date.strip()
+        if calendar_type != "solar" or is_leap_month:
+            solar_date = resolve_calendar_date(solar_date, calendar_type, is_leap_month).isoformat()
+        
+        # 같은 날짜의 동시 요청은 조회/파싱을 한 번만 수행
+        result = await single_flight.run(("pillars", solar_date), _lookup_pillars, solar_date)
         
-        if not pillars_data:
+        if result is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"해당 날짜({date})의 만세력 정보를 찾을 수 없습니다."
             )
         
-        # 간지 파싱
-        pillars = parse_solar_ganzi(pillars_data["solar_ganzi"])
-        
-        return {
-            "solar_date": pillars_data["solar_date"],
-            "solar_ganzi": pillars_data["solar_ganzi"],
-            "pillars": pillars,
-            "jeolki": pillars_data.get("jeolki", "")
-        }
+        return json_response(result)
         
     except HTTPException:
         raise
@@ -68,7 +92,7 @@ async def get_available_date_range():
     만세력 DB에 저장된 데이터의 시작 날짜와 종료 날짜를 반환합니다.
     """
     try:
-        date_range = pillars_service.get_available_date_range()
+        date_range = get_pillars_service().get_available_date_range()
         return date_range
         
     except Exception as e:
@@ -92,7 +116,7 @@ async def search_dates_by_ganzi(
     만세력 DB에서 해당 패턴이 포함된 모든 날짜를 검색하여 반환합니다.
     """
     try:
-        matching_dates = pillars_service.search_by_ganzi(pattern)
+        matching_dates = get_pillars_service().search_by_ganzi(pattern)
         return matching_dates
         
     except Exception as e:
@@ -101,3 +125,99 @@ async def search_dates_by_ganzi(
             detail=f"간지 패턴 검색 중 오류 발생: {str(e)}"
         )
 
+@router.get("/query",
+            response_model=GanziQueryResponse,
+            responses={400: {"model": ErrorResponse}},
+            summary="간지 조건으로 날짜 검색",
+            description="년/월/일주의 간지, 천간, 지지 조건을 조합하여 모두 만족하는 날짜를 검색합니다.")
+async def query_dates_by_pillars(
+    year: Optional[str] = Query(None, description="년주 (예: '甲子' 또는 '갑자')"),
+    month: Optional[str] = Query(None, description="월주"),
+    day: Optional[str] = Query(None, description="일주"),
+    year_stem: Optional[str] = Query(None, description="년간 (예: '甲' 또는 '갑')"),
+    year_branch: Optional[str] = Query(None, description="년지 (예: '子' 또는 '자')"),
+    month_stem: Optional[str] = Query(None, description="월간"),
+    month_branch: Optional[str] = Query(None, description="월지"),
+    day_stem: Optional[str] = Query(None, description="일간"),
+    day_branch: Optional[str] = Query(None, description="일지"),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD, 기본값: 데이터 시작)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD, 기본값: 데이터 끝)"),
+    limit: int = Query(1000, ge=1, le=10000, description="최대 반환 개수"),
+    offset: int = Query(0, ge=0, description="건너뛸 개수")
+):
+    """
+    간지 조건 조합 검색
+    
+    예: 1995~2025년 중 일주가 甲子이고 월지가 寅인 날짜
+    `?day=甲子&month_branch=寅&start_date=1995-01-01&end_date=2025-12-31`
+    
+    조건마다 미리 만든 날짜 역색인을 교집합하므로 조건이 많을수록 빨라집니다.
+    """
+    try:
+        return get_pillars_service().query_pillars(
+            constraints={
+                "year": year,
+                "month": month,
+                "day": day,
+                "year.stem": year_stem,
+                "year.branch": year_branch,
+                "month.stem": month_stem,
+                "month.branch": month_branch,
+                "day.stem": day_stem,
+                "day.branch": day_branch
+            },
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"간지 조건 검색 중 오류 발생: {str(e)}"
+        )
+
+
+@router.get("/stats",
+            response_model=PopulationStatsResponse,
+            responses={400: {"model": ErrorResponse}},
+            summary="날짜 구간 모집단 통계",
+            description="날짜 구간에 태어난 경우의 오행, 일주, 신살 분포와 오행 x 신살 교차 분포를 년/월 단위로 집계합니다.")
+async def get_population_stats(
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD, 기본값: 데이터 시작)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD, 기본값: 데이터 끝)"),
+    group_by: str = Query("year", description="집계 단위 (year 또는 month)"),
+    include_pillars: bool = Query(True, description="그룹별 일주 분포 포함 여부")
+):
+    """
+    모집단 통계 조회
+    
+    예: `start_date=2023-01-01&end_date=2023-12-31`에서 "2023년생 중 수(水) 오행의 비율"은 elements["수"] / total,
+    "역마살이 있는 비율"은 shinsal["역마살"] / total 입니다.
+    element_shinsal["수"]["역마살"]은 두 조건을 함께 만족하는 일수이므로,
+    "수 또는 역마살" 비율은 (elements["수"] + shinsal["역마살"] - element_shinsal["수"]["역마살"]) / total 입니다.
+    """
+    try:
+        return stats_service.get_population_stats(
+            start_date=start_date,
+            end_date=end_date,
+            group_by=group_by,
+            include_pillars=include_pillars
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"모집단 통계 조회 중 오류 발생: {str(e)}"
+        )
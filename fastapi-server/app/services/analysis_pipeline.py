@@ -0,0 +1,199 @@
+"""
+반려견 분석 파이프라인
+등록 분석을 parse -> resolve -> analyze -> render 단계로 나누고 단계 사이에 AnalysisContext를 전달
+각 단계는 따로 호출할 수 있으므로 일괄/스트리밍 처리에서도 필요한 단계만 재사용
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from app.models.schemas import PetAnalysisResponse
+from app.models.trusted import trusted_pet_analysis
+from app.services.five_elements import analyze_temperament, analyze_element_balance
+from app.services.pillars_service import get_pillars_service
+from app.services.shinsal_service import analyze_all_shinsal, get_shinsal_summary
+from app.services.tracing import span, traced
+from app.utils.ganzi_parser import get_day_stem, ganzi_to_code, code_to_ganzi
+from app.utils.hour_pillar import parse_birth_time, resolve_hour_pillar
+from app.utils.lunar_calendar import CALENDAR_TYPES, resolve_calendar_date
+
+# 지원하는 가장 이른 출생 연도
+MIN_BIRTH_YEAR = 1990
+
+class AnalysisContext:
+    """
+    분석 단계 사이에 전달되는 상태
+
+    - parse 단계: name, breed, gender, birth_date(원문), birth_day(파싱된 날짜), birth_time, birth_clock(시, 분), zasi_mode
+    - resolve 단계: pillars, jeolki
+    - analyze 단계: analysis (응답 딕셔너리)
+    """
+
+    __slots__ = (
+        "name", "breed", "gender", "birth_date", "birth_day", "birth_time", "birth_clock", "zasi_mode",
+        "pillars", "jeolki", "analysis"
+    )
+
+    def __init__(self, name: str, breed: str, gender: str, birth_date: str, birth_day: date,
+                 birth_time: Optional[str] = None, birth_clock: Optional[Tuple[int, int]] = None,
+                 zasi_mode: Optional[str] = None):
+        self.name = name
+        self.breed = breed
+        self.gender = gender
+        self.birth_date = birth_date
+        self.birth_day = birth_day
+        self.birth_time = birth_time
+        self.birth_clock = birth_clock
+        self.zasi_mode = zasi_mode
+        self.pillars: Optional[Dict[str, str]] = None
+        self.jeolki = ""
+        self.analysis: Optional[Dict[str, Any]] = None
+
+@traced("pipeline.parse_stage")
+def parse_stage(name: str, breed: str, gender: str, birth_date: str, birth_time: Optional[str] = None,
+                zasi_mode: Optional[str] = None, birth_day: Optional[date] = None,
+                birth_clock: Optional[Tuple[int, int]] = None, calendar_type: str = "solar",
+                is_leap_month: bool = False) -> AnalysisContext:
+    """
+    입력 검증 및 파싱 (요청 모델이 이미 파싱한 birth_day, birth_clock이 있으면 그대로 사용)
+    음력 생년월일은 양력으로 바꾸고, 이후 단계와 결과의 birth_date는 양력 날짜
+
+    Raises:
+        ValueError: 입력 값 오류
+    """
+    if not name or not name.strip():
+        raise ValueError("반려견 이름은 필수입니다.")
+
+    if not breed or not breed.strip():
+        raise ValueError("견종은 필수입니다.")
+
+    if gender not in ["male", "female"]:
+        raise ValueError("성별은 'male' 또는 'female'이어야 합니다.")
+
+    if calendar_type not in CALENDAR_TYPES:
+        raise ValueError("달력 종류는 solar 또는 lunar이어야 합니다.")
+    if calendar_type == "lunar":
+        if birth_day is None:
+            birth_day = resolve_calendar_date(birth_date, "lunar", is_leap_month)
+        birth_date = birth_day.isoformat()
+    elif birth_day is None:
+        try:
+            birth_day = datetime.strptime(birth_date, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            raise ValueError("생년월일 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 사용)")
+
+    # 날짜 범위 검증 (너무 미래나 과거 날짜 방지)
+    if birth_day.year < MIN_BIRTH_YEAR:
+        raise ValueError(f"생년월일이 너무 과거입니다. ({MIN_BIRTH_YEAR}년 이후만 지원)")
+
+    if birth_day.year > datetime.now().year + 1:
+        raise ValueError("생년월일이 미래입니다.")
+
+    if birth_time and birth_clock is None:
+        birth_clock = parse_birth_time(birth_time)
+
+    return AnalysisContext(
+        name=name,
+        breed=breed,
+        gender=gender,
+        birth_date=birth_date,
+        birth_day=birth_day,
+        birth_time=birth_time,
+        birth_clock=birth_clock if birth_time else None,
+        zasi_mode=zasi_mode
+    )
+
+@traced("pipeline.resolve_stage")
+def resolve_stage(ctx: AnalysisContext) -> AnalysisContext:
+    """
+    만세력에서 삼주 조회 (출생 시각이 있으면 시주까지 계산)
+
+    Raises:
+        ValueError: 만세력에 없는 날짜
+    """
+    day = ctx.birth_day
+    calendar_day = get_pillars_service().get_pillars_by_day(day)
+    if not calendar_day:
+        raise ValueError(f"해당 날짜({ctx.birth_date})의 만세력 정보를 찾을 수 없습니다.")
+
+    pillars = calendar_day["pillars"]
+
+    # 시주 계산 (일간과 시지로 산술 계산, 야자시/지방시 보정으로 날짜가 바뀌면 해당 날짜 삼주 사용)
+    if ctx.birth_clock is not None:
+        hour, minute = ctx.birth_clock
+        day_offset, hour_code = resolve_hour_pillar(
+            ganzi_to_code(pillars["day"]), hour, minute, zasi_mode=ctx.zasi_mode
+        )
+        if day_offset:
+            shifted_day = day + timedelta(days=day_offset)
+            calendar_day = get_pillars_service().get_pillars_by_day(shifted_day)
+            if not calendar_day:
+                raise ValueError(f"해당 날짜({shifted_day.isoformat()})의 만세력 정보를 찾을 수 없습니다.")
+            pillars = calendar_day["pillars"]
+        pillars["hour"] = code_to_ganzi(hour_code)
+
+    ctx.pillars = pillars
+    ctx.jeolki = calendar_day["jeolki"]
+    return ctx
+
+@traced("pipeline.analyze_stage")
+def analyze_stage(ctx: AnalysisContext) -> AnalysisContext:
+    """
+    확정된 삼주(또는 사주)로 오행/성향/신살 분석
+    """
+    ctx.analysis = build_analysis(
+        name=ctx.name,
+        breed=ctx.breed,
+        gender=ctx.gender,
+        birth_date=ctx.birth_date,
+        pillars=ctx.pillars,
+        jeolki=ctx.jeolki,
+        birth_time=ctx.birth_time
+    )
+    return ctx
+
+def render_stage(ctx: AnalysisContext) -> PetAnalysisResponse:
+    """
+    분석 결과를 응답 모델로 변환 (재검증 없음)
+    """
+    return trusted_pet_analysis(ctx.analysis)
+
+def build_analysis(name: str, breed: str, gender: str, birth_date: str, pillars: Dict[str, str],
+                   jeolki: str = "", birth_time: Optional[str] = None) -> Dict[str, Any]:
+    """
+    삼주(또는 사주)가 확정된 이후의 오행/성향/신살 분석 및 결과 통합
+    (프로필 토큰 복원처럼 만세력 조회 없이 삼주를 얻은 경우에도 사용)
+    """
+    # 일간 추출 (오행 분석의 기준)
+    day_stem = get_day_stem(pillars)
+
+    # 오행 및 성향 분석
+    with span("five_elements"):
+        temperament_analysis = analyze_temperament(day_stem, breed)
+        element_balance = analyze_element_balance(pillars)
+
+    # 신살 분석
+    with span("shinsal"):
+        shinsal_results = analyze_all_shinsal(pillars)
+        shinsal_summary = get_shinsal_summary(shinsal_results)
+
+    return {
+        "name": name,
+        "breed": breed,
+        "gender": gender,
+        "birth_date": birth_date,
+        "birth_time": birth_time,
+        "pillars": pillars,
+        "five_element": temperament_analysis["five_element"],
+        "element_balance": element_balance,
+        "temperament": temperament_analysis["temperament"],
+        "activity_tip": temperament_analysis["activity_tip"],
+        "shinsal": {
+            shinsal_name: result["present"]
+            for shinsal_name, result in shinsal_results.items()
+        },
+        "shinsal_details": shinsal_results,
+        "shinsal_summary": shinsal_summary["summary"],
+        "analysis_date": datetime.now().isoformat(),
+        "jeolki": jeolki
+    }
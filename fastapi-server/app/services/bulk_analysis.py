@@ -0,0 +1,243 @@
+"""
+오프라인 일괄 분석 (HTTP 없이 대량의 반려견 기록 분석)
+입력 파일(CSV/JSONL)을 청크로 나누어 프로세스 풀에서 분석하고 /pet/roster와 같은 형식으로 기록
+
+- 만세력 인덱스는 부모 프로세스가 한 번 .npy로 내보내고, 작업 프로세스는 메모리 매핑으로 공유 (CSV를 다시 읽지 않음)
+- 작업 프로세스는 API와 같은 분석 파이프라인(parse -> resolve -> analyze)과 렌더링을 사용
+- 결과는 입력 순서대로 기록하며, 동시에 처리 중인 청크 수를 제한해 입력 크기와 관계없이 메모리 사용량이 일정
+- 결과의 row는 입력 파일별 원본 행 번호이므로 어느 파일의 행인지 source(입력 파일 경로)를 함께 기록
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.services.roster_service import (
+    COLUMN_ALIASES, RosterAnalyzer, RosterFormatError, detect_csv_encoding, undecodable_csv_error
+)
+
+INPUT_FORMATS = ("csv", "jsonl")
+
+# 작업 프로세스에 넘기는 필드 순서 (RosterAnalyzer 컬럼 위치)
+RECORD_FIELDS = tuple(dict.fromkeys(COLUMN_ALIASES.values()))
+
+# CSV 인코딩 감지에 읽는 앞부분 크기
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+def detect_format(path: str, default: str = "csv") -> str:
+    """
+    파일 확장자로 형식 판단 (.csv / .jsonl, .ndjson)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    return default
+
+def iter_records(path: str, input_format: Optional[str] = None) -> Iterator[Tuple[int, List[str]]]:
+    """
+    입력 파일의 기록을 (원본 행 번호, RECORD_FIELDS 순서의 값 리스트)로 하나씩 읽기
+
+    - CSV: 첫 행은 헤더 (영문 필드명 또는 한글 헤더), 필수 컬럼이 없으면 행 번호 0의 오류 하나만 내고 종료
+      인코딩은 /pet/roster와 같이 UTF-8(BOM 포함) 또는 CP949, 디코딩할 수 없으면 행 번호 0의 오류를 내고 종료
+    - JSONL: 한 줄에 하나의 JSON 객체 (/pet/register 요청과 같은 키), UTF-8이 아니면 행 번호 0의 오류를 내고 종료
+    """
+    input_format = input_format or detect_format(path)
+    if input_format == "jsonl":
+        try:
+            yield from _iter_jsonl(path)
+        except UnicodeDecodeError:
+            yield 0, RosterFormatError("JSONL 파일을 UTF-8로 읽을 수 없습니다.")
+        return
+
+    with open(path, "rb") as f:
+        sample = f.read(ENCODING_SAMPLE_BYTES)
+    encoding = detect_csv_encoding(sample, final=len(sample) < ENCODING_SAMPLE_BYTES)
+    try:
+        yield from _iter_csv(path, encoding)
+    except UnicodeDecodeError:
+        yield 0, undecodable_csv_error(encoding)
+
+def _iter_jsonl(path: str) -> Iterator[Tuple[int, List[str]]]:
+    with open(path, encoding="utf-8-sig") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f"JSON 형식 오류: {e.msg}")
+                continue
+            if not isinstance(record, dict):
+                yield line_number, ValueError("JSON 객체가 아닙니다.")
+                continue
+            yield line_number, [_text(record.get(field)) for field in RECORD_FIELDS]
+
+def _iter_csv(path: str, encoding: str) -> Iterator[Tuple[int, List[str]]]:
+    with open(path, encoding=encoding, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        # 헤더는 /pet/roster와 같은 규칙으로 한 번만 해석 (행마다 필수 값 누락 오류를 내지 않도록)
+        header_reader = RosterAnalyzer()
+        try:
+            header_reader.set_header(header)
+        except RosterFormatError as e:
+            yield 0, e
+            return
+        positions = header_reader.columns
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            yield reader.line_num, [
+                row[positions[field]] if field in positions and positions[field] < len(row) else ""
+                for field in RECORD_FIELDS
+            ]
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+# 작업 프로세스 상태
+_worker_analyzer: Optional[RosterAnalyzer] = None
+
+def _init_worker(calendar_dir: str, output_format: str):
+    """
+    작업 프로세스 초기화: 메모리 매핑한 만세력 스냅샷 연결
+    """
+    global _worker_analyzer
+    from app.services.pillars_service import get_pillars_service
+
+    get_pillars_service().use_mapped_calendar(calendar_dir)
+    _worker_analyzer = RosterAnalyzer(output_format, with_source=True)
+    _worker_analyzer.columns = {field: position for position, field in enumerate(RECORD_FIELDS)}
+
+def _analyze_chunk(records: List[Tuple[str, int, Any]]) -> Tuple[bytes, int, int]:
+    """
+    프로세스 풀 작업 단위: 기록 묶음 분석 (청크가 여러 입력 파일에 걸칠 수 있음)
+
+    Returns:
+        (렌더링된 결과 바이트, 성공 수, 실패 수)
+    """
+    analyzer = _worker_analyzer
+    succeeded, failed = analyzer.succeeded, analyzer.failed
+    out = []
+    rows = []
+    for source, line_number, values in records:
+        # 읽기 단계의 오류나 입력 파일이 바뀌는 지점에서는 순서를 유지하기 위해 앞선 행을 먼저 분석
+        if rows and (source != analyzer.source or isinstance(values, ValueError)):
+            out.append(analyzer.process(rows))
+            rows = []
+        analyzer.source = source
+        if isinstance(values, ValueError):
+            analyzer.failed += 1
+            out.append(analyzer.render_error(line_number, str(values)))
+        else:
+            rows.append((line_number, values))
+    if rows:
+        out.append(analyzer.process(rows))
+    return b"".join(out), analyzer.succeeded - succeeded, analyzer.failed - failed
+
+def _chunks(records: Iterator[Tuple[str, int, Any]], size: int) -> Iterator[List[Tuple[str, int, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_bulk_analysis(inputs: List[str], output: str, output_format: str = "ndjson",
+                      input_format: Optional[str] = None, workers: int = None, chunk_size: int = 2_000,
+                      progress: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    """
+    입력 파일들의 반려견 기록을 프로세스 풀에서 분석하여 한 파일로 기록
+
+    Args:
+        inputs: 입력 파일 경로 리스트 (CSV 또는 JSONL)
+        output: 결과 파일 경로
+        output_format: "ndjson" 또는 "csv" (/pet/roster와 같은 형식)
+        input_format: 입력 형식 (기본값: 확장자로 판단)
+        workers: 프로세스 수 (기본값: CPU 수)
+        chunk_size: 작업 단위 기록 수
+        progress: 청크가 끝날 때마다 진행 상황 딕셔너리를 받는 콜백
+
+    Returns:
+        {"total", "ok", "errors", "elapsed_sec", "pets_per_sec", "chunks", "workers"}
+    """
+    from app.services.pillars_service import get_pillars_service
+
+    if output_format not in ("ndjson", "csv"):
+        raise ValueError("결과 형식은 ndjson 또는 csv이어야 합니다.")
+    if input_format is not None and input_format not in INPUT_FORMATS:
+        raise ValueError(f"입력 형식은 {', '.join(INPUT_FORMATS)} 중 하나여야 합니다.")
+    workers = workers or os.cpu_count() or 1
+
+    def all_records():
+        for path in inputs:
+            for line_number, values in iter_records(path, input_format):
+                yield path, line_number, values
+
+    stats = {"total": 0, "ok": 0, "errors": 0, "elapsed_sec": 0.0, "pets_per_sec": 0.0, "chunks": 0,
+             "workers": workers}
+    writer = RosterAnalyzer(output_format, with_source=True)
+
+    with tempfile.TemporaryDirectory(prefix="pawstars-calendar-") as calendar_dir:
+        get_pillars_service().export_calendar(calendar_dir)
+
+        started = time.perf_counter()
+        # spawn: 작업 프로세스는 부모의 데이터프레임을 물려받지 않고 매핑한 인덱스만 사용
+        context = multiprocessing.get_context("spawn")
+        # 임시 파일에 기록하고 끝까지 성공하면 교체 (도중에 실패하면 일부만 기록된 결과를 남기지 않음)
+        partial = f"{output}.partial"
+        try:
+            with open(partial, "wb") as out, ProcessPoolExecutor(
+                max_workers=workers, mp_context=context,
+                initializer=_init_worker, initargs=(calendar_dir, output_format)
+            ) as pool:
+                out.write(writer.header())
+                # 결과 순서를 유지하면서 동시에 처리 중인 청크 수를 제한
+                pending = deque()
+                chunks = _chunks(all_records(), chunk_size)
+                for chunk in chunks:
+                    pending.append(pool.submit(_analyze_chunk, chunk))
+                    if len(pending) >= workers * 2:
+                        _write_result(pending.popleft(), out, stats, started, progress)
+                while pending:
+                    _write_result(pending.popleft(), out, stats, started, progress)
+
+                writer.total, writer.succeeded, writer.failed = stats["total"], stats["ok"], stats["errors"]
+                out.write(writer.footer())
+            os.replace(partial, output)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    stats["elapsed_sec"] = round(time.perf_counter() - started, 3)
+    return stats
+
+def _write_result(future, out, stats: Dict[str, Any], started: float, progress):
+    data, succeeded, failed = future.result()
+    out.write(data)
+
+    elapsed = time.perf_counter() - started
+    stats["ok"] += succeeded
+    stats["errors"] += failed
+    stats["total"] += succeeded + failed
+    stats["chunks"] += 1
+    stats["elapsed_sec"] = round(elapsed, 3)
+    stats["pets_per_sec"] = round(stats["total"] / max(elapsed, 1e-9), 1)
+    if progress:
+        progress(dict(stats))
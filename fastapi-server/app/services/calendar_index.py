@@ -0,0 +1,189 @@
+"""
+만세력 벡터 인덱스
+CSV의 간지 문자열을 한 번만 파싱하여 날짜별 육십갑자 코드 배열로 보관
+통계, 날짜 스캔, 역방향 조회 등 여러 날짜를 한꺼번에 다루는 기능이 공유
+"""
+
+import os
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.utils.mapping_tables import SEXAGENARY_CODES
+
+_GANZI_PATTERN = r'^\s*(\S{2})年\s*(\S{2})月\s*(\S{2})日'
+
+# save()/load()로 파일에 기록하는 컬럼 (파일 이름 = 속성 이름 + ".npy")
+ARRAY_COLUMNS = ("dates", "year_codes", "month_codes", "day_codes", "years", "months", "jeolki")
+
+# 역색인을 만들 수 있는 구성요소와 값의 개수 ("day" = 일주 전체, "day.stem" = 일간, ...)
+POSTING_COMPONENTS = {
+    f"{pillar_type}{part}": size
+    for pillar_type in ("year", "month", "day")
+    for part, size in (("", 60), (".stem", 10), (".branch", 12))
+}
+
+class CalendarIndex:
+    """
+    날짜 순으로 정렬된 만세력 코드 컬럼
+
+    - dates: datetime64[D] 배열
+    - year_codes / month_codes / day_codes: 육십갑자 코드 (int8)
+    - years / months: 양력 연, 월
+    - jeolki: 절기명 (없으면 빈 문자열)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.sort_values("solar_date", kind="stable")
+        parts = df["solar_ganzi"].astype(str).str.extract(_GANZI_PATTERN)
+
+        codes = []
+        for column in range(3):
+            mapped = parts[column].map(SEXAGENARY_CODES)
+            if mapped.isna().any():
+                bad = df["solar_ganzi"][mapped.isna()].iloc[0]
+                raise ValueError(f"Invalid ganzi format: {bad}")
+            codes.append(mapped.to_numpy(dtype=np.int8))
+
+        self.dates = pd.to_datetime(df["solar_date"], format="%Y-%m-%d").to_numpy().astype("datetime64[D]")
+        self.year_codes, self.month_codes, self.day_codes = codes
+        self.years = df["solar_date"].str.slice(0, 4).astype(np.int16).to_numpy()
+        self.months = df["solar_date"].str.slice(5, 7).astype(np.int8).to_numpy()
+        jeolki = df["jeolki"] if "jeolki" in df.columns else pd.Series([""] * len(df))
+        self.jeolki = jeolki.fillna("").astype(str).to_numpy()
+        self._postings: Dict[str, List[np.ndarray]] = {}
+
+    def save(self, directory: str):
+        """
+        컬럼 배열을 .npy 파일로 기록 (다른 프로세스에서 load(mmap=True)로 공유)
+        """
+        os.makedirs(directory, exist_ok=True)
+        for column in ARRAY_COLUMNS:
+            values = getattr(self, column)
+            if column == "jeolki":
+                # 문자열 배열은 고정 길이 유니코드로 저장해야 메모리 매핑 가능
+                values = values.astype(str)
+            np.save(os.path.join(directory, f"{column}.npy"), values, allow_pickle=False)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "CalendarIndex":
+        """
+        save()로 기록한 인덱스 읽기 (mmap이면 페이지를 프로세스끼리 공유하고 필요할 때만 읽음)
+        """
+        index = cls.__new__(cls)
+        for column in ARRAY_COLUMNS:
+            path = os.path.join(directory, f"{column}.npy")
+            setattr(index, column, np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False))
+        index._postings = {}
+        return index
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def row_range(self, start_date: date = None, end_date: date = None) -> Tuple[int, int]:
+        """
+        [start_date, end_date] 구간에 해당하는 행 범위 (end 미포함 인덱스)
+        """
+        lo = 0 if start_date is None else int(np.searchsorted(self.dates, np.datetime64(start_date, "D"), "left"))
+        hi = len(self.dates) if end_date is None else int(np.searchsorted(self.dates, np.datetime64(end_date, "D"), "right"))
+        return lo, max(lo, hi)
+
+    def row_of(self, target_date: date) -> int:
+        """
+        날짜의 행 번호 (없으면 -1)
+        """
+        value = np.datetime64(target_date, "D")
+        row = int(np.searchsorted(self.dates, value))
+        if row < len(self.dates) and self.dates[row] == value:
+            return row
+        return -1
+
+    def pillar_codes(self, row: int) -> Dict[str, int]:
+        """
+        행의 삼주 육십갑자 코드
+        """
+        return {
+            "year": int(self.year_codes[row]),
+            "month": int(self.month_codes[row]),
+            "day": int(self.day_codes[row])
+        }
+
+    def component_arrays(self, lo: int = 0, hi: int = None) -> Dict[str, np.ndarray]:
+        """
+        구간의 구성요소 인덱스 배열 (신살 규칙 벡터 판정용)
+
+        Returns:
+            {"year.stem": ..., "year.branch": ..., "month.stem": ..., ..., "day.branch": ...}
+        """
+        arrays = {}
+        for pillar_type, codes in (("year", self.year_codes), ("month", self.month_codes), ("day", self.day_codes)):
+            window = codes[lo:hi]
+            arrays[f"{pillar_type}.stem"] = window % 10
+            arrays[f"{pillar_type}.branch"] = window % 12
+        return arrays
+
+    def postings(self, component: str) -> List[np.ndarray]:
+        """
+        구성요소 값별 행 번호 목록 (역색인, 구성요소별로 첫 사용 시 한 번 생성)
+
+        Args:
+            component: "day", "month.branch" 등 POSTING_COMPONENTS의 키
+
+        Returns:
+            값 인덱스 -> 오름차순 행 번호 배열 (int32)
+        """
+        lists = self._postings.get(component)
+        if lists is None:
+            size = POSTING_COMPONENTS.get(component)
+            if size is None:
+                raise ValueError(f"Unknown component: {component}")
+            pillar_type, _, part = component.partition(".")
+            codes = getattr(self, f"{pillar_type}_codes")
+            values = codes % 10 if part == "stem" else codes % 12 if part == "branch" else codes
+
+            # 안정 정렬이므로 같은 값 안에서는 행 번호(=날짜) 순서가 유지됨
+            order = np.argsort(values, kind="stable").astype(np.int32)
+            bounds = np.searchsorted(values[order], np.arange(size + 1))
+            lists = [order[bounds[value]:bounds[value + 1]] for value in range(size)]
+            self._postings[component] = lists
+        return lists
+
+    def intersect(self, constraints: Dict[str, int], lo: int = 0, hi: int = None) -> np.ndarray:
+        """
+        여러 구성요소 조건을 모두 만족하는 행 번호 (역색인 교집합)
+        가장 짧은 목록부터 시작하여 후보를 다음 목록에서 이진 탐색으로 걸러내므로
+        조건이 많고 선택적일수록 비용이 줄어든다
+
+        Args:
+            constraints: 구성요소 -> 값 인덱스 (예: {"day": 0, "month.branch": 2})
+            lo, hi: 행 범위 (row_range 결과)
+
+        Returns:
+            오름차순 행 번호 배열
+        """
+        hi = len(self.dates) if hi is None else hi
+        if not constraints:
+            return np.arange(lo, hi, dtype=np.int32)
+
+        lists = sorted(
+            (self.postings(component)[value] for component, value in constraints.items()),
+            key=len
+        )
+        first = lists[0]
+        rows = first[np.searchsorted(first, lo):np.searchsorted(first, hi)]
+        for other in lists[1:]:
+            if not len(rows) or not len(other):
+                return rows[:0]
+            positions = np.minimum(np.searchsorted(other, rows), len(other) - 1)
+            rows = rows[other[positions] == rows]
+        return rows
+
+    @property
+    def start_date(self) -> str:
+        return str(self.dates[0]) if len(self.dates) else ""
+
+    @property
+    def end_date(self) -> str:
+        return str(self.dates[-1]) if len(self.dates) else ""
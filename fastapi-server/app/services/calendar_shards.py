@@ -0,0 +1,248 @@
+"""
+연도별 만세력 정적 샤드
+만세력 인덱스를 연도별 작은 JSON(삼주 코드 + 절기)으로 나누고 내용 해시를 파일 이름에 넣어
+CDN/프론트엔드가 API 호출 없이 날짜의 삼주를 계산할 수 있게 함
+
+샤드 형식 (format 1):
+    {
+        "format": 1, "year": 2021, "start": "2021-01-01", "days": 365,
+        "day": 17,                          # start의 일주 코드, i번째 날은 (day + i) % 60
+        "year_runs": [[0, 37], [33, 38]],   # [start로부터의 일수, 년주 코드] (해당 일부터 적용)
+        "month_runs": [[0, 36], [4, 37], ...],
+        "terms": [[4, "소한"], [19, "대한"], ...]
+    }
+    일주가 하루씩 순환하지 않는 데이터면 "day" 대신 "day_codes" (일별 코드 리스트),
+    날짜가 연속이 아니면 "dates" (일별 날짜 리스트, 오프셋은 이 리스트의 위치)
+
+manifest.json:
+    {"format": 1, "data_version": "0fc05aa0", "start_date": "...", "end_date": "...",
+     "cycle": ["甲子", "乙丑", ...], "shards": {"2021": "2021.<해시 12자>.json", ...}}
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.calendar_index import CalendarIndex
+from app.utils.mapping_tables import SEXAGENARY_CYCLE
+
+SHARD_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+
+# 해시가 들어간 샤드는 내용이 바뀌면 이름도 바뀌므로 영구 캐시, manifest는 짧게 캐시
+MANIFEST_MAX_AGE = 300
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MANIFEST_CACHE_CONTROL = f"public, max-age={MANIFEST_MAX_AGE}"
+
+# 샤드 파일 이름 (출력 디렉터리에서 이 형식이 아닌 파일은 건드리지 않음)
+SHARD_NAME_PATTERN = re.compile(r"^\d{4}\.[0-9a-f]{12}\.json$")
+
+def _dumps(content: Dict[str, Any]) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _runs(codes: np.ndarray) -> list:
+    """
+    값이 바뀌는 위치만 [오프셋, 코드]로 기록
+    """
+    if not len(codes):
+        return []
+    changes = np.flatnonzero(np.diff(codes.astype(np.int16))) + 1
+    starts = np.concatenate(([0], changes))
+    return [[int(offset), int(codes[offset])] for offset in starts]
+
+def build_year_shard(index: CalendarIndex, year: int) -> Optional[Dict[str, Any]]:
+    """
+    한 해의 샤드 내용 (해당 연도 데이터가 없으면 None)
+    """
+    lo, hi = index.row_range(date(year, 1, 1), date(year, 12, 31))
+    if hi <= lo:
+        return None
+
+    day_codes = index.day_codes[lo:hi].astype(np.int16)
+    shard = {
+        "format": SHARD_FORMAT,
+        "year": year,
+        "start": str(index.dates[lo]),
+        "days": int(hi - lo)
+    }
+    # 날짜가 연속이고 일주가 하루씩 순환하면 첫날 코드만 기록
+    contiguous = int((index.dates[hi - 1] - index.dates[lo]).astype(int)) == hi - lo - 1
+    if contiguous and np.all((day_codes - day_codes[0]) % 60 == np.arange(hi - lo) % 60):
+        shard["day"] = int(day_codes[0])
+    else:
+        shard["day_codes"] = day_codes.tolist()
+        shard["dates"] = None if contiguous else index.dates[lo:hi].astype(str).tolist()
+    shard["year_runs"] = _runs(index.year_codes[lo:hi])
+    shard["month_runs"] = _runs(index.month_codes[lo:hi])
+    jeolki = index.jeolki[lo:hi]
+    shard["terms"] = [[int(offset), str(jeolki[offset])] for offset in np.flatnonzero(jeolki != "")]
+    return shard
+
+def resolve_from_shard(shard: Dict[str, Any], day: date) -> Optional[Dict[str, Any]]:
+    """
+    샤드로 날짜의 삼주 코드와 절기 계산 (프론트엔드 구현의 기준, 샤드 검증용)
+
+    Returns:
+        {"year": 37, "month": 35, "day": 19, "jeolki": ""} 또는 None
+    """
+    if shard.get("dates"):
+        try:
+            offset = shard["dates"].index(day.isoformat())
+        except ValueError:
+            return None
+    else:
+        offset = (day - date.fromisoformat(shard["start"])).days
+        if not 0 <= offset < shard["days"]:
+            return None
+
+    def run_value(runs):
+        value = runs[0][1]
+        for start, code in runs:
+            if start > offset:
+                break
+            value = code
+        return value
+
+    day_code = shard["day_codes"][offset] if "day_codes" in shard else (shard["day"] + offset) % 60
+    terms = dict((start, name) for start, name in shard["terms"])
+    return {
+        "year": run_value(shard["year_runs"]),
+        "month": run_value(shard["month_runs"]),
+        "day": day_code,
+        "jeolki": terms.get(offset, "")
+    }
+
+class CalendarShards:
+    """
+    한 만세력 버전의 샤드 묶음 (파일 이름 -> 바이트)
+    """
+
+    def __init__(self, index: CalendarIndex, data_version: int):
+        self.data_version = data_version
+        self.files: Dict[str, bytes] = {}
+        self.etags: Dict[str, str] = {}
+        shard_names = {}
+
+        if len(index):
+            first_year = int(index.years[0])
+            last_year = int(index.years[-1])
+            for year in range(first_year, last_year + 1):
+                shard = build_year_shard(index, year)
+                if shard is None:
+                    continue
+                body = _dumps(shard)
+                digest = hashlib.sha256(body).hexdigest()[:12]
+                name = f"{year}.{digest}.json"
+                self.files[name] = body
+                self.etags[name] = f'"{digest}"'
+                shard_names[str(year)] = name
+
+        manifest = _dumps({
+            "format": SHARD_FORMAT,
+            "data_version": f"{data_version & 0xFFFFFFFF:08x}",
+            "start_date": index.start_date,
+            "end_date": index.end_date,
+            "cycle": SEXAGENARY_CYCLE,
+            "shards": shard_names
+        })
+        self.files[MANIFEST_NAME] = manifest
+        self.etags[MANIFEST_NAME] = f'"{hashlib.sha256(manifest).hexdigest()[:12]}"'
+
+    def get(self, name: str) -> Optional[Tuple[bytes, str, str]]:
+        """
+        파일 내용, ETag, Cache-Control (없으면 None)
+        """
+        body = self.files.get(name)
+        if body is None:
+            return None
+        cache_control = MANIFEST_CACHE_CONTROL if name == MANIFEST_NAME else IMMUTABLE_CACHE_CONTROL
+        return body, self.etags[name], cache_control
+
+    def write(self, directory: str) -> int:
+        """
+        샤드와 manifest를 디렉터리에 기록하고 더 이상 참조될 수 없는 이전 샤드만 삭제
+
+        - 샤드 이름 형식(SHARD_NAME_PATTERN)이 아닌 파일은 삭제하지 않음 (다른 정적 파일과 같은 디렉터리여도 안전)
+        - 직전 manifest가 참조하는 샤드는 유지 (캐시된 manifest를 가진 클라이언트/CDN이 최대 MANIFEST_MAX_AGE초 동안 요청)
+        - 그보다 오래된 세대의 샤드는 직전 manifest가 기록된 지 MANIFEST_MAX_AGE초가 지났을 때만 삭제
+        - 샤드를 모두 기록한 뒤 manifest를 마지막에 교체하므로 manifest가 없는 샤드를 가리키는 순간이 없음
+
+        Returns:
+            기록한 파일 수
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        keep = set(self.files)
+        previous_age = None
+        try:
+            with open(manifest_path, "rb") as f:
+                keep.update(json.load(f).get("shards", {}).values())
+            previous_age = time.time() - os.path.getmtime(manifest_path)
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        for name, body in self.files.items():
+            if name != MANIFEST_NAME:
+                with open(os.path.join(directory, name), "wb") as f:
+                    f.write(body)
+        temporary = f"{manifest_path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(self.files[MANIFEST_NAME])
+        os.replace(temporary, manifest_path)
+
+        if previous_age is None or previous_age >= MANIFEST_MAX_AGE:
+            for existing in os.listdir(directory):
+                if SHARD_NAME_PATTERN.match(existing) and existing not in keep:
+                    os.remove(os.path.join(directory, existing))
+        return len(self.files)
+
+_shards: Optional[CalendarShards] = None
+# 교체된 이전 버전 샤드 [(교체 시각, 샤드)], 캐시된 manifest가 만료될 때까지 계속 제공
+_retired: List[Tuple[float, CalendarShards]] = []
+_shards_lock = threading.Lock()
+
+def get_calendar_shards() -> CalendarShards:
+    """
+    현재 만세력 버전의 샤드 (버전이 바뀌면 다시 생성하고 이전 버전은 MANIFEST_MAX_AGE초 동안 보관)
+    """
+    global _shards, _retired
+    from app.services.pillars_service import get_pillars_service
+
+    snapshot = get_pillars_service().snapshot
+    shards = _shards
+    if shards is None or shards.data_version != snapshot.data_version:
+        with _shards_lock:
+            if _shards is None or _shards.data_version != snapshot.data_version:
+                now = time.monotonic()
+                retired = [(at, old) for at, old in _retired if now - at < MANIFEST_MAX_AGE]
+                if _shards is not None:
+                    retired.append((now, _shards))
+                _retired = retired
+                _shards = CalendarShards(snapshot.index, snapshot.data_version)
+            shards = _shards
+    return shards
+
+def find_calendar_file(name: str) -> Optional[Tuple[bytes, str, str]]:
+    """
+    샤드 파일 조회 (현재 버전에 없으면 교체된 지 MANIFEST_MAX_AGE초가 지나지 않은 이전 버전의 샤드)
+
+    Returns:
+        (파일 내용, ETag, Cache-Control) 또는 None
+    """
+    found = get_calendar_shards().get(name)
+    if found is not None or name == MANIFEST_NAME:
+        return found
+    now = time.monotonic()
+    for retired_at, shards in reversed(_retired):
+        if now - retired_at < MANIFEST_MAX_AGE:
+            found = shards.get(name)
+            if found is not None:
+                return found
+    return None
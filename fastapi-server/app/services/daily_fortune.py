@@ -0,0 +1,312 @@
+"""
+일일 운세 계산 및 사전 계산 저장소
+운세 판정 커널(스칼라/벡터 공용), 날짜별 운세 저장소, 등록부 전체 일괄 계산 작업
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.data_paths import runtime_data_path, unwritable_path_error
+from app.utils.mapping_tables import STEM_KOREAN, DAILY_FORTUNE_MESSAGES
+
+def daily_fortune_codes(pet_day_codes, today_day_code: int) -> np.ndarray:
+    """
+    반려견 일주 코드(들)와 오늘 일주 코드로 운세 코드 계산 (DAILY_FORTUNE_MESSAGES 인덱스)
+    일간(코드 % 10)이 같으면 1, 아니면 0
+
+    Args:
+        pet_day_codes: 반려견 일주 육십갑자 코드 (정수 또는 배열)
+        today_day_code: 오늘 일주 육십갑자 코드
+
+    Returns:
+        운세 코드 배열 (uint8)
+    """
+    pet_day_codes = np.asarray(pet_day_codes)
+    return (pet_day_codes % 10 == today_day_code % 10).astype(np.uint8)
+
+def render_daily_fortune(pet_name: str, target_date: str, pet_day_code: int, today_day_code: int,
+                         fortune_code: int, daily_pillars: Dict[str, str], jeolki: str = "") -> Dict[str, Any]:
+    """
+    운세 코드를 DailyFortuneResponse 형태로 변환
+    """
+    return {
+        "pet_name": pet_name,
+        "target_date": target_date,
+        "pet_day_stem": STEM_KOREAN[pet_day_code % 10],
+        "today_day_stem": STEM_KOREAN[today_day_code % 10],
+        "fortune_message": DAILY_FORTUNE_MESSAGES[fortune_code],
+        "daily_pillars": daily_pillars,
+        "jeolki": jeolki
+    }
+
+_DAY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fortunes (
+    pet_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    day_code INTEGER NOT NULL,
+    fortune_code INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+class FortuneStore:
+    def __init__(self, store_dir: str = None):
+        """
+        날짜별 사전 계산 운세 저장소 (하루에 SQLite 파일 하나, 지난 날짜는 파일 삭제로 정리)
+
+        Args:
+            store_dir: 저장 디렉토리 (기본값: PAWSTARS_FORTUNE_STORE_DIR 또는 데이터 디렉터리의 fortunes)
+        """
+        if store_dir is None:
+            store_dir = os.environ.get("PAWSTARS_FORTUNE_STORE_DIR") or runtime_data_path("fortunes")
+
+        self.store_dir = store_dir
+        self._readers: Dict[str, Tuple[int, sqlite3.Connection]] = {}
+        self._static_meta: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, target_date: str) -> str:
+        return os.path.join(self.store_dir, f"{target_date}.sqlite3")
+
+    def _reader(self, target_date: str) -> Optional[sqlite3.Connection]:
+        """
+        날짜별 읽기 커넥션 (작업이 파일을 새로 만들면 inode가 바뀌므로 다시 연결)
+        """
+        path = self.path_for(target_date)
+        try:
+            inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            return None
+
+        cached = self._readers.get(target_date)
+        if cached is not None and cached[0] == inode:
+            return cached[1]
+
+        with self._lock:
+            cached = self._readers.get(target_date)
+            if cached is None or cached[0] != inode:
+                if cached is not None:
+                    cached[1].close()
+                self._static_meta.pop(target_date, None)
+                cached = (inode, sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False))
+                self._readers[target_date] = cached
+        return cached[1]
+
+    def open_writer(self, target_date: str, meta: Dict[str, Any]) -> sqlite3.Connection:
+        """
+        해당 날짜 저장소를 새로 만들고 쓰기용 커넥션 반환 (기존 파일은 교체)
+
+        Raises:
+            DataPathError: 저장 디렉토리를 만들 수 없음 (읽기 전용 파일 시스템 등)
+        """
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+        except OSError as e:
+            raise unwritable_path_error(self.store_dir, "PAWSTARS_FORTUNE_STORE_DIR", e)
+        path = self.path_for(target_date)
+
+        with self._lock:
+            cached = self._readers.pop(target_date, None)
+            if cached is not None:
+                cached[1].close()
+            self._static_meta.pop(target_date, None)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_DAY_SCHEMA)
+        self.update_meta(conn, **meta)
+        return conn
+
+    def update_meta(self, conn: sqlite3.Connection, **values):
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value, ensure_ascii=False)) for key, value in values.items()]
+        )
+
+    def write_fortunes(self, conn: sqlite3.Connection, rows: List[Tuple[str, str, int, int]]):
+        conn.execute("BEGIN")
+        conn.executemany("INSERT OR REPLACE INTO fortunes VALUES (?, ?, ?, ?)", rows)
+        conn.execute("COMMIT")
+
+    def get_meta(self, target_date: str) -> Optional[Dict[str, Any]]:
+        """
+        날짜별 작업 정보 (대상 날짜 일진, 진행 상황, 처리량)
+        """
+        conn = self._reader(target_date)
+        if conn is None:
+            return None
+        rows = conn.execute("SELECT key, value FROM meta").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def _day_meta(self, target_date: str) -> Optional[Dict[str, Any]]:
+        meta = self._static_meta.get(target_date)
+        if meta is None:
+            meta = self.get_meta(target_date)
+            if meta is None:
+                return None
+            self._static_meta[target_date] = meta
+        return meta
+
+    def lookup(self, pet_id: str, target_date: str, data_version: int) -> Optional[Dict[str, Any]]:
+        """
+        사전 계산된 운세 조회
+
+        Args:
+            pet_id: 반려견 등록부 ID
+            target_date: 운세 날짜
+            data_version: 현재 만세력 데이터 버전 (다르면 저장된 결과를 사용하지 않음)
+
+        Returns:
+            DailyFortuneResponse 형태의 결과 또는 None
+        """
+        conn = self._reader(target_date)
+        meta = self._day_meta(target_date) if conn is not None else None
+        if meta is None or meta.get("data_version") != data_version:
+            return None
+
+        row = conn.execute(
+            "SELECT name, day_code, fortune_code FROM fortunes WHERE pet_id = ?", (pet_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        name, day_code, fortune_code = row
+        return render_daily_fortune(
+            pet_name=name,
+            target_date=target_date,
+            pet_day_code=day_code,
+            today_day_code=meta["today_day_code"],
+            fortune_code=fortune_code,
+            daily_pillars=meta["daily_pillars"],
+            jeolki=meta.get("jeolki", "")
+        )
+
+def _compute_chunk(registry_path: str, rowid_start: int, rowid_end: int,
+                   today_day_code: int, data_version: int) -> List[Tuple[str, str, int, int]]:
+    """
+    프로세스 풀 작업 단위: 등록부의 rowid 구간을 읽어 운세 코드를 벡터 연산으로 계산
+    (다른 만세력 버전으로 분석된 행은 일주 코드가 틀릴 수 있으므로 제외)
+    """
+    conn = sqlite3.connect(f"file:{registry_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            "SELECT pet_id, name, day_code FROM pets WHERE rowid >= ? AND rowid < ? AND data_version = ?",
+            (rowid_start, rowid_end, data_version)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    if not rows:
+        return []
+
+    pet_ids, names, day_codes = zip(*rows)
+    fortune_codes = daily_fortune_codes(np.fromiter(day_codes, dtype=np.int16, count=len(rows)), today_day_code)
+    return list(zip(pet_ids, names, day_codes, fortune_codes.tolist()))
+
+def precompute_daily_fortunes(target_date: str = None, workers: int = None, chunk_size: int = 50_000,
+                              progress: Callable[[Dict[str, Any]], None] = None,
+                              store: FortuneStore = None) -> Dict[str, Any]:
+    """
+    등록부의 모든 반려견에 대해 해당 날짜의 운세를 일괄 계산하여 저장소에 기록
+    이전 만세력 버전으로 분석된 반려견은 건너뛰고 stale로 집계 (PetService.refresh_stale_pets로 먼저 갱신)
+
+    Args:
+        target_date: 운세 날짜 (기본값: 오늘)
+        workers: 프로세스 수 (기본값: CPU 수)
+        chunk_size: 작업 단위 rowid 구간 크기
+        progress: 청크가 끝날 때마다 진행 상황 딕셔너리를 받는 콜백
+        store: 운세 저장소 (기본값: 전역 저장소)
+
+    Returns:
+        {"target_date", "total", "stale", "processed", "elapsed_sec", "pets_per_sec", "chunks"}
+    """
+    from app.services.pet_registry import pet_registry
+    from app.services.pillars_service import get_pillars_service
+    from app.utils.ganzi_parser import parse_solar_ganzi, ganzi_to_code
+
+    store = store or fortune_store
+    if target_date is None:
+        target_date = datetime.now().strftime("%Y-%m-%d")
+
+    # 도중에 만세력이 교체되면 저장된 결과가 이전 버전으로 기록되어 조회 시 다시 계산됨
+    data_version = get_pillars_service().data_version
+    daily = get_pillars_service().get_pillars_by_date(target_date)
+    if not daily:
+        raise ValueError(f"해당 날짜({target_date})의 만세력 정보를 찾을 수 없습니다.")
+    daily_pillars = parse_solar_ganzi(daily["solar_ganzi"])
+    today_day_code = ganzi_to_code(daily_pillars["day"])
+
+    pet_registry.flush()
+    with pet_registry._connection() as conn:
+        total, stale, rowid_min, rowid_max = conn.execute(
+            "SELECT COUNT(*), COUNT(CASE WHEN data_version != ? THEN 1 END), MIN(rowid), MAX(rowid) FROM pets",
+            (data_version,)
+        ).fetchone()
+    total -= stale
+
+    started = time.perf_counter()
+    writer = store.open_writer(target_date, {
+        "target_date": target_date,
+        "daily_pillars": daily_pillars,
+        "today_day_code": today_day_code,
+        "jeolki": daily.get("jeolki", ""),
+        "data_version": data_version,
+        "status": "running",
+        "total": total,
+        "stale": stale,
+        "processed": 0,
+        "started_at": datetime.now().isoformat()
+    })
+
+    stats = {"target_date": target_date, "total": total, "stale": stale, "processed": 0, "elapsed_sec": 0.0,
+             "pets_per_sec": 0.0, "chunks": 0}
+    try:
+        if total:
+            ranges = range(rowid_min, rowid_max + 1, chunk_size)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_compute_chunk, pet_registry.db_path, start, start + chunk_size, today_day_code,
+                                data_version)
+                    for start in ranges
+                ]
+                for future in futures:
+                    rows = future.result()
+                    store.write_fortunes(writer, rows)
+
+                    elapsed = time.perf_counter() - started
+                    stats.update(
+                        processed=stats["processed"] + len(rows),
+                        chunks=stats["chunks"] + 1,
+                        elapsed_sec=round(elapsed, 3),
+                        pets_per_sec=round((stats["processed"] + len(rows)) / max(elapsed, 1e-9), 1)
+                    )
+                    store.update_meta(writer, processed=stats["processed"], pets_per_sec=stats["pets_per_sec"])
+                    if progress:
+                        progress(dict(stats))
+
+        stats["elapsed_sec"] = round(time.perf_counter() - started, 3)
+        store.update_meta(writer, status="complete", processed=stats["processed"],
+                          elapsed_sec=stats["elapsed_sec"], pets_per_sec=stats["pets_per_sec"],
+                          finished_at=datetime.now().isoformat())
+    except Exception as e:
+        store.update_meta(writer, status="failed", error=str(e))
+        raise
+    finally:
+        writer.close()
+
+    return stats
+
+# 전역 인스턴스 생성
+fortune_store = FortuneStore()
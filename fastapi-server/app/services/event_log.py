@@ -0,0 +1,203 @@
+"""
+구조화 이벤트 로그 (요청 경로를 막지 않는 JSON lines 로그)
+요청/서비스 이벤트를 크기가 제한된 메모리 큐에 넣기만 하고, 직렬화와 기록은 백그라운드 스레드가 담당
+큐가 가득 차면 기다리지 않고 버린 뒤 개수만 셈 (로그 때문에 요청이 느려지지 않도록)
+
+요청 처리 중의 단계 시간, 캐시 적중 여부 등은 record_stage / mark로 현재 요청의 이벤트에 붙임
+(요청 로그 미들웨어가 만든 컨텍스트가 없으면 아무 일도 하지 않음)
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+# 큐 크기 (이벤트 수), 요청 이벤트 표본 비율 (0~1), 항상 기록할 느린 요청 기준 (밀리초), 기록 파일 (비우면 stdout)
+LOG_QUEUE_SIZE = int(os.environ.get("PAWSTARS_LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATE = float(os.environ.get("PAWSTARS_LOG_SAMPLE_RATE", "1.0"))
+LOG_SLOW_MS = float(os.environ.get("PAWSTARS_LOG_SLOW_MS", "1000"))
+LOG_PATH = os.environ.get("PAWSTARS_LOG_PATH", "")
+
+# 한 번에 모아 쓰는 최대 이벤트 수
+WRITE_BATCH = 512
+
+# 예상된 503을 표시하는 요청 필드 (수용 제어 거절, 워밍업 중 준비 확인)
+# 과부하/기동 중에 쏟아지므로 error로 올리지 않고 warning으로 표본 추출
+EXPECTED_UNAVAILABLE_MARKS = ("shed", "warming_up")
+
+# 현재 요청의 부가 정보 {"stages": {단계: 초}, 그 외 mark로 붙인 필드}
+_request_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("pawstars_request_context", default=None)
+
+def begin_request() -> Dict[str, Any]:
+    """
+    현재 요청의 컨텍스트 시작 (요청 로그 미들웨어에서 호출)
+    """
+    context = {"stages": {}}
+    _request_context.set(context)
+    return context
+
+def record_stage(name: str, seconds: float):
+    """
+    현재 요청의 단계 소요 시간 누적 (같은 단계가 여러 번이면 합산)
+    """
+    context = _request_context.get()
+    if context is not None:
+        stages = context["stages"]
+        stages[name] = stages.get(name, 0.0) + seconds
+
+def mark(**fields):
+    """
+    현재 요청 이벤트에 필드 추가 (예: mark(cache_hit=True))
+    """
+    context = _request_context.get()
+    if context is not None:
+        context.update(fields)
+
+def describe_error(error: BaseException) -> str:
+    """
+    로그용 예외 설명 ("타입: 메시지")
+    repr()과 달리 UnicodeDecodeError 등이 들고 있는 입력 원문(업로드된 명단 바이트 등)을 남기지 않음
+    """
+    return f"{type(error).__name__}: {error}"
+
+class EventLog:
+    """
+    크기 제한 큐 + 백그라운드 기록 스레드
+
+    - emit: 서비스 이벤트 (표본 추출 없음)
+    - request: 요청 이벤트 (sample_rate로 표본 추출, 5xx와 느린 요청은 항상 기록)
+      수용 제어 거절/워밍업 중의 503은 warning으로 표본 추출하고 unavailable에 모두 집계
+    - 기록 스레드는 첫 이벤트가 들어올 때 시작
+    """
+
+    def __init__(self, capacity: int = LOG_QUEUE_SIZE, sample_rate: float = LOG_SAMPLE_RATE,
+                 slow_ms: float = LOG_SLOW_MS, path: str = LOG_PATH):
+        self.capacity = capacity
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.slow_ms = slow_ms
+        self.path = path
+        self._queue: "queue.Queue" = queue.Queue(maxsize=capacity)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._stream = None
+
+        self.accepted = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.unavailable = 0
+        self.write_errors = 0
+
+    def emit(self, event: str, level: str = "info", **fields):
+        """
+        서비스 이벤트 기록 요청 (큐가 가득 차면 버리고 dropped 증가)
+        """
+        self._put((time.time(), level, event, fields))
+
+    def request(self, status_code: int, duration_ms: float, fields: Dict[str, Any]):
+        """
+        요청 이벤트 기록 요청 (표본에서 빠지면 sampled_out 증가)
+        """
+        expected = status_code == 503 and any(fields.get(key) for key in EXPECTED_UNAVAILABLE_MARKS)
+        if expected:
+            self.unavailable += 1
+            level = "warning"
+        else:
+            level = "error" if status_code >= 500 else "info"
+        if (self.sample_rate < 1.0 and level != "error" and duration_ms < self.slow_ms
+                and random.random() >= self.sample_rate):
+            self.sampled_out += 1
+            return
+        self._put((time.time(), level, "request", fields))
+
+    def _put(self, item):
+        if self._writer is None:
+            self._start_writer()
+        try:
+            self._queue.put_nowait(item)
+            self.accepted += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _start_writer(self):
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+                self._writer.start()
+
+    def _open(self):
+        if self._stream is None:
+            self._stream = open(self.path, "a", encoding="utf-8") if self.path else sys.stdout
+        return self._stream
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for ts, level, event, fields in batch:
+                record = {
+                    "ts": datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds"),
+                    "level": level,
+                    "event": event,
+                    **fields
+                }
+                lines.append(json.dumps(record, ensure_ascii=False, default=str))
+            try:
+                stream = self._open()
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+                self.written += len(batch)
+            except Exception:
+                self.write_errors += len(batch)
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """
+        큐에 들어간 이벤트가 모두 기록될 때까지 대기 (종료 시 사용)
+
+        Returns:
+            제한 시간 안에 모두 기록했으면 True
+        """
+        deadline = time.monotonic() + timeout
+        while self.written + self.write_errors < self.accepted:
+            if self._writer is None or not self._writer.is_alive() or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        로그 큐 상태
+
+        Returns:
+            {"queued", "capacity", "accepted", "written", "dropped", "sampled_out", "unavailable", "write_errors",
+             "sample_rate"}
+        """
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self.capacity,
+            "accepted": self.accepted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "unavailable": self.unavailable,
+            "write_errors": self.write_errors,
+            "sample_rate": self.sample_rate
+        }
+
+# 전역 인스턴스 생성
+event_log = EventLog()
+
+# CLI 작업(일괄 분석, 사전 계산)이 끝날 때 남은 이벤트 기록
+atexit.register(event_log.flush)
@@ -4,7 +4,8 @@
 """
 
 from typing import Dict, Any
-from app.utils.mapping_tables import HEAVENLY_STEMS, FIVE_ELEMENT_TRAITS, BREED_TRAITS
+from app.utils.mapping_tables import HEAVENLY_STEMS, EARTHLY_BRANCHES, FIVE_ELEMENT_TRAITS, BREED_TRAITS, FIVE_ELEMENTS
+from app.utils.ganzi_parser import extract_stems_and_branches
 
 def get_five_element_from_stem(day_stem: str) -> str:
     """
@@ -46,20 +47,32 @@ def get_breed_trait(breed: str) -> str:
     Returns:
         견종별 성향 설명
     """
+    return BREED_TRAITS[resolve_breed_name(breed)]
+
+def resolve_breed_name(breed: str) -> str:
+    """
+    입력된 견종명을 BREED_TRAITS의 대표 견종명으로 정규화
+    
+    Args:
+        breed: 견종명
+        
+    Returns:
+        대표 견종명 (예: "토이푸들" -> "푸들", 매칭 실패 시 "믹스")
+    """
     # 견종명을 정규화 (공백 제거, 소문자 변환 등)
     normalized_breed = breed.strip()
     
     # 직접 매칭 시도
     if normalized_breed in BREED_TRAITS:
-        return BREED_TRAITS[normalized_breed]
+        return normalized_breed
     
     # 부분 매칭 시도 (예: "토이푸들" -> "푸들")
     for breed_key in BREED_TRAITS:
         if breed_key in normalized_breed or normalized_breed in breed_key:
-            return BREED_TRAITS[breed_key]
+            return breed_key
     
     # 매칭되지 않으면 기본값
-    return BREED_TRAITS["믹스"]
+    return "믹스"
 
 def analyze_temperament(day_stem: str, breed: str) -> Dict[str, str]:
     """
@@ -99,6 +112,22 @@ def analyze_temperament(day_stem: str, breed: str) -> Dict[str, str]:
         "activity_tip": element_traits["activity_tips"]
     }
 
+def analyze_element_balance(pillars: Dict[str, str]) -> Dict[str, int]:
+    """
+    모든 주(柱)의 천간/지지 오행 분포 (삼주면 6글자, 시주 포함 시 8글자)
+    
+    Args:
+        pillars: {"year": "乙未", "month": "戊子", "day": "癸丑", "hour": "甲寅"}
+        
+    Returns:
+        {"목": 3, "화": 0, "토": 2, "금": 0, "수": 3}
+    """
+    balance = {element: 0 for element in FIVE_ELEMENTS}
+    for stem_branch in extract_stems_and_branches(pillars).values():
+        balance[HEAVENLY_STEMS[stem_branch["stem"]]["element"]] += 1
+        balance[EARTHLY_BRANCHES[stem_branch["branch"]]["element"]] += 1
+    return balance
+
 def get_element_compatibility(element1: str, element2: str) -> Dict[str, Any]:
     """
     두 오행 간의 상성 분석 (추후 궁합 기능용)
@@ -0,0 +1,143 @@
+"""
+세운(연운)/대운 타임라인
+연주는 만세력 조회 없이 육십갑자 주기 산술((연도 - 4) % 60, 입춘 기준)로 구하고,
+반려견 사주와의 관계 점수는 relations의 미리 계산한 테이블을 배열 인덱싱하여 구간 전체를 한 번에 계산
+
+- 십신: 반려견 일간 기준으로 본 연주(대운) 천간의 관계 (10x10 테이블)
+- 대운: 월주에서 10년마다 한 칸씩 순행(양년생 수컷, 음년생 암컷) 또는 역행
+  시작 나이는 태어난 날부터 다음(역행은 이전) 절입일까지의 일수 / 3 (만세력 월주가 바뀌는 날 = 절입일)
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.calendar_index import CalendarIndex
+from app.services.relations import branch_relation_name, pillar_scores
+from app.utils.ganzi_parser import code_to_ganzi
+
+# 한 번에 계산하는 최대 연수
+MAX_TIMELINE_YEARS = 120
+
+# 대운 한 칸의 길이 (년)
+DECADE_YEARS = 10
+
+# 일간 기준 십신 (같은 오행, 일간이 생, 일간이 극, 일간을 극, 일간을 생) x (음양 같음, 다름)
+TEN_GODS = ["비견", "겁재", "식신", "상관", "편재", "정재", "편관", "정관", "편인", "정인"]
+
+def _build_ten_god_table() -> np.ndarray:
+    table = np.zeros((10, 10), dtype=np.int8)
+    for day_stem in range(10):
+        for other_stem in range(10):
+            # 오행 순서(목화토금수)에서의 거리: 0 같음, 1 생, 2 극, 3 극당함, 4 생받음
+            distance = (other_stem // 2 - day_stem // 2) % 5
+            table[day_stem, other_stem] = 2 * distance + (day_stem % 2 != other_stem % 2)
+    table.setflags(write=False)
+    return table
+
+# TEN_GOD_TABLE[일간 코드, 비교 천간 코드] = TEN_GODS 인덱스
+TEN_GOD_TABLE = _build_ten_god_table()
+
+def year_pillar_codes(years: np.ndarray) -> np.ndarray:
+    """
+    양력 연도(입춘 이후)의 연주 육십갑자 코드 (1984년 = 甲子 = 0)
+    """
+    return (np.asarray(years, dtype=np.int64) - 4) % 60
+
+def decade_start_age(index: CalendarIndex, birth_row: int, forward: bool) -> Optional[int]:
+    """
+    대운 시작 나이 (절입일까지의 일수 / 3, 반올림, 최소 1)
+
+    Args:
+        index: 만세력 벡터 인덱스
+        birth_row: 태어난 날의 행 번호
+        forward: 순행이면 다음 절입일, 역행이면 이전 절입일까지 셈
+
+    Returns:
+        시작 나이 또는 None (만세력 범위 밖이라 절입일을 알 수 없는 경우)
+    """
+    month_code = index.month_codes[birth_row]
+    if forward:
+        changed = np.flatnonzero(index.month_codes[birth_row:] != month_code)
+        if len(changed) == 0:
+            return None
+        days = int(changed[0])
+    else:
+        changed = np.flatnonzero(index.month_codes[:birth_row + 1] != month_code)
+        if len(changed) == 0:
+            return None
+        # changed[-1]은 이전 달의 마지막 날이므로 그다음 날(절입일)까지 셈 (순행과 같은 기준)
+        days = birth_row - (int(changed[-1]) + 1)
+    return max(1, int(round(days / 3)))
+
+def build_luck_timeline(pet_codes: Dict[str, int], start_year: int, years: int,
+                        birth_year: Optional[int] = None, start_age: Optional[int] = None,
+                        forward: bool = True) -> Dict[str, Any]:
+    """
+    구간 전체의 세운과 대운을 한 번에 계산
+
+    Args:
+        pet_codes: 반려견 사주 코드 {"year", "month", "day", ("hour")}
+        start_year: 시작 연도
+        years: 연수 (1~MAX_TIMELINE_YEARS)
+        birth_year: 태어난 해 (없으면 나이와 대운 생략)
+        start_age: 대운 시작 나이 (없으면 대운 생략)
+        forward: 대운 순행 여부
+
+    Returns:
+        {"years": [...], "decades": [...]}
+
+    Raises:
+        ValueError: 연수 범위 오류
+    """
+    if not 1 <= years <= MAX_TIMELINE_YEARS:
+        raise ValueError(f"연수는 1~{MAX_TIMELINE_YEARS}이어야 합니다.")
+
+    calendar_years = np.arange(start_year, start_year + years)
+    year_codes = year_pillar_codes(calendar_years)
+    year_scores = pillar_scores(pet_codes, year_codes)
+    day_stem, day_branch = pet_codes["day"] % 10, pet_codes["day"] % 12
+    year_gods = TEN_GOD_TABLE[day_stem, year_codes % 10]
+
+    # 연도별 대운 칸 번호 (대운 시작 전이거나 알 수 없으면 -1)
+    steps = np.full(years, -1)
+    if birth_year is not None and start_age is not None:
+        ages = calendar_years - birth_year
+        started = ages >= start_age
+        steps[started] = (ages[started] - start_age) // DECADE_YEARS
+    direction = 1 if forward else -1
+    decade_codes = (pet_codes["month"] + direction * (steps + 1)) % 60
+    decade_scores = np.where(steps >= 0, pillar_scores(pet_codes, decade_codes), 0)
+    total_scores = year_scores + decade_scores
+
+    timeline = []
+    for offset, year in enumerate(calendar_years.tolist()):
+        code = int(year_codes[offset])
+        in_decade = steps[offset] >= 0
+        timeline.append({
+            "year": year,
+            "age": year - birth_year if birth_year is not None and year >= birth_year else None,
+            "pillar": code_to_ganzi(code),
+            "ten_god": TEN_GODS[year_gods[offset]],
+            "relation": branch_relation_name(day_branch, code % 12),
+            "score": int(year_scores[offset]),
+            "decade_pillar": code_to_ganzi(int(decade_codes[offset])) if in_decade else None,
+            "total_score": int(total_scores[offset])
+        })
+
+    decades: List[Dict[str, Any]] = []
+    for step in np.unique(steps[steps >= 0]).tolist():
+        offset = int(np.argmax(steps == step))
+        code = int(decade_codes[offset])
+        first_age = start_age + step * DECADE_YEARS
+        decades.append({
+            "start_age": first_age,
+            "end_age": first_age + DECADE_YEARS - 1,
+            "start_year": birth_year + first_age,
+            "end_year": birth_year + first_age + DECADE_YEARS - 1,
+            "pillar": code_to_ganzi(code),
+            "ten_god": TEN_GODS[TEN_GOD_TABLE[day_stem, code % 10]],
+            "score": int(decade_scores[offset])
+        })
+
+    return {"years": timeline, "decades": decades}
@@ -0,0 +1,446 @@
+"""
+반려견 등록부(Registry) 서비스
+SQLite 기반 임베디드 저장소에 분석 결과를 보관하여 재분석 없이 조회
+"""
+
+import atexit
+import json
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.event_log import event_log
+from app.utils.data_paths import runtime_data_path, unwritable_path_error
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pets (
+    pet_id TEXT NOT NULL UNIQUE,
+    owner_id TEXT,
+    name TEXT NOT NULL,
+    breed TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    year_code INTEGER NOT NULL,
+    month_code INTEGER NOT NULL,
+    day_code INTEGER NOT NULL,
+    hour_code INTEGER,
+    element INTEGER NOT NULL,
+    data_version INTEGER NOT NULL,
+    analysis BLOB NOT NULL,
+    created_at TEXT NOT NULL,
+    day_stem INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_pets_owner ON pets(owner_id) WHERE owner_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_pets_day_code_version_id ON pets(day_code, data_version, pet_id);
+CREATE INDEX IF NOT EXISTS idx_pets_day_stem_version_id ON pets(day_stem, data_version, pet_id);
+CREATE INDEX IF NOT EXISTS idx_pets_element_version_id ON pets(element, data_version, pet_id);
+"""
+
+# 날짜 일치 조회 종류별 컬럼
+# (각각 (컬럼, data_version, pet_id) 커버링 인덱스가 있어 테이블을 읽지 않고 현재 만세력 버전 행만 키셋 페이지 조회)
+MATCH_COLUMNS = {
+    "day_pillar": "day_code",
+    "day_stem": "day_stem",
+    "element": "element"
+}
+
+_INSERT = """
+INSERT OR REPLACE INTO pets (
+    pet_id, owner_id, name, breed, gender, birth_date,
+    year_code, month_code, day_code, hour_code, element, data_version, analysis, created_at, day_stem
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# _INSERT 파라미터 중 analysis 위치
+_ANALYSIS_INDEX = 12
+
+def new_pet_id() -> str:
+    """
+    시간순으로 정렬되는 반려견 ID 생성 (밀리초 타임스탬프 12자리 + 난수 8자리, hex)
+    인덱스 끝에 추가되는 형태라 대량 등록 시에도 B-tree 분할이 적음
+    """
+    return f"{int(time.time() * 1000):012x}{secrets.token_hex(4)}"
+
+def _pack_analysis(analysis: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(analysis, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+def _unpack_analysis(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+class PetRegistry:
+    def __init__(self, db_path: str = None, pool_size: int = 4, batch_size: int = 256,
+                 flush_interval: float = 0.5):
+        """
+        반려견 등록부 초기화 (DB 파일과 커넥션은 첫 사용 시 생성)
+
+        Args:
+            db_path: SQLite 파일 경로 (기본값: PAWSTARS_REGISTRY_PATH 또는 데이터 디렉터리의 pet_registry.sqlite3)
+            pool_size: 커넥션 풀 크기
+            batch_size: 이 개수만큼 쌓이면 즉시 일괄 기록
+            flush_interval: 배치가 차지 않아도 기록하는 주기 (초)
+        """
+        if db_path is None:
+            db_path = os.environ.get("PAWSTARS_REGISTRY_PATH") or runtime_data_path("pet_registry.sqlite3")
+
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        self._schema_ready = False
+
+        # 아직 기록되지 않은 쓰기 (pet_id -> row), 조회 시에도 확인하여 read-your-writes 보장
+        self._pending: Dict[str, Tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Raises:
+            DataPathError: DB 파일을 만들거나 열 수 없음 (읽기 전용 파일 시스템 등)
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+        except (OSError, sqlite3.OperationalError) as e:
+            raise unwritable_path_error(self.db_path, "PAWSTARS_REGISTRY_PATH", e)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """
+        풀에서 커넥션을 빌려 사용 (풀이 비어 있으면 pool_size까지 새로 생성)
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            if not create:
+                conn = self._pool.get()
+            else:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    # 실패한 자리는 다시 만들 수 있도록 반환 (그렇지 않으면 이후 요청이 풀에서 무한정 대기)
+                    with self._pool_lock:
+                        self._created -= 1
+                    raise
+
+        try:
+            if not self._schema_ready:
+                with self._pool_lock:
+                    if not self._schema_ready:
+                        self._migrate(conn)
+                        conn.executescript(_SCHEMA)
+                        self._schema_ready = True
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """
+        이전 버전 스키마에 없는 컬럼 추가
+        """
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(pets)")}
+        if columns and "hour_code" not in columns:
+            conn.execute("ALTER TABLE pets ADD COLUMN hour_code INTEGER")
+        if columns and "day_stem" not in columns:
+            conn.execute("ALTER TABLE pets ADD COLUMN day_stem INTEGER")
+            conn.execute("UPDATE pets SET day_stem = day_code % 10")
+        # 이전 인덱스는 (값, data_version, pet_id) 커버링 인덱스로 대체
+        for name in ("idx_pets_day_code", "idx_pets_element",
+                     "idx_pets_day_code_id", "idx_pets_day_stem_id", "idx_pets_element_id"):
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def _to_row(self, pet_id: str, owner_id: Optional[str], analysis: Dict[str, Any],
+                codes: Dict[str, int], element: int, data_version: int) -> Tuple:
+        return (
+            pet_id,
+            owner_id,
+            analysis["name"],
+            analysis["breed"],
+            analysis["gender"],
+            analysis["birth_date"],
+            codes["year"],
+            codes["month"],
+            codes["day"],
+            codes.get("hour"),
+            element,
+            data_version,
+            _pack_analysis(analysis),
+            datetime.now().isoformat(),
+            codes["day"] % 10
+        )
+
+    def save(self, analysis: Dict[str, Any], codes: Dict[str, int], element: int,
+             data_version: int, owner_id: Optional[str] = None, pet_id: Optional[str] = None) -> str:
+        """
+        분석 결과 저장 (배치 버퍼에 넣고 batch_size 또는 flush_interval마다 일괄 기록)
+
+        Args:
+            analysis: PetService 분석 결과
+            codes: 삼주(시주 포함 가능) 육십갑자 코드
+            element: 오행 코드
+            data_version: 분석에 사용한 만세력 데이터 버전
+            owner_id: 보호자 ID
+            pet_id: 지정하지 않으면 새로 발급
+
+        Returns:
+            반려견 ID
+        """
+        pet_id = pet_id or new_pet_id()
+        row = self._to_row(pet_id, owner_id, analysis, codes, element, data_version)
+
+        with self._pending_lock:
+            self._pending[pet_id] = row
+            should_flush = len(self._pending) >= self.batch_size
+
+        if should_flush:
+            self.flush()
+        else:
+            self._ensure_flusher()
+        return pet_id
+
+    def save_many(self, records: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        여러 건을 하나의 트랜잭션으로 즉시 기록 (백필/일괄 등록용)
+
+        Args:
+            records: save()의 키워드 인자 딕셔너리들
+
+        Returns:
+            반려견 ID 리스트
+        """
+        rows = []
+        for record in records:
+            pet_id = record.get("pet_id") or new_pet_id()
+            rows.append(self._to_row(
+                pet_id,
+                record.get("owner_id"),
+                record["analysis"],
+                record["codes"],
+                record["element"],
+                record["data_version"]
+            ))
+        self._write_rows(rows)
+        return [row[0] for row in rows]
+
+    def flush(self) -> int:
+        """
+        버퍼에 쌓인 쓰기를 일괄 기록
+
+        Returns:
+            기록한 행 수
+        """
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            rows = list(self._pending.values())
+
+        self._write_rows(rows)
+
+        with self._pending_lock:
+            for row in rows:
+                # 기록 도중 같은 ID로 다시 저장된 경우는 남겨둠
+                if self._pending.get(row[0]) is row:
+                    del self._pending[row[0]]
+        return len(rows)
+
+    def _write_rows(self, rows: List[Tuple]):
+        if not rows:
+            return
+        with self._write_lock, self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_INSERT, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._pending_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="pet-registry-flusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                event_log.emit("registry_flush_failed", level="error", error=str(e))
+
+    def close(self):
+        """
+        남은 쓰기를 기록하고 커넥션 정리
+        """
+        self._stop.set()
+        self.flush()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._pool_lock:
+            self._created = 0
+
+    def get_record(self, pet_id: str) -> Optional[Dict[str, Any]]:
+        """
+        반려견 ID로 저장된 행 조회 (재계산 없음)
+
+        Returns:
+            {"pet_id", "owner_id", "data_version", "analysis"} 또는 None
+        """
+        with self._pending_lock:
+            row = self._pending.get(pet_id)
+        if row is not None:
+            return {"pet_id": pet_id, "owner_id": row[1], "data_version": row[11],
+                    "analysis": _unpack_analysis(row[_ANALYSIS_INDEX])}
+
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT owner_id, data_version, analysis FROM pets WHERE pet_id = ?", (pet_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        owner_id, data_version, analysis = row
+        return {"pet_id": pet_id, "owner_id": owner_id, "data_version": data_version,
+                "analysis": _unpack_analysis(analysis)}
+
+    def get(self, pet_id: str) -> Optional[Dict[str, Any]]:
+        """
+        반려견 ID로 저장된 분석 결과 조회 (재계산 없음, 만세력 버전은 확인하지 않음)
+
+        Returns:
+            분석 결과 딕셔너리 (pet_id 포함) 또는 None
+        """
+        record = self.get_record(pet_id)
+        if record is None:
+            return None
+        return {**record["analysis"], "pet_id": pet_id}
+
+    def list_records_by_owner(self, owner_id: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        보호자 ID로 등록된 행 목록 조회 (등록순, get_record와 같은 형태)
+        """
+        self.flush()
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT pet_id, data_version, analysis FROM pets WHERE owner_id = ? ORDER BY pet_id LIMIT ? OFFSET ?",
+                (owner_id, limit, offset)
+            ).fetchall()
+        return [
+            {"pet_id": pet_id, "owner_id": owner_id, "data_version": data_version,
+             "analysis": _unpack_analysis(analysis)}
+            for pet_id, data_version, analysis in rows
+        ]
+
+    def list_by_owner(self, owner_id: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        보호자 ID로 등록된 반려견 목록 조회 (등록순, 만세력 버전은 확인하지 않음)
+        """
+        return [
+            {**record["analysis"], "pet_id": record["pet_id"]}
+            for record in self.list_records_by_owner(owner_id, limit=limit, offset=offset)
+        ]
+
+    def iter_stale_pages(self, data_version: int, page_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """
+        다른 만세력 버전으로 분석된 행을 pet_id 순으로 조회 (get_record와 같은 형태의 페이지 단위)
+        페이지를 받은 쪽이 행을 다시 기록해도 pet_id 키셋으로 이어서 읽으므로 건너뛰거나 반복하지 않음
+
+        Args:
+            data_version: 현재 만세력 데이터 버전
+            page_size: 한 번에 읽는 개수
+        """
+        self.flush()
+        cursor = ""
+        while True:
+            with self._connection() as conn:
+                rows = conn.execute(
+                    "SELECT pet_id, owner_id, data_version, analysis FROM pets "
+                    "WHERE pet_id > ? AND data_version != ? ORDER BY pet_id LIMIT ?",
+                    (cursor, data_version, page_size)
+                ).fetchall()
+            if rows:
+                yield [
+                    {"pet_id": pet_id, "owner_id": owner_id, "data_version": version,
+                     "analysis": _unpack_analysis(analysis)}
+                    for pet_id, owner_id, version, analysis in rows
+                ]
+            if len(rows) < page_size:
+                return
+            cursor = rows[-1][0]
+
+    def iter_matching_pages(self, match: str, value: int, data_version: int, after: Optional[str] = None,
+                            limit: Optional[int] = None, page_size: int = 1000) -> Iterator[List[str]]:
+        """
+        일주/일간/오행 코드가 일치하는 반려견 ID를 pet_id 순으로 조회 (키셋 페이지 단위로 ID 리스트를 냄)
+        페이지마다 (컬럼, data_version, pet_id) 인덱스에서 이어서 읽으므로 비용은 등록부 크기가 아니라 일치 건수에 비례
+        다른 만세력 버전으로 분석된 행은 코드가 틀릴 수 있으므로 제외
+
+        Args:
+            match: MATCH_COLUMNS의 키 (day_pillar, day_stem, element)
+            value: 비교할 코드 (일주 0~59, 일간 0~9, 오행 0~4)
+            data_version: 현재 만세력 데이터 버전
+            after: 이 ID 다음부터 조회 (이전 페이지의 마지막 ID)
+            limit: 최대 조회 개수 (기본값: 전체)
+            page_size: 한 번에 읽는 개수 (페이지 사이에는 커넥션을 풀에 돌려줌)
+
+        Raises:
+            ValueError: 지원하지 않는 조회 종류
+        """
+        column = MATCH_COLUMNS.get(match)
+        if column is None:
+            raise ValueError(f"지원하지 않는 조회 종류입니다: {match} (지원: {', '.join(MATCH_COLUMNS)})")
+        query = (f"SELECT pet_id FROM pets WHERE {column} = ? AND data_version = ? AND pet_id > ? "
+                 f"ORDER BY pet_id LIMIT ?")
+
+        self.flush()
+        cursor = after or ""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            with self._connection() as conn:
+                rows = conn.execute(query, (value, data_version, cursor, size)).fetchall()
+            if rows:
+                yield [pet_id for (pet_id,) in rows]
+            if len(rows) < size:
+                return
+            cursor = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def count(self) -> int:
+        """
+        저장된 반려견 수
+        """
+        self.flush()
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0]
+
+# 전역 인스턴스 생성
+pet_registry = PetRegistry()
@@ -2,107 +2,402 @@
 반려견 등록 및 삼주 분석 통합 서비스
 """
 
-from typing import Dict, Any, Optional
-from datetime import datetime
+import json
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import time
 
-from app.services.pillars_service import pillars_service
-from app.services.five_elements import analyze_temperament
-from app.services.shinsal_service import analyze_all_shinsal, get_shinsal_summary
-from app.utils.ganzi_parser import parse_solar_ganzi, get_day_stem, get_all_branches
+import numpy as np
+
+from app.services.pillars_service import get_pillars_service
+from app.services.pet_registry import MATCH_COLUMNS, pet_registry
+from app.services.daily_fortune import daily_fortune_codes, render_daily_fortune, fortune_store
+from app.services.event_log import event_log, mark, record_stage
+from app.services.tracing import traced
+from app.services.analysis_pipeline import (
+    AnalysisContext, parse_stage, resolve_stage, analyze_stage, build_analysis
+)
+from app.services.five_elements import get_five_element_from_stem, resolve_breed_name
+from app.services.luck_timeline import build_luck_timeline, decade_start_age
+from app.services.playgroup_service import DEFAULT_TIME_BUDGET, group_count_for, group_summary, partition_playgroups
+from app.services.relations import (
+    PILLAR_RELATION, PURPOSE_BONUS, branch_relation_name, compatibility_matrix, pillar_scores
+)
+from app.utils.ganzi_parser import (
+    parse_solar_ganzi, get_day_stem, pillars_to_codes, codes_to_pillars, ganzi_to_code, code_to_ganzi
+)
+from app.utils.mapping_tables import FIVE_ELEMENTS, BREED_IDS, BREED_NAMES, STEM_KOREAN
+from app.utils.profile_token import encode_profile_token, decode_profile_token, InvalidProfileTokenError
+
+# 좋은 날 찾기 최대 탐색 일수
+MAX_AUSPICIOUS_WINDOW = 366
 
 class PetService:
     
-    def register_and_analyze_pet(self, name: str, breed: str, gender: str, birth_date: str) -> Dict[str, Any]:
+    @traced("PetService.analyze_registration")
+    def analyze_registration(self, name: str, breed: str, gender: str, birth_date: str,
+                             birth_time: Optional[str] = None, zasi_mode: Optional[str] = None,
+                             birth_day: Optional[date] = None,
+                             birth_clock: Optional[Tuple[int, int]] = None, calendar_type: str = "solar",
+                             is_leap_month: bool = False) -> AnalysisContext:
+        """
+        등록 분석 파이프라인의 parse -> resolve -> analyze 단계 실행 (render는 호출측에서)
+        
+        Args:
+            birth_day, birth_clock: 요청 모델이 이미 파싱한 생년월일/출생 시각 (있으면 다시 파싱하지 않음)
+            calendar_type: 생년월일 달력 종류 ("solar" 또는 "lunar")
+            is_leap_month: 음력 윤달 여부
+            
+        Returns:
+            analysis가 채워진 AnalysisContext
+            
+        Raises:
+            ValueError: 입력 값 오류 또는 만세력에 없는 날짜
+        """
+        started = time.perf_counter()
+        ctx = parse_stage(
+            name=name,
+            breed=breed,
+            gender=gender,
+            birth_date=birth_date,
+            birth_time=birth_time,
+            zasi_mode=zasi_mode,
+            birth_day=birth_day,
+            birth_clock=birth_clock,
+            calendar_type=calendar_type,
+            is_leap_month=is_leap_month
+        )
+        parsed = time.perf_counter()
+        resolve_stage(ctx)
+        resolved = time.perf_counter()
+        analyze_stage(ctx)
+        record_stage("parse", parsed - started)
+        record_stage("resolve", resolved - parsed)
+        record_stage("analyze", time.perf_counter() - resolved)
+        return ctx
+    
+    @traced("PetService.register_and_analyze_pet")
+    def register_and_analyze_pet(self, name: str, breed: str, gender: str, birth_date: str,
+                                 birth_time: Optional[str] = None, zasi_mode: Optional[str] = None,
+                                 calendar_type: str = "solar", is_leap_month: bool = False) -> Dict[str, Any]:
         """
-        반려견 등록 및 종합 삼주 분석
+        반려견 등록 및 종합 삼주 분석 (출생 시각이 있으면 시주까지 사주 분석)
         
         Args:
             name: 반려견 이름
             breed: 견종
             gender: 성별 ("male" 또는 "female")
             birth_date: 생년월일 ("YYYY-MM-DD")
+            birth_time: 출생 시각 ("HH:MM", 선택)
+            zasi_mode: 야자시 처리 방식 ("next_day" 또는 "same_day", 기본값: 서버 설정)
+            calendar_type: 생년월일 달력 종류 ("solar" 또는 "lunar", 음력이면 양력으로 변환하여 분석)
+            is_leap_month: 음력 윤달 여부
             
         Returns:
             종합 분석 결과 딕셔너리
         """
-        try:
-            # 1. 입력 데이터 검증
-            self._validate_input(name, breed, gender, birth_date)
+        return self.analyze_registration(
+            name=name,
+            breed=breed,
+            gender=gender,
+            birth_date=birth_date,
+            birth_time=birth_time,
+            zasi_mode=zasi_mode,
+            calendar_type=calendar_type,
+            is_leap_month=is_leap_month
+        ).analysis
+    
+    def issue_profile_token(self, pet_analysis: Dict[str, Any]) -> str:
+        """
+        분석 결과로부터 서명된 프로필 토큰 발급
+        
+        Args:
+            pet_analysis: register_and_analyze_pet 결과
             
-            # 2. 만세력에서 해당 날짜의 간지 조회
-            pillars_data = pillars_service.get_pillars_by_date(birth_date)
-            if not pillars_data:
-                raise ValueError(f"해당 날짜({birth_date})의 만세력 정보를 찾을 수 없습니다.")
+        Returns:
+            프로필 토큰 문자열
+        """
+        codes, element = self._analysis_codes(pet_analysis)
+        
+        return encode_profile_token(
+            codes=codes,
+            element=element,
+            breed_id=BREED_IDS[resolve_breed_name(pet_analysis["breed"])],
+            data_version=get_pillars_service().data_version
+        )
+    
+    def _analysis_codes(self, pet_analysis: Dict[str, Any]) -> Tuple[Dict[str, int], int]:
+        """
+        분석 결과에서 삼주 육십갑자 코드와 오행 코드 추출
+        """
+        day_stem = get_day_stem(pet_analysis["pillars"])
+        element = get_five_element_from_stem(day_stem)
+        return pillars_to_codes(pet_analysis["pillars"]), FIVE_ELEMENTS.index(element)
+    
+    def save_pet(self, pet_analysis: Dict[str, Any], owner_id: Optional[str] = None) -> str:
+        """
+        분석 결과를 반려견 등록부에 저장
+        
+        Args:
+            pet_analysis: register_and_analyze_pet 결과
+            owner_id: 보호자 ID
             
-            # 3. 간지 파싱하여 삼주 추출
-            pillars = parse_solar_ganzi(pillars_data["solar_ganzi"])
+        Returns:
+            반려견 ID
+        """
+        codes, element = self._analysis_codes(pet_analysis)
+        stored = {key: value for key, value in pet_analysis.items() if key != "profile_token"}
+        
+        return pet_registry.save(
+            analysis=stored,
+            codes=codes,
+            element=element,
+            data_version=get_pillars_service().data_version,
+            owner_id=owner_id
+        )
+
+    def save_pets(self, pet_analyses: List[Dict[str, Any]], owner_ids: List[Optional[str]]) -> List[str]:
+        """
+        여러 분석 결과를 한 트랜잭션으로 등록부에 저장 (명단 일괄 등록용)
+
+        Args:
+            pet_analyses: register_and_analyze_pet 결과 리스트
+            owner_ids: 각 결과의 보호자 ID
+
+        Returns:
+            반려견 ID 리스트 (입력 순서)
+        """
+        data_version = get_pillars_service().data_version
+        records = []
+        for pet_analysis, owner_id in zip(pet_analyses, owner_ids):
+            codes, element = self._analysis_codes(pet_analysis)
+            records.append({
+                "analysis": {key: value for key, value in pet_analysis.items() if key != "profile_token"},
+                "codes": codes,
+                "element": element,
+                "data_version": data_version,
+                "owner_id": owner_id
+            })
+        return pet_registry.save_many(records)
+
+    def _reanalyze_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        다른 만세력 버전으로 분석된 등록부 행을 저장된 생년월일/출생 시각으로 다시 분석
+        (야자시 처리 방식은 저장되지 않으므로 서버 기본값 사용)
+        
+        Returns:
+            save()의 키워드 인자 딕셔너리 (pet_id, owner_id 유지)
             
-            # 4. 일간 추출 (오행 분석의 기준)
-            day_stem = get_day_stem(pillars)
+        Raises:
+            ValueError: 현재 만세력에 없는 날짜 등으로 다시 분석할 수 없는 경우
+        """
+        stored = record["analysis"]
+        pet_analysis = self.register_and_analyze_pet(
+            name=stored["name"],
+            breed=stored["breed"],
+            gender=stored["gender"],
+            birth_date=stored["birth_date"],
+            birth_time=stored.get("birth_time")
+        )
+        codes, element = self._analysis_codes(pet_analysis)
+        return {
+            "pet_id": record["pet_id"],
+            "owner_id": record["owner_id"],
+            "analysis": pet_analysis,
+            "codes": codes,
+            "element": element,
+            "data_version": get_pillars_service().data_version
+        }
+    
+    def _current_analysis(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        등록부 행의 분석 결과 (만세력 버전이 다르면 다시 분석하여 행을 갱신)
+        
+        Raises:
+            LookupError: 만세력이 바뀌어 다시 분석할 수 없는 반려견
+        """
+        if record["data_version"] == get_pillars_service().data_version:
+            return {**record["analysis"], "pet_id": record["pet_id"]}
+        
+        try:
+            refreshed = self._reanalyze_record(record)
+        except ValueError as e:
+            raise LookupError(f"만세력 데이터가 바뀌어 다시 분석할 수 없는 반려견입니다: {record['pet_id']} ({e})")
+        pet_registry.save(**refreshed)
+        return {**refreshed["analysis"], "pet_id": record["pet_id"]}
+    
+    @traced("PetService.get_registered_pet")
+    def get_registered_pet(self, pet_id: str) -> Dict[str, Any]:
+        """
+        등록부에 저장된 분석 결과 조회 (만세력 버전이 같으면 재분석 없음)
+        
+        Raises:
+            LookupError: 등록되지 않았거나 현재 만세력으로 다시 분석할 수 없는 반려견 ID
+        """
+        record = pet_registry.get_record(pet_id)
+        if record is None:
+            raise LookupError(f"등록되지 않은 반려견입니다: {pet_id}")
+        return self._current_analysis(record)
+    
+    def refresh_stale_pets(self, batch_size: int = 500) -> Dict[str, int]:
+        """
+        만세력 교체 후 이전 버전으로 분석된 등록부 행을 모두 다시 분석하여 기록
+        (날짜 일치 조회와 운세 사전 계산은 현재 버전 행만 사용하므로 교체 후 한 번 실행)
+        
+        Args:
+            batch_size: 한 트랜잭션으로 기록하는 행 수
             
-            # 5. 오행 및 성향 분석
-            temperament_analysis = analyze_temperament(day_stem, breed)
+        Returns:
+            {"refreshed": 다시 분석한 수, "failed": 현재 만세력에 없는 날짜 등으로 건너뛴 수}
+        """
+        data_version = get_pillars_service().data_version
+        stats = {"refreshed": 0, "failed": 0}
+        for page in pet_registry.iter_stale_pages(data_version, page_size=batch_size):
+            records = []
+            for record in page:
+                try:
+                    records.append(self._reanalyze_record(record))
+                except ValueError as e:
+                    stats["failed"] += 1
+                    event_log.emit("registry_refresh_failed", level="warning", pet_id=record["pet_id"], error=str(e))
+            pet_registry.save_many(records)
+            stats["refreshed"] += len(records)
+        return stats
+    
+    @traced("PetService.analyze_profile_token")
+    def analyze_profile_token(self, profile_token: str, name: str, gender: str = "male") -> Dict[str, Any]:
+        """
+        프로필 토큰으로 반려견 분석 결과 복원 (만세력 조회 및 간지 파싱 생략)
+        
+        Args:
+            profile_token: issue_profile_token으로 발급한 토큰
+            name: 반려견 이름
+            gender: 성별
             
-            # 6. 신살 분석
-            shinsal_results = analyze_all_shinsal(pillars)
-            shinsal_summary = get_shinsal_summary(shinsal_results)
+        Returns:
+            register_and_analyze_pet과 같은 형태의 분석 결과 (birth_date는 빈 문자열)
             
-            # 7. 결과 통합
-            result = {
-                "name": name,
-                "breed": breed,
-                "gender": gender,
-                "birth_date": birth_date,
-                "pillars": pillars,
-                "five_element": temperament_analysis["five_element"],
-                "temperament": temperament_analysis["temperament"],
-                "activity_tip": temperament_analysis["activity_tip"],
-                "shinsal": {
-                    shinsal_name: result["present"] 
-                    for shinsal_name, result in shinsal_results.items()
-                },
-                "shinsal_details": shinsal_results,
-                "shinsal_summary": shinsal_summary["summary"],
-                "analysis_date": datetime.now().isoformat(),
-                "jeolki": pillars_data.get("jeolki", "")
-            }
+        Raises:
+            InvalidProfileTokenError: 위조되었거나 만료된 토큰
+        """
+        decoded = decode_profile_token(profile_token, get_pillars_service().data_version)
+        if decoded["breed_id"] >= len(BREED_NAMES):
+            raise InvalidProfileTokenError("프로필 토큰 형식이 올바르지 않습니다.")
+        
+        pillars = codes_to_pillars({
+            pillar_type: decoded[pillar_type]
+            for pillar_type in ("year", "month", "day", "hour")
+            if decoded.get(pillar_type) is not None
+        })
+        return build_analysis(
+            name=name,
+            breed=BREED_NAMES[decoded["breed_id"]],
+            gender=gender,
+            birth_date="",
+            pillars=pillars
+        )
+    
+    def list_owner_pets(self, owner_id: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        보호자 ID로 등록부에 저장된 반려견 목록 조회 (만세력 버전이 다른 행은 다시 분석, 불가능하면 제외)
+        """
+        pets = []
+        for record in pet_registry.list_records_by_owner(owner_id, limit=limit, offset=offset):
+            try:
+                pets.append(self._current_analysis(record))
+            except LookupError:
+                continue
+        return pets
+    
+    @traced("PetService.find_date_matches")
+    def find_date_matches(self, target_date: str, match: str = "day_pillar", cursor: Optional[str] = None,
+                          limit: int = 10000) -> Tuple[Dict[str, Any], Iterator[bytes]]:
+        """
+        날짜의 일진과 일주/일간/오행이 같은 등록 반려견 ID 조회 (일주 귀환 알림 등)
+        등록부의 (코드, data_version, pet_id) 인덱스를 키셋 페이지로 읽으므로 반려견을 재분석하지 않고, 비용은 일치 건수에 비례
+        (만세력 교체 후 아직 다시 분석하지 않은 반려견은 제외, refresh_stale_pets 참고)
+        
+        Args:
+            target_date: 날짜 (YYYY-MM-DD)
+            match: day_pillar(일주, 60일 주기), day_stem(일간, 10일 주기), element(일간 오행)
+            cursor: 이전 응답의 next_cursor (이 ID 다음부터 조회)
+            limit: 최대 반환 개수
             
-            return result
+        Returns:
+            (조회 대상 {"date", "match", "code", "value"}, NDJSON 줄 이터레이터)
+            이터레이터는 {"pet_id"} 줄들 뒤에 {"status": "done", "count", "next_cursor", ...} 한 줄을 냄
+            (next_cursor가 null이 아니면 다음 페이지가 있음)
             
-        except Exception as e:
-            raise Exception(f"반려견 분석 중 오류 발생: {str(e)}")
+        Raises:
+            ValueError: 날짜 형식 또는 조회 종류 오류
+            LookupError: 만세력에 없는 날짜
+        """
+        if match not in MATCH_COLUMNS:
+            raise ValueError(f"조회 종류는 {', '.join(MATCH_COLUMNS)} 중 하나여야 합니다.")
+        if limit < 1:
+            raise ValueError("limit은 1 이상이어야 합니다.")
+        try:
+            day = datetime.strptime(target_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+        
+        service = get_pillars_service()
+        index, data_version = service.index, service.data_version
+        lo, hi = index.row_range(day, day)
+        if hi <= lo:
+            raise LookupError(f"해당 날짜({target_date})의 만세력 정보를 찾을 수 없습니다.")
+        
+        day_code = int(index.day_codes[lo])
+        day_stem = STEM_KOREAN[day_code % 10]
+        if match == "day_pillar":
+            code, value = day_code, code_to_ganzi(day_code)
+        elif match == "day_stem":
+            code, value = day_code % 10, day_stem
+        else:
+            value = get_five_element_from_stem(day_stem)
+            code = FIVE_ELEMENTS.index(value)
+        target = {"date": target_date, "match": match, "code": code, "value": value}
+        
+        def lines() -> Iterator[bytes]:
+            # 한 건 더 읽어서 다음 페이지가 있는지 판단, 등록부 페이지 하나를 NDJSON 청크 하나로 보냄
+            count, last_id, has_more = 0, None, False
+            for page in pet_registry.iter_matching_pages(match, code, data_version, after=cursor, limit=limit + 1):
+                if count + len(page) > limit:
+                    page = page[:limit - count]
+                    has_more = True
+                if page:
+                    count += len(page)
+                    last_id = page[-1]
+                    yield "".join(f'{{"pet_id":"{pet_id}"}}\n' for pet_id in page).encode("ascii")
+            done = {"status": "done", **target, "count": count, "next_cursor": last_id if has_more else None}
+            yield json.dumps(done, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        
+        return target, lines()
     
-    def _validate_input(self, name: str, breed: str, gender: str, birth_date: str):
+    @traced("PetService.resolve_pet")
+    def resolve_pet(self, name: str, birth_date: Optional[str] = None, profile_token: Optional[str] = None,
+                    breed: str = "믹스", gender: str = "male", pet_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        입력 데이터 검증
+        등록된 반려견 ID, 프로필 토큰, 생년월일 중 하나로 반려견 분석 결과 확보
+        반려견 ID > 프로필 토큰 > 생년월일 순으로 우선 사용
         """
-        if not name or not name.strip():
-            raise ValueError("반려견 이름은 필수입니다.")
+        if pet_id:
+            return self.get_registered_pet(pet_id)
         
-        if not breed or not breed.strip():
-            raise ValueError("견종은 필수입니다.")
+        if profile_token:
+            return self.analyze_profile_token(profile_token, name, gender)
         
-        if gender not in ["male", "female"]:
-            raise ValueError("성별은 'male' 또는 'female'이어야 합니다.")
+        if not birth_date:
+            raise ValueError("생년월일(birth_date), 프로필 토큰(profile_token), 반려견 ID(pet_id) 중 하나가 필요합니다.")
         
-        try:
-            birth_datetime = datetime.strptime(birth_date, "%Y-%m-%d")
-            
-            # 날짜 범위 검증 (너무 미래나 과거 날짜 방지)
-            current_year = datetime.now().year
-            birth_year = birth_datetime.year
-            
-            if birth_year < 1990:
-                raise ValueError("생년월일이 너무 과거입니다. (1990년 이후만 지원)")
-            
-            if birth_year > current_year + 1:
-                raise ValueError("생년월일이 미래입니다.")
-                
-        except ValueError as e:
-            if "time data" in str(e):
-                raise ValueError("생년월일 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 사용)")
-            raise e
+        return self.register_and_analyze_pet(
+            name=name,
+            breed=breed,
+            gender=gender,
+            birth_date=birth_date
+        )
     
+    @traced("PetService.get_compatibility")
     def get_compatibility(self, pet1_data: Dict[str, Any], pet2_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         두 반려견의 궁합 분석 (추후 확장 기능)
@@ -130,6 +425,7 @@ class PetService:
             "analysis_date": datetime.now().isoformat()
         }
     
+    @traced("PetService.get_daily_fortune")
     def get_daily_fortune(self, pet_data: Dict[str, Any], target_date: str = None) -> Dict[str, Any]:
         """
         일일 운세 분석 (추후 확장 기능)
@@ -145,31 +441,252 @@ class PetService:
             target_date = datetime.now().strftime("%Y-%m-%d")
         
         # 해당 날짜의 일진 조회
-        daily_pillars = pillars_service.get_pillars_by_date(target_date)
+        daily_pillars = get_pillars_service().get_pillars_by_date(target_date)
         if not daily_pillars:
             return {"error": f"해당 날짜({target_date})의 운세 정보를 찾을 수 없습니다."}
         
-        # 반려견의 일간과 오늘의 일간 비교
-        pet_day_stem = get_day_stem(pet_data["pillars"])
+        # 반려견의 일주와 오늘의 일주 비교 (사전 계산 작업과 같은 커널 사용)
         today_pillars = parse_solar_ganzi(daily_pillars["solar_ganzi"])
-        today_day_stem = get_day_stem(today_pillars)
+        pet_day_code = ganzi_to_code(pet_data["pillars"]["day"])
+        today_day_code = ganzi_to_code(today_pillars["day"])
+        fortune_code = int(daily_fortune_codes(pet_day_code, today_day_code))
         
-        # 간단한 운세 메시지 생성
-        if pet_day_stem == today_day_stem:
-            fortune_message = "오늘은 특히 컨디션이 좋고 활발한 하루가 될 것 같아요! 🌟"
-        else:
-            fortune_message = "평온하고 안정적인 하루를 보낼 수 있을 것 같아요. 😊"
+        return render_daily_fortune(
+            pet_name=pet_data["name"],
+            target_date=target_date,
+            pet_day_code=pet_day_code,
+            today_day_code=today_day_code,
+            fortune_code=fortune_code,
+            daily_pillars=today_pillars,
+            jeolki=daily_pillars.get("jeolki", "")
+        )
+    
+    @traced("PetService.find_auspicious_days")
+    def find_auspicious_days(self, pet_data: Dict[str, Any], start_date: Optional[str] = None, days: int = 90,
+                             top_k: int = 5, purpose: Optional[str] = None) -> Dict[str, Any]:
+        """
+        기간 내에서 반려견에게 좋은 날 상위 top_k개 찾기
+        반려견 사주와 각 날짜 삼주의 관계 점수를 관계 테이블 인덱싱으로 구간 전체에 대해 한 번에 계산
+
+        Args:
+            pet_data: 반려견 분석 결과
+            start_date: 시작 날짜 (기본값: 오늘)
+            days: 탐색 일수 (1~366)
+            top_k: 반환할 날짜 수
+            purpose: 목적 ("grooming", "travel", "vet", 선택)
+
+        Returns:
+            {"pet_name": ..., "start_date": ..., "end_date": ..., "purpose": ..., "days": [{"date": ..., "score": ...}, ...]}
+        """
+        if not 1 <= days <= MAX_AUSPICIOUS_WINDOW:
+            raise ValueError(f"탐색 기간은 1~{MAX_AUSPICIOUS_WINDOW}일이어야 합니다.")
+        if top_k < 1:
+            raise ValueError("top_k는 1 이상이어야 합니다.")
+        if purpose is not None and purpose not in PURPOSE_BONUS:
+            raise ValueError(f"목적은 {', '.join(PURPOSE_BONUS)} 중 하나여야 합니다.")
+
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else datetime.now().date()
+        except ValueError:
+            raise ValueError("시작 날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+        index = get_pillars_service().index
+        lo, hi = index.row_range(start, start + timedelta(days=days - 1))
+        if hi <= lo:
+            raise LookupError(f"해당 기간({start} ~ {days}일)의 만세력 정보를 찾을 수 없습니다.")
+
+        pet_codes = pillars_to_codes(pet_data["pillars"])
+
+        # 일진과의 관계가 가장 중요하고, 월/년 기운은 보조 점수
+        day_codes = index.day_codes[lo:hi].astype(np.intp)
+        scores = pillar_scores(pet_codes, day_codes) * 2
+        scores += PILLAR_RELATION[pet_codes["day"], index.month_codes[lo:hi].astype(np.intp)]
+        if purpose:
+            scores += PURPOSE_BONUS[purpose][day_codes]
+
+        # 상위 k개만 부분 정렬 후 (점수 내림차순, 날짜 오름차순)으로 정렬
+        k = min(top_k, hi - lo)
+        top = np.argpartition(-scores, k - 1)[:k] if k < hi - lo else np.arange(hi - lo)
+        top = top[np.lexsort((top, -scores[top]))]
+
+        pet_branch = pet_codes["day"] % 12
+        best_days = []
+        for offset in top.tolist():
+            row = lo + offset
+            day_code = int(index.day_codes[row])
+            best_days.append({
+                "date": str(index.dates[row]),
+                "score": int(scores[offset]),
+                "day_pillar": code_to_ganzi(day_code),
+                "relation": branch_relation_name(pet_branch, day_code % 12),
+                "jeolki": index.jeolki[row]
+            })
+
+        return {
+            "pet_name": pet_data["name"],
+            "pet_pillars": pet_data["pillars"],
+            "start_date": str(index.dates[lo]),
+            "end_date": str(index.dates[hi - 1]),
+            "purpose": purpose,
+            "days": best_days
+        }
+
+    @traced("PetService.get_luck_timeline")
+    def get_luck_timeline(self, pet_data: Dict[str, Any], start_year: Optional[int] = None,
+                          years: int = 20) -> Dict[str, Any]:
+        """
+        연도별 세운과 대운 타임라인 (연도마다 운세를 따로 조회하지 않고 구간 전체를 한 번에 계산)
+        
+        Args:
+            pet_data: 반려견 분석 결과
+            start_year: 시작 연도 (기본값: 올해)
+            years: 연수 (1~120)
+            
+        Returns:
+            {"pet_name", "pet_pillars", "start_year", "end_year", "decade_direction", "decade_start_age",
+             "years": [{"year", "age", "pillar", "ten_god", "relation", "score", "decade_pillar", "total_score"}, ...],
+             "decades": [{"start_age", "end_age", "start_year", "end_year", "pillar", "ten_god", "score"}, ...]}
+            
+        Raises:
+            ValueError: 연수 범위 오류
+        """
+        if start_year is None:
+            start_year = datetime.now().year
+        pet_codes = pillars_to_codes(pet_data["pillars"])
+        
+        # 대운은 생년월일(절입일까지의 일수)이 있어야 계산 가능 (프로필 토큰은 생년월일이 없음)
+        birth_year = start_age = None
+        forward = (pet_codes["year"] % 2 == 0) == (pet_data["gender"] != "female")
+        if pet_data.get("birth_date"):
+            birth_day = datetime.strptime(pet_data["birth_date"], "%Y-%m-%d").date()
+            birth_year = birth_day.year
+            index = get_pillars_service().index
+            birth_row = index.row_of(birth_day)
+            if birth_row >= 0:
+                start_age = decade_start_age(index, birth_row, forward)
+        
+        timeline = build_luck_timeline(pet_codes, start_year, years, birth_year=birth_year,
+                                       start_age=start_age, forward=forward)
         
         return {
             "pet_name": pet_data["name"],
-            "target_date": target_date,
-            "pet_day_stem": pet_day_stem,
-            "today_day_stem": today_day_stem,
-            "fortune_message": fortune_message,
-            "daily_pillars": today_pillars,
-            "jeolki": daily_pillars.get("jeolki", "")
+            "pet_pillars": pet_data["pillars"],
+            "start_year": start_year,
+            "end_year": start_year + years - 1,
+            "decade_direction": ("순행" if forward else "역행") if start_age is not None else None,
+            "decade_start_age": start_age,
+            **timeline
+        }
+
+    @traced("PetService.plan_playgroups")
+    def plan_playgroups(self, dogs: List[Dict[str, Any]], min_group_size: int = 2, max_group_size: int = 8,
+                        time_budget: float = DEFAULT_TIME_BUDGET, seed: int = 0) -> Dict[str, Any]:
+        """
+        반려견 명단을 크기 제한이 있는 놀이 그룹으로 나누어 그룹 안 궁합 점수 합을 최대화
+        
+        Args:
+            dogs: [{"name", "birth_date" | "profile_token" | "pet_id", "breed"}, ...]
+            min_group_size, max_group_size: 그룹 크기 제한
+            time_budget: 최적화 제한 시간 (초)
+            seed: 탐색 난수 시드
+            
+        Returns:
+            PlaygroupResponse 형식의 딕셔너리
+            
+        Raises:
+            ValueError: 반려견 정보 오류 또는 크기 제한으로 나눌 수 없는 마릿수
+            LookupError: 등록부에 없는 반려견 ID
+        """
+        # 분석 전에 크기 제한부터 확인
+        group_count_for(len(dogs), min_group_size, max_group_size)
+        
+        element_codes = np.empty(len(dogs), dtype=np.intp)
+        day_codes = np.empty(len(dogs), dtype=np.intp)
+        element_names = []
+        for position, dog in enumerate(dogs):
+            try:
+                pet_analysis = self.resolve_pet(
+                    name=dog["name"],
+                    birth_date=dog.get("birth_date"),
+                    profile_token=dog.get("profile_token"),
+                    breed=dog.get("breed") or "믹스",
+                    pet_id=dog.get("pet_id")
+                )
+            except LookupError as e:
+                raise LookupError(f"dogs[{position}] ({dog['name']}): {e}")
+            except ValueError as e:
+                raise ValueError(f"dogs[{position}] ({dog['name']}): {e}")
+            codes, element = self._analysis_codes(pet_analysis)
+            element_codes[position] = element
+            day_codes[position] = codes["day"]
+            element_names.append(pet_analysis["five_element"])
+        
+        scores = compatibility_matrix(element_codes, day_codes)
+        result = partition_playgroups(scores, min_group_size, max_group_size, time_budget=time_budget, seed=seed)
+        
+        groups = []
+        for number, members in enumerate(result["groups"], start=1):
+            groups.append({
+                "group": number,
+                "size": len(members),
+                **group_summary(scores, members),
+                "members": [{
+                    "index": member,
+                    "name": dogs[member]["name"],
+                    "five_element": element_names[member],
+                    "day_pillar": code_to_ganzi(int(day_codes[member]))
+                } for member in members]
+            })
+        
+        return {
+            "dog_count": len(dogs),
+            "group_count": len(groups),
+            "total_score": result["total_score"],
+            "greedy_score": result["greedy_score"],
+            "improvements": result["improvements"],
+            "restarts": result["restarts"],
+            "elapsed_ms": result["elapsed_ms"],
+            "groups": groups
         }
 
+    @staticmethod
+    def _store_date(target_date: str) -> str:
+        """
+        운세 저장소 파일 이름과 캐시 키로 쓸 날짜 정규화 (파일 시스템에 접근하기 전에 형식 검증)
+        """
+        try:
+            return datetime.strptime(target_date, "%Y-%m-%d").date().isoformat()
+        except ValueError:
+            raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+    
+    def get_precomputed_fortune(self, pet_id: str, target_date: str = None) -> Optional[Dict[str, Any]]:
+        """
+        사전 계산 작업이 저장해둔 일일 운세 조회 (없으면 None, 호출측에서 즉석 계산으로 대체)
+        
+        Args:
+            pet_id: 반려견 등록부 ID
+            target_date: 운세를 볼 날짜 (기본값: 오늘)
+            
+        Raises:
+            ValueError: 날짜 형식 오류
+        """
+        target_date = self._store_date(target_date) if target_date else datetime.now().date().isoformat()
+        fortune = fortune_store.lookup(pet_id, target_date, get_pillars_service().data_version)
+        mark(fortune_store_hit=fortune is not None)
+        return fortune
+    
+    def get_precompute_status(self, target_date: str) -> Optional[Dict[str, Any]]:
+        """
+        일일 운세 사전 계산 작업의 진행 상황 조회
+        
+        Raises:
+            ValueError: 날짜 형식 오류
+        """
+        meta = fortune_store.get_meta(self._store_date(target_date))
+        if meta is None:
+            return None
+        return {key: value for key, value in meta.items() if key not in ("daily_pillars", "today_day_code")}
+
 # 전역 인스턴스 생성
 pet_service = PetService()
 
@@ -4,14 +4,120 @@ CSV 데이터를 활용하여 특정 날짜의 간지 정보를 조회
 """
 
 import pandas as pd
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+import io
+import json
 import os
+import threading
+import time
+import zlib
+
+from app.services.calendar_index import POSTING_COMPONENTS, CalendarIndex
+from app.services.event_log import event_log
+from app.services.tracing import span, traced
+from app.utils.ganzi_parser import stem_index, branch_index, parse_ganzi_code, codes_to_pillars
+from app.utils.mapping_tables import STEM_HANJA, BRANCH_HANJA, SEXAGENARY_CYCLE
+
+# 메모리에 올리지 않는 컬럼 (음력은 lunar_calendar의 연도별 테이블로 계산)
+UNUSED_COLUMNS = ("lunar_date", "lunar_ganzi")
+
+# 만세력 파일 변경 확인 주기 (초)
+CALENDAR_CHECK_INTERVAL = float(os.environ.get("PAWSTARS_CALENDAR_CHECK_INTERVAL", "5"))
+
+class CalendarSnapshot:
+    """
+    한 버전의 만세력 데이터 (생성 후 변경하지 않음)
+
+    - df: 원본 데이터프레임
+    - index: 벡터 인덱스 (역색인까지 게시 전에 미리 생성)
+    - data_version: 원본 바이트의 CRC32 (데이터가 바뀌면 프로필 토큰과 저장된 운세가 무효화됨)
+    - source: "csv" 또는 "sample"
+    - mtime_ns, size: 변경 감지용 파일 정보 (샘플 데이터는 None)
+    - loaded_at, load_seconds: 로드 시각과 로드(파싱 + 인덱스 생성)에 걸린 시간
+    """
+
+    __slots__ = ("df", "index", "data_version", "source", "mtime_ns", "size", "loaded_at", "load_seconds")
+
+    def __init__(self, df: pd.DataFrame, data_version: int, source: str,
+                 mtime_ns: Optional[int] = None, size: Optional[int] = None, started: float = None):
+        started = time.perf_counter() if started is None else started
+        self.df = df
+        self.index = CalendarIndex(df)
+        for component in POSTING_COMPONENTS:
+            self.index.postings(component)
+        self.data_version = data_version
+        self.source = source
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.loaded_at = datetime.now().isoformat()
+        self.load_seconds = time.perf_counter() - started
+
+    @classmethod
+    def from_index(cls, index: CalendarIndex, data_version: int, source: str) -> "CalendarSnapshot":
+        """
+        데이터프레임 없이 이미 만든 인덱스로 스냅샷 생성 (메모리 매핑한 인덱스를 쓰는 작업 프로세스용)
+        날짜 문자열 조회(get_pillars_by_date)와 간지 문자열 검색은 사용할 수 없고 인덱스 기반 조회만 가능
+        """
+        snapshot = cls.__new__(cls)
+        snapshot.df = None
+        snapshot.index = index
+        snapshot.data_version = data_version
+        snapshot.source = source
+        snapshot.mtime_ns = None
+        snapshot.size = None
+        snapshot.loaded_at = datetime.now().isoformat()
+        snapshot.load_seconds = 0.0
+        return snapshot
+
+def _file_signature(path: str) -> Tuple[Optional[int], Optional[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None, None
+    return stat.st_mtime_ns, stat.st_size
+
+def load_calendar_snapshot(csv_path: str) -> CalendarSnapshot:
+    """
+    CSV를 읽어 인덱스까지 만든 스냅샷 생성
+
+    Raises:
+        OSError: 파일을 읽을 수 없음
+        ValueError: 간지 형식 오류
+    """
+    started = time.perf_counter()
+    mtime_ns, size = _file_signature(csv_path)
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    return CalendarSnapshot(
+        pd.read_csv(io.BytesIO(raw), usecols=lambda column: column not in UNUSED_COLUMNS), zlib.crc32(raw), "csv",
+        mtime_ns=mtime_ns, size=size, started=started
+    )
+
+def sample_calendar_snapshot() -> CalendarSnapshot:
+    """
+    테스트용 샘플 데이터 스냅샷 (메모리에만 두고 파일로 저장하지 않음)
+    실제 운영시에는 GitHub에서 다운로드한 CSV를 사용
+    """
+    sample_data = [
+        {"solar_date": "2021-12-01", "solar_ganzi": "辛丑年 己亥月 癸未日", "jeolki": ""},
+        {"solar_date": "2021-12-02", "solar_ganzi": "辛丑年 己亥月 甲申日", "jeolki": ""},
+        {"solar_date": "2021-12-03", "solar_ganzi": "辛丑年 己亥月 乙酉日", "jeolki": ""},
+        {"solar_date": "2022-01-01", "solar_ganzi": "辛丑年 庚子月 戊午日", "jeolki": ""},
+        {"solar_date": "2022-02-04", "solar_ganzi": "壬寅年 辛丑月 甲申日", "jeolki": "입춘"},
+        {"solar_date": "2023-01-01", "solar_ganzi": "壬寅年 壬子月 癸卯日", "jeolki": ""},
+        {"solar_date": "2023-12-01", "solar_ganzi": "癸卯年 癸亥月 丁巳日", "jeolki": ""},
+        {"solar_date": "2024-01-01", "solar_ganzi": "癸卯年 甲子月 戊申日", "jeolki": ""},
+        {"solar_date": "2024-12-01", "solar_ganzi": "甲辰年 乙亥月 辛亥日", "jeolki": ""},
+    ]
+    
+    df = pd.DataFrame(sample_data)
+    return CalendarSnapshot(df, zlib.crc32(df.to_csv(index=False).encode("utf-8")), "sample")
 
 class PillarsService:
     def __init__(self, csv_path: str = None):
         """
-        만세력 서비스 초기화
+        만세력 서비스 초기화 (파일은 읽지 않음, load() 또는 첫 사용 시 로드)
         
         Args:
             csv_path: 만세력 CSV 파일 경로
@@ -22,50 +128,248 @@ class PillarsService:
             csv_path = os.path.join(current_dir, "..", "data", "final_crawled_df_만세력.csv")
         
         self.csv_path = csv_path
-        self.df = None
-        self._load_data()
+        
+        # 현재 적용 중인 스냅샷 (교체는 참조 대입 한 번이므로 읽기에는 잠금 없음)
+        self._snapshot: Optional[CalendarSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._checked_signature: Tuple[Optional[int], Optional[int]] = (None, None)
+        # 파일 변경 감지 여부 (메모리 매핑한 고정 스냅샷을 쓰면 끔)
+        self.watch_file = True
+        self.reloads = 0
+        self.reload_error: Optional[str] = None
+        
+        # 워밍업 상태
+        self._warmup_state = "pending"
+        self._warmup_seconds = None
+        self._warmup_error = None
     
-    def _load_data(self):
+    @property
+    def snapshot(self) -> CalendarSnapshot:
         """
-        CSV 데이터를 메모리에 로드
+        현재 만세력 스냅샷 (로드 전이면 지금 로드)
+        
+        요청 하나에서 여러 번 조회할 때는 이 값을 한 번만 읽어 두면 중간에 교체되어도 같은 버전을 사용
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.load()
+            return self._snapshot
+        if self.watch_file and time.monotonic() - self._checked_at >= CALENDAR_CHECK_INTERVAL:
+            self._check_for_update()
+        return snapshot
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.snapshot.df
+    
+    @property
+    def index(self) -> CalendarIndex:
+        return self.snapshot.index
+    
+    @property
+    def data_version(self) -> int:
+        return self.snapshot.data_version
+    
+    @property
+    def loaded_data_version(self) -> Optional[str]:
+        """
+        적용 중인 만세력 버전 (16진수 문자열, 로드 전이면 None, 로드를 일으키지 않음)
+        """
+        snapshot = self._snapshot
+        return f"{snapshot.data_version & 0xFFFFFFFF:08x}" if snapshot is not None else None
+    
+    @property
+    def data_source(self) -> Optional[str]:
+        snapshot = self._snapshot
+        return snapshot.source if snapshot is not None else None
+    
+    def load(self):
         """
+        CSV 데이터를 메모리에 로드 (여러 스레드에서 호출해도 한 번만 로드)
+        """
+        with self._load_lock:
+            if self._snapshot is not None:
+                return
+            self._checked_signature = _file_signature(self.csv_path)
+            self._snapshot = self._read_snapshot()
+            self._checked_at = time.monotonic()
+    
+    def _read_snapshot(self) -> CalendarSnapshot:
+        if not os.path.exists(self.csv_path):
+            # CSV 파일이 없으면 샘플 데이터 사용
+            event_log.emit("calendar_sample_data", level="warning", path=self.csv_path)
+            return sample_calendar_snapshot()
         try:
-            if not os.path.exists(self.csv_path):
-                # CSV 파일이 없으면 샘플 데이터 생성
-                self._create_sample_data()
-            else:
-                self.df = pd.read_csv(self.csv_path)
-                print(f"만세력 데이터 로드 완료: {len(self.df)}행")
+            snapshot = load_calendar_snapshot(self.csv_path)
+            event_log.emit("calendar_loaded", rows=len(snapshot.index), seconds=round(snapshot.load_seconds, 3),
+                           data_version=f"{snapshot.data_version & 0xFFFFFFFF:08x}")
+            return snapshot
         except Exception as e:
-            print(f"만세력 데이터 로드 실패: {e}")
-            self._create_sample_data()
+            event_log.emit("calendar_load_failed", level="error", path=self.csv_path, error=str(e))
+            return sample_calendar_snapshot()
+    
+    def _check_for_update(self):
+        """
+        파일이 바뀌었으면 백그라운드 스레드에서 새 스냅샷 생성 (요청 스레드는 기다리지 않음)
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        started_thread = False
+        try:
+            self._checked_at = time.monotonic()
+            signature = _file_signature(self.csv_path)
+            if signature[0] is None or signature == self._checked_signature:
+                return
+            # 실패해도 같은 파일을 반복해서 다시 읽지 않도록 먼저 기록
+            self._checked_signature = signature
+            threading.Thread(target=self._reload_locked, name="pillars-reload", daemon=True).start()
+            started_thread = True
+        finally:
+            if not started_thread:
+                self._reload_lock.release()
+    
+    def _reload_locked(self):
+        try:
+            self._swap(load_calendar_snapshot(self.csv_path))
+        except Exception as e:
+            # 잘못된 만세력 파일은 무시하고 기존 버전 유지
+            self.reload_error = str(e)
+            event_log.emit("calendar_reload_failed", level="error", path=self.csv_path, error=str(e))
+        finally:
+            self._reload_lock.release()
+    
+    def _swap(self, snapshot: CalendarSnapshot):
+        current = self._snapshot
+        if current is not None and current.data_version == snapshot.data_version and current.source == snapshot.source:
+            return  # 내용이 같으면(파일 시각만 바뀜) 기존 스냅샷과 캐시를 유지
+        self._snapshot = snapshot
+        self.reloads += 1
+        self.reload_error = None
+        event_log.emit("calendar_swapped", rows=len(snapshot.index), seconds=round(snapshot.load_seconds, 3),
+                       data_version=f"{snapshot.data_version & 0xFFFFFFFF:08x}")
+    
+    def reload(self) -> bool:
+        """
+        만세력 파일을 지금 다시 읽어 교체 (파일 변경 감지를 기다리지 않음)
+        
+        Returns:
+            데이터 버전이 바뀌었으면 True
+            
+        Raises:
+            OSError, ValueError: 새 파일을 읽을 수 없음 (기존 버전 유지)
+        """
+        with self._reload_lock:
+            previous = self._snapshot
+            self._checked_signature = _file_signature(self.csv_path)
+            self._checked_at = time.monotonic()
+            self._swap(load_calendar_snapshot(self.csv_path))
+            return self._snapshot is not previous
     
-    def _create_sample_data(self):
+    def export_calendar(self, directory: str) -> str:
         """
-        테스트용 샘플 데이터 생성
-        실제 운영시에는 GitHub에서 다운로드한 CSV를 사용
+        현재 스냅샷의 인덱스를 .npy 파일로 기록 (작업 프로세스들이 use_mapped_calendar로 공유)
+        
+        Returns:
+            기록한 디렉터리 경로
         """
-        print("샘플 만세력 데이터 생성 중...")
+        snapshot = self.snapshot
+        snapshot.index.save(directory)
+        with open(os.path.join(directory, "calendar.json"), "w", encoding="utf-8") as f:
+            json.dump({"data_version": snapshot.data_version, "source": snapshot.source}, f)
+        return directory
+    
+    def use_mapped_calendar(self, directory: str):
+        """
+        export_calendar로 기록한 인덱스를 메모리 매핑하여 고정 스냅샷으로 사용 (CSV를 읽지 않음)
+        """
+        with open(os.path.join(directory, "calendar.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with self._load_lock:
+            self.watch_file = False
+            self._snapshot = CalendarSnapshot.from_index(
+                CalendarIndex.load(directory, mmap=True), meta["data_version"], meta["source"]
+            )
+    
+    def calendar_status(self) -> Dict[str, Any]:
+        """
+        현재 적용 중인 만세력 버전 정보 (로드를 일으키지 않음)
         
-        sample_data = [
-            {"solar_date": "2021-12-01", "solar_ganzi": "辛丑年 己亥月 癸未日", "jeolki": ""},
-            {"solar_date": "2021-12-02", "solar_ganzi": "辛丑年 己亥月 甲申日", "jeolki": ""},
-            {"solar_date": "2021-12-03", "solar_ganzi": "辛丑年 己亥月 乙酉日", "jeolki": ""},
-            {"solar_date": "2022-01-01", "solar_ganzi": "辛丑年 庚子月 戊午日", "jeolki": ""},
-            {"solar_date": "2022-02-04", "solar_ganzi": "壬寅年 辛丑月 甲申日", "jeolki": "입춘"},
-            {"solar_date": "2023-01-01", "solar_ganzi": "壬寅年 壬子月 癸卯日", "jeolki": ""},
-            {"solar_date": "2023-12-01", "solar_ganzi": "癸卯年 癸亥月 丁巳日", "jeolki": ""},
-            {"solar_date": "2024-01-01", "solar_ganzi": "癸卯年 甲子月 戊申日", "jeolki": ""},
-            {"solar_date": "2024-12-01", "solar_ganzi": "甲辰年 乙亥月 辛亥日", "jeolki": ""},
-        ]
+        Returns:
+            {"data_version": "1a2b3c4d", "source": "csv", "rows": 17532, "loaded_at": "...", "load_seconds": 0.1,
+             "reloads": 0, "reload_error": None}
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"data_version": None, "source": None, "rows": 0, "loaded_at": None, "load_seconds": None,
+                    "reloads": self.reloads, "reload_error": self.reload_error}
+        return {
+            "data_version": self.loaded_data_version,
+            "source": snapshot.source,
+            "rows": len(snapshot.index),
+            "loaded_at": snapshot.loaded_at,
+            "load_seconds": round(snapshot.load_seconds, 3),
+            "reloads": self.reloads,
+            "reload_error": self.reload_error
+        }
+    
+    def warmup(self):
+        """
+        데이터 로드, 벡터 인덱스 생성, 신살 규칙 컴파일을 미리 수행
+        """
+        from app.services.shinsal_service import get_shinsal_rules
         
-        self.df = pd.DataFrame(sample_data)
+        started = time.perf_counter()
+        self._warmup_state = "warming"
+        try:
+            self.load()
+            get_shinsal_rules()
+        except Exception as e:
+            self._warmup_state = "failed"
+            self._warmup_error = str(e)
+            event_log.emit("warmup_failed", level="error", error=str(e))
+            raise
+        self._warmup_seconds = time.perf_counter() - started
+        self._warmup_state = "ready"
+        event_log.emit("warmup_ready", seconds=round(self._warmup_seconds, 3))
+    
+    def start_warmup(self) -> threading.Thread:
+        """
+        백그라운드 스레드에서 워밍업 시작
+        """
+        thread = threading.Thread(target=self._warmup_quietly, name="pillars-warmup", daemon=True)
+        thread.start()
+        return thread
+    
+    def _warmup_quietly(self):
+        try:
+            self.warmup()
+        except Exception:
+            pass  # 상태는 warmup_status로 보고
+    
+    @property
+    def ready(self) -> bool:
+        """
+        워밍업 완료 여부 (트래픽을 받아도 되는 상태)
+        """
+        return self._warmup_state == "ready"
+    
+    def warmup_status(self) -> Dict[str, Any]:
+        """
+        워밍업 상태
         
-        # 샘플 데이터를 CSV로 저장
-        os.makedirs(os.path.dirname(self.csv_path), exist_ok=True)
-        self.df.to_csv(self.csv_path, index=False, encoding='utf-8')
-        print(f"샘플 데이터 저장: {self.csv_path}")
+        Returns:
+            {"state": "pending" | "warming" | "ready" | "failed", "seconds": 1.23, "data_source": "csv", "error": None}
+        """
+        return {
+            "state": self._warmup_state,
+            "seconds": round(self._warmup_seconds, 3) if self._warmup_seconds is not None else None,
+            "data_source": self.data_source,
+            "error": self._warmup_error
+        }
     
+    @traced("PillarsService.get_pillars_by_date")
     def get_pillars_by_date(self, date_str: str) -> Optional[Dict[str, str]]:
         """
         특정 날짜의 삼주 정보 조회
@@ -80,15 +384,14 @@ class PillarsService:
                 "jeolki": ""
             } 또는 None
         """
-        if self.df is None:
-            return None
+        df = self.df
         
         try:
             # 날짜 형식 검증
             datetime.strptime(date_str, "%Y-%m-%d")
             
             # 해당 날짜 조회
-            result = self.df[self.df['solar_date'] == date_str]
+            result = df[df['solar_date'] == date_str]
             
             if result.empty:
                 return None
@@ -109,6 +412,34 @@ class PillarsService:
         except Exception as e:
             raise Exception(f"Error querying pillars for date {date_str}: {str(e)}")
     
+    @traced("PillarsService.get_pillars_by_day")
+    def get_pillars_by_day(self, day: date) -> Optional[Dict[str, Any]]:
+        """
+        이미 파싱된 날짜로 삼주 조회 (문자열 파싱과 간지 문자열 파싱 없이 벡터 인덱스에서 바로 조회)
+        
+        Args:
+            day: 조회할 날짜
+            
+        Returns:
+            {
+                "solar_date": "2021-12-01",
+                "pillars": {"year": "辛丑", "month": "己亥", "day": "癸未"},
+                "jeolki": ""
+            } 또는 None
+        """
+        index = self.index
+        row = index.row_of(day)
+        if row < 0:
+            return None
+        
+        with span("ganzi.codes_to_pillars"):
+            pillars = codes_to_pillars(index.pillar_codes(row))
+        return {
+            "solar_date": day.isoformat(),
+            "pillars": pillars,
+            "jeolki": str(index.jeolki[row])
+        }
+    
     def get_available_date_range(self) -> Dict[str, str]:
         """
         사용 가능한 날짜 범위 반환
@@ -116,14 +447,16 @@ class PillarsService:
         Returns:
             {"start_date": "1896-01-01", "end_date": "2050-12-31"}
         """
-        if self.df is None or self.df.empty:
+        df = self.df
+        if df.empty:
             return {"start_date": "2021-12-01", "end_date": "2024-12-01"}
         
         return {
-            "start_date": self.df['solar_date'].min(),
-            "end_date": self.df['solar_date'].max()
+            "start_date": df['solar_date'].min(),
+            "end_date": df['solar_date'].max()
         }
     
+    @traced("PillarsService.search_by_ganzi")
     def search_by_ganzi(self, ganzi_pattern: str) -> list:
         """
         특정 간지 패턴으로 날짜 검색
@@ -134,15 +467,76 @@ class PillarsService:
         Returns:
             매칭되는 날짜 리스트
         """
-        if self.df is None:
-            return []
+        df = self.df
         
         try:
-            matches = self.df[self.df['solar_ganzi'].str.contains(ganzi_pattern, na=False)]
+            matches = df[df['solar_ganzi'].str.contains(ganzi_pattern, na=False)]
             return matches['solar_date'].tolist()
         except Exception as e:
-            print(f"Error searching ganzi pattern '{ganzi_pattern}': {e}")
+            event_log.emit("ganzi_search_failed", level="warning", pattern=ganzi_pattern, error=str(e))
             return []
 
-# 전역 인스턴스 생성
-pillars_service = PillarsService()
+    @traced("PillarsService.query_pillars")
+    def query_pillars(self, constraints: Dict[str, str], start_date: Optional[str] = None,
+                      end_date: Optional[str] = None, limit: int = 1000, offset: int = 0) -> Dict[str, Any]:
+        """
+        여러 간지 조건을 동시에 만족하는 날짜 검색 (구성요소별 역색인 교집합)
+        
+        Args:
+            constraints: {"day": "甲子", "month.branch": "인", ...} (한자/한글 모두 가능)
+            start_date: 시작 날짜 (YYYY-MM-DD, 기본값: 데이터 시작)
+            end_date: 종료 날짜 (YYYY-MM-DD, 기본값: 데이터 끝)
+            limit: 최대 반환 개수
+            offset: 건너뛸 개수
+            
+        Returns:
+            {"total": 12, "constraints": {"day": "甲子", "month.branch": "寅"}, "dates": ["1995-02-08", ...]}
+        """
+        parsed = {}
+        for component, value in constraints.items():
+            if value is None:
+                continue
+            value = value.strip()
+            if component.endswith(".stem"):
+                parsed[component] = stem_index(value)
+            elif component.endswith(".branch"):
+                parsed[component] = branch_index(value)
+            else:
+                parsed[component] = parse_ganzi_code(value)
+        
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+            end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+        except ValueError:
+            raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+        
+        index = self.index
+        lo, hi = index.row_range(start, end)
+        rows = index.intersect(parsed, lo, hi)
+        
+        return {
+            "total": int(len(rows)),
+            "constraints": {
+                component: (
+                    STEM_HANJA[value] if component.endswith(".stem")
+                    else BRANCH_HANJA[value] if component.endswith(".branch")
+                    else SEXAGENARY_CYCLE[value]
+                )
+                for component, value in parsed.items()
+            },
+            "dates": index.dates[rows[offset:offset + limit]].astype(str).tolist()
+        }
+
+_pillars_service: Optional[PillarsService] = None
+_pillars_service_lock = threading.Lock()
+
+def get_pillars_service() -> PillarsService:
+    """
+    만세력 서비스 인스턴스 (처음 호출할 때 생성, 데이터는 워밍업 또는 첫 조회 시 로드)
+    """
+    global _pillars_service
+    if _pillars_service is None:
+        with _pillars_service_lock:
+            if _pillars_service is None:
+                _pillars_service = PillarsService()
+    return _pillars_service
@@ -0,0 +1,220 @@
+"""
+놀이 그룹 편성 최적화
+반려견 N마리를 크기 제한이 있는 그룹으로 나누어 그룹 안 쌍별 궁합 점수의 합을 최대화
+
+- 점수: relations.compatibility_matrix의 정수 행렬 (오행 상성 + 일주 관계)
+- 초기해: 후회(regret) 기반 탐욕 배정 (가장 잘 맞는 그룹과 차선 그룹의 점수 차가 큰 반려견부터 배정)
+- 개선: 이동(한 마리를 다른 그룹으로)과 교환(두 마리 맞바꾸기) 지역 탐색,
+  더 나아지지 않으면 무작위 교환으로 흔든 뒤 다시 탐색 (제한 시간 또는 STALL_RESTARTS까지, 가장 좋은 해를 유지)
+- 반려견별 그룹 점수 합 G[i, g]를 유지하므로 이동/교환의 점수 변화는 O(1), 한 마리의 후보 전체는 벡터 연산 한 번
+"""
+
+import math
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+# 제한 시간 기본값/최댓값 (초)
+DEFAULT_TIME_BUDGET = 2.0
+MAX_TIME_BUDGET = 10.0
+
+# 흔든 뒤 이 횟수만큼 연속으로 더 나은 해를 찾지 못하면 제한 시간 전이라도 종료
+STALL_RESTARTS = 50
+
+def group_count_for(n: int, min_size: int, max_size: int) -> int:
+    """
+    크기 제한을 만족하는 가장 적은 그룹 수
+
+    Raises:
+        ValueError: 크기 제한으로 나눌 수 없는 마릿수
+    """
+    if min_size < 1 or max_size < min_size:
+        raise ValueError("그룹 크기는 1 이상이고 최소 크기가 최대 크기보다 클 수 없습니다.")
+    if n < min_size:
+        raise ValueError(f"반려견 수({n})가 최소 그룹 크기({min_size})보다 적습니다.")
+    groups = math.ceil(n / max_size)
+    if groups * min_size > n:
+        raise ValueError(f"반려견 {n}마리는 {min_size}~{max_size}마리 그룹으로 나눌 수 없습니다.")
+    return groups
+
+def partition_playgroups(scores: np.ndarray, min_size: int, max_size: int,
+                         time_budget: float = DEFAULT_TIME_BUDGET, seed: int = 0) -> Dict[str, Any]:
+    """
+    궁합 점수 행렬로 놀이 그룹 편성
+
+    Args:
+        scores: (N, N) 대칭 정수 점수 행렬 (대각선 0)
+        min_size, max_size: 그룹 크기 제한
+        time_budget: 지역 탐색 제한 시간 (초)
+        seed: 흔들기 난수 시드 (같은 입력과 시드면 같은 시간 안에서 같은 순서로 탐색)
+
+    Returns:
+        {"groups": [[반려견 번호, ...], ...], "total_score", "greedy_score", "improvements", "restarts", "elapsed_ms"}
+
+    Raises:
+        ValueError: 크기 제한으로 나눌 수 없는 마릿수
+    """
+    started = time.perf_counter()
+    deadline = started + min(max(time_budget, 0.0), MAX_TIME_BUDGET)
+    n = len(scores)
+    k = group_count_for(n, min_size, max_size)
+    # 그룹 점수 합은 작은 정수의 합이므로 float64로도 정확 (행렬 곱이 정수형보다 빠름)
+    matrix = scores.astype(np.float64)
+    rng = np.random.default_rng(seed)
+
+    assign = _greedy(matrix, k, min_size, max_size)
+    sizes = np.bincount(assign, minlength=k)
+    gains = _group_gains(matrix, assign, k)
+    greedy_score = _total(gains, assign)
+
+    best_assign, best_score = assign.copy(), greedy_score
+    improvements = restarts = stalled = 0
+    while True:
+        improved = _local_search(matrix, assign, sizes, gains, min_size, max_size, deadline, rng)
+        improvements += improved
+        score = _total(gains, assign)
+        if score > best_score:
+            best_assign, best_score = assign.copy(), score
+            stalled = 0
+        else:
+            stalled += 1
+        if time.perf_counter() >= deadline or k == 1 or stalled >= STALL_RESTARTS:
+            break
+        # 더 나아지지 않으면 가장 좋은 해에서 무작위 교환으로 흔들어 다른 지역 최적해를 찾음
+        assign[:] = best_assign
+        _perturb(assign, max(2, n // 20), rng)
+        sizes = np.bincount(assign, minlength=k)
+        gains = _group_gains(matrix, assign, k)
+        restarts += 1
+
+    groups = [np.flatnonzero(best_assign == group).tolist() for group in range(k)]
+    return {
+        "groups": groups,
+        "total_score": int(best_score),
+        "greedy_score": int(greedy_score),
+        "improvements": improvements,
+        "restarts": restarts,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+def _group_gains(matrix: np.ndarray, assign: np.ndarray, k: int) -> np.ndarray:
+    """
+    G[i, g] = 반려견 i와 그룹 g 구성원들의 점수 합
+    """
+    onehot = np.zeros((len(assign), k))
+    onehot[np.arange(len(assign)), assign] = 1.0
+    return matrix @ onehot
+
+def _total(gains: np.ndarray, assign: np.ndarray) -> int:
+    return int(round(gains[np.arange(len(assign)), assign].sum() / 2))
+
+def _greedy(matrix: np.ndarray, k: int, min_size: int, max_size: int) -> np.ndarray:
+    n = len(matrix)
+    assign = np.full(n, -1, dtype=np.intp)
+    sizes = np.zeros(k, dtype=np.intp)
+    gains = np.zeros((n, k))
+
+    def place(dog: int, group: int):
+        assign[dog] = group
+        sizes[group] += 1
+        gains[:, group] += matrix[:, dog]
+
+    # 씨앗: 전체와 가장 안 맞는 반려견부터, 이미 고른 씨앗들과 가장 안 맞는 반려견을 각 그룹에 하나씩
+    place(int(np.argmin(matrix.sum(axis=1))), 0)
+    for group in range(1, k):
+        seed_affinity = gains.sum(axis=1)
+        seed_affinity[assign >= 0] = np.inf
+        place(int(np.argmin(seed_affinity)), group)
+
+    for remaining in range(n - k, 0, -1):
+        deficit = np.maximum(min_size - sizes, 0)
+        # 남은 반려견 수가 최소 크기 부족분과 같으면 부족한 그룹에만 배정
+        open_groups = (sizes < min_size) if remaining <= deficit.sum() else (sizes < max_size)
+        candidates = np.where(open_groups[None, :], gains, -np.inf)
+        unassigned = np.flatnonzero(assign < 0)
+        options = candidates[unassigned]
+        if options.shape[1] > 1:
+            top_two = np.partition(options, -2, axis=1)[:, -2:]
+            second = np.where(np.isfinite(top_two[:, 0]), top_two[:, 0], top_two[:, 1] - 1e6)
+            regret = top_two[:, 1] - second
+        else:
+            regret = options[:, 0]
+        dog = int(unassigned[np.argmax(regret)])
+        place(dog, int(np.argmax(candidates[dog])))
+    return assign
+
+def _local_search(matrix: np.ndarray, assign: np.ndarray, sizes: np.ndarray, gains: np.ndarray,
+                  min_size: int, max_size: int, deadline: float, rng: np.random.Generator) -> int:
+    """
+    이동/교환으로 더 나아지지 않을 때까지(또는 제한 시간까지) 개선 (assign, sizes, gains를 직접 수정)
+
+    Returns:
+        적용한 개선 횟수
+    """
+    n = len(assign)
+    rows = np.arange(n)
+    improvements = 0
+
+    def move(dog: int, source: int, target: int):
+        assign[dog] = target
+        sizes[source] -= 1
+        sizes[target] += 1
+        gains[:, source] -= matrix[:, dog]
+        gains[:, target] += matrix[:, dog]
+
+    while time.perf_counter() < deadline:
+        improved = False
+
+        # 이동: 모든 (반려견, 대상 그룹)의 점수 변화를 한 번에 계산하여 가장 좋은 이동부터
+        while True:
+            current = gains[rows, assign]
+            delta = gains - current[:, None]
+            delta[rows, assign] = -np.inf
+            delta[sizes[assign] <= min_size, :] = -np.inf
+            delta[:, sizes >= max_size] = -np.inf
+            best = int(np.argmax(delta))
+            dog, target = divmod(best, delta.shape[1])
+            if delta[dog, target] <= 0:
+                break
+            move(dog, int(assign[dog]), target)
+            improvements += 1
+            improved = True
+
+        # 교환: 반려견마다 다른 그룹의 모든 반려견과 맞바꿨을 때의 점수 변화를 계산
+        for dog in rng.permutation(n):
+            if time.perf_counter() >= deadline:
+                return improvements
+            own = assign[dog]
+            current = gains[rows, assign]
+            delta = (gains[dog, assign] - gains[dog, own]) + (gains[:, own] - current) - 2 * matrix[dog]
+            delta[assign == own] = -np.inf
+            other = int(np.argmax(delta))
+            if delta[other] > 0:
+                other_group = int(assign[other])
+                move(dog, int(own), other_group)
+                move(other, other_group, int(own))
+                improvements += 1
+                improved = True
+
+        if not improved:
+            break
+    return improvements
+
+def _perturb(assign: np.ndarray, swaps: int, rng: np.random.Generator):
+    """
+    서로 다른 그룹의 반려견을 무작위로 맞바꿈 (그룹 크기는 유지)
+    """
+    n = len(assign)
+    for _ in range(swaps):
+        a, b = rng.integers(n, size=2)
+        if assign[a] != assign[b]:
+            assign[a], assign[b] = assign[b], assign[a]
+
+def group_summary(scores: np.ndarray, members: List[int]) -> Dict[str, int]:
+    """
+    그룹 하나의 점수 합과 맞지 않는 쌍(점수 < 0) 수
+    """
+    block = scores[np.ix_(members, members)]
+    upper = np.triu_indices(len(members), k=1)
+    return {"score": int(block[upper].sum()), "conflict_pairs": int((block[upper] < 0).sum())}
@@ -0,0 +1,157 @@
+"""
+간지 관계 점수 테이블
+두 육십갑자(기준 주 vs 비교 주) 사이의 천간/지지 관계를 정수 점수로 미리 계산
+날짜 스캔, 연운 타임라인, 그룹 편성 등에서 배열 인덱싱만으로 점수를 구함
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from app.utils.mapping_tables import AUSPICIOUS_PURPOSES, BRANCH_KOREAN, FIVE_ELEMENTS
+
+# 오행 상생(生): 목 -> 화 -> 토 -> 금 -> 수 -> 목, 상극(剋): 목 -> 토 -> 수 -> 화 -> 금 -> 목
+_GENERATES = [(element + 1) % 5 for element in range(5)]
+_CONTROLS = [(element + 2) % 5 for element in range(5)]
+
+def _stem_score(base_stem: int, other_stem: int) -> int:
+    """
+    기준 천간 입장에서 본 비교 천간의 점수
+    """
+    if (base_stem + 5) % 10 == other_stem:
+        return 2  # 천간합 (갑기, 을경, 병신, 정임, 무계)
+
+    base, other = base_stem // 2, other_stem // 2
+    if _GENERATES[other] == base:
+        return 2  # 비교 주가 기준을 생해줌
+    if base == other:
+        return 1  # 같은 오행
+    if _CONTROLS[other] == base:
+        return -2  # 비교 주가 기준을 극함
+    return 0
+
+def _branch_score(base_branch: int, other_branch: int) -> int:
+    """
+    기준 지지 입장에서 본 비교 지지의 점수
+    """
+    if (base_branch - other_branch) % 12 == 6:
+        return -3  # 충 (자오, 축미, 인신, 묘유, 진술, 사해)
+    if (base_branch + other_branch) % 12 == 1:
+        return 2  # 육합 (자축, 인해, 묘술, 진유, 사신, 오미)
+    if base_branch == other_branch:
+        return 1
+    if base_branch % 4 == other_branch % 4:
+        return 1  # 삼합 (신자진, 해묘미, 인오술, 사유축)
+    if (base_branch + other_branch) % 12 == 7:
+        return -1  # 육해 (자미, 축오, 인사, 묘진, 신해, 유술)
+    return 0
+
+def branch_relation_name(base_branch: int, other_branch: int) -> str:
+    """
+    두 지지의 관계 이름 (설명용)
+    """
+    if (base_branch - other_branch) % 12 == 6:
+        return "충"
+    if (base_branch + other_branch) % 12 == 1:
+        return "육합"
+    if base_branch == other_branch:
+        return "동일"
+    if base_branch % 4 == other_branch % 4:
+        return "삼합"
+    if (base_branch + other_branch) % 12 == 7:
+        return "육해"
+    return "보통"
+
+def _build_pillar_relation() -> np.ndarray:
+    table = np.zeros((60, 60), dtype=np.int8)
+    for base in range(60):
+        for other in range(60):
+            table[base, other] = _stem_score(base % 10, other % 10) + _branch_score(base % 12, other % 12)
+    table.setflags(write=False)
+    return table
+
+def _build_element_compatibility() -> np.ndarray:
+    """
+    get_element_compatibility의 판정을 점수화한 5x5 대칭 행렬
+    상생 +2, 같은 오행 +1, 상극 -2
+    """
+    table = np.zeros((5, 5), dtype=np.int8)
+    for a in range(5):
+        for b in range(5):
+            if _GENERATES[a] == b or _GENERATES[b] == a:
+                table[a, b] = 2
+            elif _CONTROLS[a] == b or _CONTROLS[b] == a:
+                table[a, b] = -2
+            elif a == b:
+                table[a, b] = 1
+    table.setflags(write=False)
+    return table
+
+# PILLAR_RELATION[기준 코드, 비교 코드] = 천간 점수 + 지지 점수 (-5 ~ 4)
+PILLAR_RELATION = _build_pillar_relation()
+
+# ELEMENT_COMPATIBILITY[오행 코드, 오행 코드]
+ELEMENT_COMPATIBILITY = _build_element_compatibility()
+
+# 기준 사주 각 주의 가중치 (일주가 가장 중요)
+PILLAR_WEIGHTS = {"year": 1, "month": 1, "day": 3, "hour": 1}
+
+def pillar_scores(pet_codes: Dict[str, int], other_codes: np.ndarray) -> np.ndarray:
+    """
+    반려견 사주와 여러 간지 코드 사이의 가중 관계 점수
+
+    Args:
+        pet_codes: {"year": 37, "month": 35, "day": 19, ("hour": 12)}
+        other_codes: 비교할 육십갑자 코드 배열
+
+    Returns:
+        other_codes와 같은 길이의 점수 배열 (int32)
+    """
+    scores = np.zeros(len(other_codes), dtype=np.int32)
+    for pillar_type, code in pet_codes.items():
+        weight = PILLAR_WEIGHTS.get(pillar_type)
+        if weight and code is not None:
+            scores += weight * PILLAR_RELATION[code, other_codes].astype(np.int32)
+    return scores
+
+# 그룹 편성 점수에서 오행 상성의 가중치 (일주 관계는 양방향 합)
+GROUP_ELEMENT_WEIGHT = 2
+
+def compatibility_matrix(element_codes: np.ndarray, day_codes: np.ndarray) -> np.ndarray:
+    """
+    반려견 여러 마리 사이의 대칭 궁합 점수 행렬
+
+    Args:
+        element_codes: 반려견별 일간 오행 코드 배열
+        day_codes: 반려견별 일주 코드 배열
+
+    Returns:
+        (N, N) int32 행렬, [i, j] = 오행 상성 x GROUP_ELEMENT_WEIGHT + 일주 관계(i->j, j->i 합), 대각선 0
+    """
+    element_codes = np.asarray(element_codes, dtype=np.intp)
+    day_codes = np.asarray(day_codes, dtype=np.intp)
+    day_relation = PILLAR_RELATION[day_codes[:, None], day_codes[None, :]].astype(np.int32)
+    scores = GROUP_ELEMENT_WEIGHT * ELEMENT_COMPATIBILITY[element_codes[:, None], element_codes[None, :]].astype(np.int32)
+    scores += day_relation + day_relation.T
+    np.fill_diagonal(scores, 0)
+    return scores
+
+def _build_purpose_bonus() -> Dict[str, np.ndarray]:
+    bonuses = {}
+    for purpose, config in AUSPICIOUS_PURPOSES.items():
+        by_branch = np.zeros(12, dtype=np.int32)
+        for branch, bonus in config["branch_bonus"].items():
+            by_branch[BRANCH_KOREAN.index(branch)] = bonus
+        table = by_branch[np.arange(60) % 12]
+        table.setflags(write=False)
+        bonuses[purpose] = table
+    return bonuses
+
+# PURPOSE_BONUS[목적][일진 코드] = 목적별 가산점
+PURPOSE_BONUS = _build_purpose_bonus()
+
+def element_code(element_name: str) -> int:
+    """
+    "수(水)" 또는 "수" 형식의 오행을 코드로 변환
+    """
+    return FIVE_ELEMENTS.index(element_name.split("(")[0])
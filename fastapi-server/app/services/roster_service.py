@@ -0,0 +1,468 @@
+"""
+보호소 명단(CSV/XLSX) 일괄 분석 서비스
+업로드 본문을 받는 대로 행 단위로 파싱하고, 일정 행 수마다 분석 파이프라인(parse -> resolve -> analyze)을 실행해
+결과를 NDJSON 또는 CSV로 바로 흘려보냄 (본문 전체를 메모리에 올리지 않음)
+
+- CSV: 요청 본문 조각을 점진적으로 디코딩하여 완성된 레코드만 파싱 (따옴표 안의 줄바꿈 지원)
+  인코딩은 첫 조각으로 판단 (UTF-8이 아니면 한국어 엑셀 기본값인 CP949)
+- XLSX: zip 형식이라 끝까지 받아야 읽을 수 있으므로 임시 파일에 받은 뒤 openpyxl read_only 모드로 행 단위 읽기
+- 행별 오류는 중단하지 않고 해당 행의 결과로 함께 보고
+"""
+
+import codecs
+import csv
+import io
+import json
+import os
+import tempfile
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+
+from app.services.analysis_pipeline import AnalysisContext, analyze_stage, parse_stage, render_stage, resolve_stage
+from app.services.event_log import describe_error, event_log
+from app.services.pet_service import pet_service
+
+try:
+    from multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart 0.0.13 이후 패키지 이름
+    from python_multipart.multipart import MultipartParser, parse_options_header
+
+# 한 번에 분석하는 행 수 (메모리 사용량과 응답 지연의 균형)
+ROSTER_CHUNK_ROWS = int(os.environ.get("PAWSTARS_ROSTER_CHUNK_ROWS", "500"))
+
+# XLSX 업로드를 메모리에 두는 최대 크기 (넘으면 디스크 임시 파일 사용)
+XLSX_SPOOL_BYTES = 1024 * 1024
+
+OUTPUT_FORMATS = ("ndjson", "csv")
+OUTPUT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# 명단 헤더 -> 등록 필드 (영문 필드명과 한글 헤더 모두 허용)
+COLUMN_ALIASES = {
+    "name": "name", "이름": "name",
+    "breed": "breed", "견종": "breed",
+    "gender": "gender", "성별": "gender",
+    "birth_date": "birth_date", "생년월일": "birth_date",
+    "birth_time": "birth_time", "출생시각": "birth_time", "출생 시각": "birth_time",
+    "calendar_type": "calendar_type", "달력": "calendar_type",
+    "is_leap_month": "is_leap_month", "윤달": "is_leap_month",
+    "zasi_mode": "zasi_mode",
+    "owner_id": "owner_id", "보호자": "owner_id"
+}
+REQUIRED_COLUMNS = ("name", "breed", "gender", "birth_date")
+
+GENDER_ALIASES = {"male": "male", "m": "male", "수컷": "male", "female": "female", "f": "female", "암컷": "female"}
+CALENDAR_ALIASES = {"solar": "solar", "양력": "solar", "lunar": "lunar", "음력": "lunar"}
+TRUE_VALUES = ("true", "1", "y", "yes", "윤", "윤달")
+
+CSV_COLUMNS = (
+    "row", "status", "error", "name", "breed", "gender", "birth_date", "birth_time",
+    "year", "month", "day", "hour", "five_element", "shinsal_summary", "pet_id"
+)
+
+class RosterFormatError(ValueError):
+    """명단 전체를 처리할 수 없는 형식 오류 (헤더 누락 등)"""
+
+# UTF-8로 읽을 수 없는 CSV의 대체 인코딩 (한국어 엑셀 "CSV" 저장 기본값)
+FALLBACK_CSV_ENCODING = "cp949"
+
+def detect_csv_encoding(data: bytes, final: bool = True) -> str:
+    """
+    CSV 첫 조각이 UTF-8(BOM 포함)로 디코딩되면 utf-8-sig, 아니면 CP949
+    (조각 끝에서 잘린 멀티바이트 문자는 final=False 증분 디코더가 다음 조각으로 넘기므로 오판하지 않음)
+    """
+    try:
+        codecs.getincrementaldecoder("utf-8-sig")().decode(data, final)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return FALLBACK_CSV_ENCODING
+
+def undecodable_csv_error(encoding: str) -> RosterFormatError:
+    """
+    감지한 인코딩으로 디코딩할 수 없는 CSV의 오류 (행 번호 0으로 보고)
+    """
+    return RosterFormatError(
+        f"명단을 {encoding} 인코딩으로 읽을 수 없습니다. UTF-8 또는 CP949 CSV로 저장해주세요."
+    )
+
+class CsvRecordReader:
+    """
+    바이트 조각을 받아 완성된 CSV 레코드만 돌려주는 증분 파서
+    """
+
+    def __init__(self):
+        self.encoding: Optional[str] = None
+        self._decoder = None
+        self._buffer = ""
+        self._record: List[str] = []
+        self._quotes = 0
+
+    def feed(self, data: bytes, final: bool = False) -> List[List[str]]:
+        """
+        Raises:
+            RosterFormatError: 감지한 인코딩으로 디코딩할 수 없는 본문
+        """
+        if self._decoder is None:
+            if not data and not final:
+                return []
+            self.encoding = detect_csv_encoding(data, final)
+            self._decoder = codecs.getincrementaldecoder(self.encoding)()
+        try:
+            self._buffer += self._decoder.decode(data, final)
+        except UnicodeDecodeError:
+            raise undecodable_csv_error(self.encoding)
+        lines = self._buffer.splitlines(keepends=True)
+        # 마지막 줄이 \n으로 끝나지 않았으면 다음 조각을 기다림
+        # (\r로 끝나면 다음 조각이 CRLF의 \n으로 시작할 수 있으므로 빈 레코드가 생기지 않도록 함께 넘김)
+        self._buffer = lines.pop() if lines and not final and not lines[-1].endswith("\n") else ""
+
+        complete = []
+        for line in lines:
+            self._record.append(line)
+            self._quotes += line.count('"')
+            # 따옴표 개수가 짝수면 레코드가 끝남 (홀수면 따옴표 안의 줄바꿈)
+            if self._quotes % 2 == 0:
+                complete.append("".join(self._record))
+                self._record = []
+                self._quotes = 0
+        if final and self._record:
+            complete.append("".join(self._record))
+            self._record = []
+        return list(csv.reader(complete))
+
+def iter_xlsx_rows(file) -> Iterator[List[str]]:
+    """
+    XLSX 첫 시트의 행을 문자열 리스트로 하나씩 읽기 (read_only 모드라 시트 전체를 메모리에 올리지 않음)
+
+    Raises:
+        RosterFormatError: openpyxl 미설치 또는 XLSX가 아님
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        raise RosterFormatError("XLSX 명단을 읽으려면 openpyxl이 필요합니다. CSV로 업로드해주세요.")
+
+    try:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise RosterFormatError(f"XLSX 파일을 읽을 수 없습니다: {e}")
+    try:
+        for values in workbook.worksheets[0].iter_rows(values_only=True):
+            yield [_cell_text(value) for value in values]
+    finally:
+        workbook.close()
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if hasattr(value, "strftime"):
+        # 엑셀 날짜/시각 셀
+        return value.strftime("%H:%M" if not hasattr(value, "year") else "%Y-%m-%d")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+class RosterAnalyzer:
+    """
+    헤더를 해석하고 행 묶음을 분석하여 출력 형식에 맞는 바이트로 변환
+    """
+
+    def __init__(self, output_format: str = "ndjson", owner_id: Optional[str] = None, with_source: bool = False):
+        """
+        Args:
+            with_source: 결과마다 입력 파일 이름(source)을 함께 기록 (여러 파일을 한 결과로 모으는 일괄 분석용)
+        """
+        self.output_format = output_format
+        self.owner_id = owner_id
+        self.with_source = with_source
+        self.source: Optional[str] = None
+        self.columns: Optional[Dict[str, int]] = None
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def header(self) -> bytes:
+        if self.output_format == "csv":
+            return self._csv_line(("source",) + CSV_COLUMNS if self.with_source else CSV_COLUMNS)
+        return b""
+
+    def set_header(self, row: List[str]):
+        columns = {}
+        for position, cell in enumerate(row):
+            field = COLUMN_ALIASES.get(cell.strip().lower()) or COLUMN_ALIASES.get(cell.strip())
+            if field and field not in columns:
+                columns[field] = position
+        missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+        if missing:
+            raise RosterFormatError(f"명단에 필수 컬럼이 없습니다: {', '.join(missing)}")
+        self.columns = columns
+
+    def _field(self, row: List[str], field: str) -> str:
+        position = self.columns.get(field)
+        if position is None or position >= len(row):
+            return ""
+        return row[position].strip()
+
+    def _parse_row(self, row: List[str]) -> Tuple[AnalysisContext, Optional[str]]:
+        gender = self._field(row, "gender")
+        calendar_type = self._field(row, "calendar_type") or "solar"
+        ctx = parse_stage(
+            name=self._field(row, "name"),
+            breed=self._field(row, "breed"),
+            gender=GENDER_ALIASES.get(gender.lower(), gender),
+            birth_date=self._field(row, "birth_date"),
+            birth_time=self._field(row, "birth_time") or None,
+            zasi_mode=self._field(row, "zasi_mode") or None,
+            calendar_type=CALENDAR_ALIASES.get(calendar_type.lower(), calendar_type),
+            is_leap_month=self._field(row, "is_leap_month").lower() in TRUE_VALUES
+        )
+        return ctx, self._field(row, "owner_id") or self.owner_id
+
+    def process(self, rows: List[Tuple[int, List[str]]]) -> bytes:
+        """
+        (행 번호, 셀 리스트) 묶음 분석 (스레드 풀에서 실행)
+        """
+        outcomes = []
+        to_save = []
+        for row_number, row in rows:
+            self.total += 1
+            try:
+                ctx, owner_id = self._parse_row(row)
+                analyze_stage(resolve_stage(ctx))
+                outcomes.append((row_number, ctx, None))
+                if owner_id:
+                    to_save.append((len(outcomes) - 1, owner_id))
+            except ValueError as e:
+                outcomes.append((row_number, None, str(e)))
+            except Exception as e:
+                event_log.emit("roster_row_failed", level="error", row=row_number, error=describe_error(e))
+                outcomes.append((row_number, None, "분석 중 오류가 발생했습니다."))
+
+        # 등록부 저장은 묶음마다 한 트랜잭션으로
+        if to_save:
+            pet_ids = pet_service.save_pets(
+                [outcomes[position][1].analysis for position, _ in to_save],
+                [owner_id for _, owner_id in to_save]
+            )
+            for (position, _), pet_id in zip(to_save, pet_ids):
+                outcomes[position][1].analysis["pet_id"] = pet_id
+
+        out = []
+        for row_number, ctx, error in outcomes:
+            if error is None:
+                self.succeeded += 1
+                out.append(self._render_ok(row_number, ctx))
+            else:
+                self.failed += 1
+                out.append(self.render_error(row_number, error))
+        return b"".join(out)
+
+    def _render_ok(self, row_number: int, ctx: AnalysisContext) -> bytes:
+        analysis = ctx.analysis
+        if self.output_format == "csv":
+            pillars = analysis["pillars"]
+            return self._csv_line(self._source_cells() + (
+                row_number, "ok", "", analysis["name"], analysis["breed"], analysis["gender"],
+                analysis["birth_date"], analysis["birth_time"] or "",
+                pillars["year"], pillars["month"], pillars["day"], pillars.get("hour") or "",
+                analysis["five_element"], analysis["shinsal_summary"], analysis.get("pet_id") or ""
+            ))
+        model = render_stage(ctx)
+        source = b',"source":' + json.dumps(self.source, ensure_ascii=False).encode("utf-8") if self.with_source else b""
+        return (
+            b'{"row":' + str(row_number).encode() + source + b',"status":"ok","result":'
+            + model.__pydantic_serializer__.to_json(model) + b"}\n"
+        )
+
+    def render_error(self, row_number: int, error: str) -> bytes:
+        if self.output_format == "csv":
+            return self._csv_line(
+                self._source_cells() + (row_number, "error", error) + ("",) * (len(CSV_COLUMNS) - 3)
+            )
+        content = {"row": row_number, "source": self.source} if self.with_source else {"row": row_number}
+        return self._json_line({**content, "status": "error", "error": error})
+
+    def _source_cells(self) -> tuple:
+        return (self.source or "",) if self.with_source else ()
+
+    def footer(self) -> bytes:
+        if self.output_format == "csv":
+            return b""
+        return self._json_line({"status": "done", "total": self.total, "ok": self.succeeded, "errors": self.failed})
+
+    @staticmethod
+    def _csv_line(values) -> bytes:
+        out = io.StringIO()
+        csv.writer(out, lineterminator="\n").writerow(values)
+        return out.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _json_line(content: Dict[str, Any]) -> bytes:
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+async def _multipart_file(body: AsyncIterator[bytes], content_type: str) -> AsyncIterator[Tuple[Optional[str], bytes]]:
+    """
+    multipart 본문에서 첫 번째 파일 파트의 내용을 조각 단위로 전달 ((파일 이름, 조각))
+    """
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise RosterFormatError("multipart 요청에 boundary가 없습니다.")
+
+    state = {"header_field": b"", "header_value": b"", "headers": {}, "filename": None, "active": False, "done": False}
+    pending: List[bytes] = []
+
+    def on_part_begin():
+        state["headers"] = {}
+
+    def on_header_field(data, start, end):
+        state["header_field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["header_value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header_field"].lower()] = state["header_value"]
+        state["header_field"] = b""
+        state["header_value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        filename = disposition.get(b"filename")
+        # 파일이 아닌 일반 필드는 건너뜀, 파일은 첫 번째 것만 사용
+        state["active"] = filename is not None and not state["done"] and state["filename"] is None
+        if state["active"]:
+            state["filename"] = filename.decode("utf-8", "replace")
+
+    def on_part_data(data, start, end):
+        if state["active"]:
+            pending.append(data[start:end])
+
+    def on_part_end():
+        if state["active"]:
+            state["active"] = False
+            state["done"] = True
+
+    parser = MultipartParser(boundary, callbacks={
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end
+    })
+
+    async for chunk in body:
+        if state["done"] and not pending:
+            continue  # 나머지 파트는 읽고 버림
+        parser.write(chunk)
+        if pending:
+            data = b"".join(pending)
+            pending.clear()
+            yield state["filename"], data
+    parser.finalize()
+    if state["filename"] is None:
+        raise RosterFormatError("업로드된 명단 파일이 없습니다.")
+
+def _is_xlsx(filename: Optional[str], content_type: str) -> bool:
+    return (filename or "").lower().endswith(".xlsx") or "spreadsheetml" in content_type
+
+async def stream_roster(body: AsyncIterator[bytes], content_type: str, output_format: str = "ndjson",
+                        owner_id: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    업로드 본문을 받는 대로 분석하여 결과 바이트를 순서대로 생성
+
+    Args:
+        body: 요청 본문 조각 (request.stream())
+        content_type: 요청 Content-Type (multipart/form-data, text/csv, XLSX)
+        output_format: "ndjson" 또는 "csv"
+        owner_id: 지정하면 성공한 행을 반려견 등록부에 저장 (명단의 owner_id 컬럼이 우선)
+    """
+    analyzer = RosterAnalyzer(output_format, owner_id)
+    yield analyzer.header()
+
+    try:
+        if content_type.startswith("multipart/form-data"):
+            parts = _multipart_file(body, content_type)
+        else:
+            parts = ((None, chunk) async for chunk in body)
+
+        first = await parts.__anext__()
+        if _is_xlsx(first[0], content_type) or first[1].startswith(b"PK\x03\x04"):
+            rows = _xlsx_row_batches(first[1], parts)
+        else:
+            rows = _csv_row_batches(first[1], parts)
+
+        row_number = 0
+        async for batch in rows:
+            numbered = []
+            for row in batch:
+                # 행 번호는 원본 파일 기준 (빈 행도 번호는 차지)
+                row_number += 1
+                if not any(cell.strip() for cell in row):
+                    continue
+                if analyzer.columns is None:
+                    analyzer.set_header(row)
+                else:
+                    numbered.append((row_number, row))
+            if numbered:
+                yield await run_in_threadpool(analyzer.process, numbered)
+        if analyzer.columns is None:
+            raise RosterFormatError("명단이 비어 있습니다.")
+    except StopAsyncIteration:
+        yield analyzer.render_error(0, "명단이 비어 있습니다.")
+    except RosterFormatError as e:
+        # 응답이 이미 시작되었으므로 상태 코드 대신 결과 행으로 보고
+        yield analyzer.render_error(0, str(e))
+
+    yield analyzer.footer()
+
+async def _csv_row_batches(first: bytes, parts) -> AsyncIterator[List[List[str]]]:
+    reader = CsvRecordReader()
+    batch = reader.feed(first)
+    async for _, chunk in parts:
+        batch.extend(reader.feed(chunk))
+        if len(batch) >= ROSTER_CHUNK_ROWS:
+            yield batch
+            batch = []
+    batch.extend(reader.feed(b"", final=True))
+    if batch:
+        yield batch
+
+async def _xlsx_row_batches(first: bytes, parts) -> AsyncIterator[List[List[str]]]:
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES) as spool:
+        spool.write(first)
+        async for _, chunk in parts:
+            spool.write(chunk)
+        spool.seek(0)
+
+        rows = iter_xlsx_rows(spool)
+        while True:
+            batch = await run_in_threadpool(_take, rows, ROSTER_CHUNK_ROWS)
+            if not batch:
+                break
+            yield batch
+
+def _take(rows: Iterator[List[str]], count: int) -> List[List[str]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= count:
+            break
+    return batch
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽으면서 응답을 보내는 스트리밍 응답
+
+    StreamingResponse는 연결 종료를 감지하려고 receive()를 계속 호출하는데,
+    그러면 아직 도착하지 않은 요청 본문 조각을 가로채므로 본문은 응답 생성기만 읽도록 함
+    (연결이 끊기면 request.stream()에서 ClientDisconnect가 발생)
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
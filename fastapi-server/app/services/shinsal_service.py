@@ -1,94 +1,254 @@
 """
 신살(神殺) 분석 서비스
 삼주의 간지 조합을 바탕으로 각종 신살을 판정
+
+신살 규칙은 데이터 파일(app/rules/shinsal_rules.json)에 선언하고,
+로드 시점에 "구성요소 값 -> 신살 비트마스크" 조회 테이블로 컴파일한다.
+판정은 구성요소마다 테이블 조회 후 OR 하는 것이 전부이므로 규칙 수와 무관하게 비용이 일정하다.
+규칙 파일이 바뀌면 요청 경로에서 수정 시각만 확인하여 다시 컴파일한다 (워커 재시작 불필요).
 """
 
-from typing import Dict, List, Any
-from app.utils.mapping_tables import SHINSAL_RULES
-from app.utils.ganzi_parser import extract_stems_and_branches
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from app.services.event_log import event_log
+from app.utils.mapping_tables import STEM_HANJA, BRANCH_HANJA, STEM_KOREAN, BRANCH_KOREAN
+
+# 판정에 사용할 수 있는 구성요소 ("주.천간" / "주.지지")
+PILLAR_TYPES = ("year", "month", "day", "hour")
+COMPONENTS = tuple(f"{pillar_type}.{part}" for pillar_type in PILLAR_TYPES for part in ("stem", "branch"))
 
-def check_yeokma_sal(branches: List[str]) -> bool:
+_STEM_INDEX = {char: index for index, char in enumerate(STEM_HANJA)}
+_BRANCH_INDEX = {char: index for index, char in enumerate(BRANCH_HANJA)}
+
+DEFAULT_RULES_PATH = os.environ.get(
+    "PAWSTARS_SHINSAL_RULES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "rules", "shinsal_rules.json")
+)
+
+# 규칙 파일 변경 확인 주기 (초)
+RULES_CHECK_INTERVAL = float(os.environ.get("PAWSTARS_RULES_CHECK_INTERVAL", "2"))
+
+def _value_index(component: str, value: str) -> int:
     """
-    역마살(驛馬殺) 판정
-    지지에 인(寅), 신(申), 사(巳), 해(亥)가 있으면 역마살
-    
-    Args:
-        branches: 년지, 월지, 일지 리스트
-        
-    Returns:
-        역마살 여부
+    규칙 파일의 한글 간지 값을 구성요소 종류에 맞는 인덱스로 변환 ("신"은 천간 辛/지지 申 모두 가능)
     """
-    yeokma_branches = SHINSAL_RULES["역마살"]["branches"]
-    return any(branch in yeokma_branches for branch in branches)
+    names = STEM_KOREAN if component.endswith(".stem") else BRANCH_KOREAN
+    if value not in names:
+        raise ValueError(f"Unknown value '{value}' for component '{component}'")
+    return names.index(value)
+
+def _component_size(component: str) -> int:
+    return 10 if component.endswith(".stem") else 12
 
-def check_dohwa_sal(branches: List[str]) -> bool:
+def _check_component(component: str):
+    if component not in COMPONENTS:
+        raise ValueError(f"Unknown component: {component}")
+
+class CompiledShinsalRules:
     """
-    도화살(桃花殺) 판정
-    지지에 자(子), 오(午), 묘(卯), 유(酉)가 있으면 도화살
-    
-    Args:
-        branches: 년지, 월지, 일지 리스트
-        
-    Returns:
-        도화살 여부
+    컴파일된 신살 규칙 집합
+
+    - member_tables: 구성요소 -> [값 인덱스별 신살 비트마스크]
+    - relation_tables: (기준 구성요소, 대상 구성요소) -> [기준 값][대상 값] 신살 비트마스크
     """
-    dohwa_branches = SHINSAL_RULES["도화살"]["branches"]
-    return any(branch in dohwa_branches for branch in branches)
 
-def check_hwagae_sal(branches: List[str]) -> bool:
+    def __init__(self, rules: List[Dict[str, Any]], version: Any = None):
+        if len(rules) > 63:
+            raise ValueError("신살 규칙은 최대 63개까지 지원합니다.")
+
+        self.version = version
+        self.names = [rule["name"] for rule in rules]
+        self.rules = {
+            rule["name"]: {"description": rule["description"], "effect": rule["effect"]}
+            for rule in rules
+        }
+        self.member_tables: Dict[str, List[int]] = {}
+        self.relation_tables: Dict[Tuple[str, str], List[List[int]]] = {}
+
+        for bit, rule in enumerate(rules):
+            self._compile_rule(1 << bit, rule["match"])
+
+        # 판정 결과 렌더링 캐시 (비트마스크 -> 결과 딕셔너리)
+        self._rendered: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        # 규칙별 판정 결과 객체 (present True/False 두 가지를 미리 만들어 공유)
+        self._details = {
+            name: (
+                {"present": False, **self.rules[name]},
+                {"present": True, **self.rules[name]}
+            )
+            for name in self.names
+        }
+
+    def _compile_rule(self, bit: int, match: Dict[str, Any]):
+        match_type = match.get("type")
+
+        if match_type == "any":
+            for component in match["components"]:
+                _check_component(component)
+                table = self.member_tables.setdefault(component, [0] * _component_size(component))
+                for value in match["values"]:
+                    table[_value_index(component, value)] |= bit
+
+        elif match_type == "relation":
+            key = match["key"]
+            _check_component(key)
+            for target in match["targets"]:
+                _check_component(target)
+                table = self.relation_tables.setdefault(
+                    (key, target),
+                    [[0] * _component_size(target) for _ in range(_component_size(key))]
+                )
+                for key_value, target_values in match["table"].items():
+                    row = table[_value_index(key, key_value)]
+                    for target_value in target_values:
+                        row[_value_index(target, target_value)] |= bit
+
+        else:
+            raise ValueError(f"Unknown shinsal match type: {match_type}")
+
+    def evaluate(self, indices: Dict[str, int]) -> int:
+        """
+        구성요소 인덱스로 신살 비트마스크 계산
+
+        Args:
+            indices: {"year.stem": 7, "year.branch": 1, ..., "day.stem": 9}
+
+        Returns:
+            규칙 순서대로 비트가 켜진 마스크
+        """
+        mask = 0
+        for component, table in self.member_tables.items():
+            index = indices.get(component)
+            if index is not None:
+                mask |= table[index]
+        for (key, target), table in self.relation_tables.items():
+            key_index = indices.get(key)
+            target_index = indices.get(target)
+            if key_index is not None and target_index is not None:
+                mask |= table[key_index][target_index]
+        return mask
+
+    def evaluate_arrays(self, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        evaluate의 벡터 버전 (여러 날짜/반려견을 한 번에 판정)
+
+        Args:
+            arrays: 구성요소 -> 같은 길이의 인덱스 배열
+
+        Returns:
+            신살 비트마스크 배열 (uint64)
+        """
+        length = len(next(iter(arrays.values()))) if arrays else 0
+        masks = np.zeros(length, dtype=np.uint64)
+        for component, table in self.member_tables.items():
+            if component in arrays:
+                masks |= np.asarray(table, dtype=np.uint64)[arrays[component]]
+        for (key, target), table in self.relation_tables.items():
+            if key in arrays and target in arrays:
+                masks |= np.asarray(table, dtype=np.uint64)[arrays[key], arrays[target]]
+        return masks
+
+    def render(self, mask: int) -> Dict[str, Dict[str, Any]]:
+        """
+        비트마스크를 {"역마살": {"present": True, "description": ..., "effect": ...}, ...} 형태로 변환
+        """
+        rendered = self._rendered.get(mask)
+        if rendered is None:
+            rendered = {
+                name: self._details[name][(mask >> bit) & 1]
+                for bit, name in enumerate(self.names)
+            }
+            self._rendered[mask] = rendered
+        return dict(rendered)
+
+def load_shinsal_rules(path: str = None) -> CompiledShinsalRules:
     """
-    화개살(華蓋殺) 판정
-    지지에 진(辰), 술(戌), 축(丑), 미(未)가 있으면 화개살
-    
+    규칙 파일을 읽어 컴파일
+
     Args:
-        branches: 년지, 월지, 일지 리스트
-        
-    Returns:
-        화개살 여부
+        path: 규칙 JSON 파일 경로 (기본값: PAWSTARS_SHINSAL_RULES_PATH 또는 app/rules/shinsal_rules.json)
     """
-    hwagae_branches = SHINSAL_RULES["화개살"]["branches"]
-    return any(branch in hwagae_branches for branch in branches)
+    path = path or DEFAULT_RULES_PATH
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return CompiledShinsalRules(data["rules"], version=(data.get("version"), os.stat(path).st_mtime_ns))
 
-def check_munchang_gwiin(day_stem: str) -> bool:
+class _RulesHolder:
     """
-    문창귀인(文昌貴人) 판정
-    일간이 갑, 을, 병, 정이면 문창귀인
-    
-    Args:
-        day_stem: 일간
-        
-    Returns:
-        문창귀인 여부
+    컴파일된 규칙 집합을 보관하고 파일 변경 시 교체 (참조 교체만 하므로 읽기에는 잠금 없음)
     """
-    munchang_stems = SHINSAL_RULES["문창귀인"]["stems"]
-    return day_stem in munchang_stems
 
-def check_cheondeok_gwiin(day_stem: str, month_branch: str) -> bool:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime_ns = os.stat(path).st_mtime_ns
+        self._checked_at = time.monotonic()
+        self.rules = load_shinsal_rules(path)
+
+    def get(self) -> CompiledShinsalRules:
+        now = time.monotonic()
+        if now - self._checked_at >= RULES_CHECK_INTERVAL and self._lock.acquire(blocking=False):
+            try:
+                self._checked_at = now
+                mtime_ns = os.stat(self.path).st_mtime_ns
+                if mtime_ns != self._mtime_ns:
+                    # 실패해도 같은 파일을 반복해서 다시 읽지 않도록 먼저 기록
+                    self._mtime_ns = mtime_ns
+                    self.rules = load_shinsal_rules(self.path)
+                    event_log.emit("shinsal_rules_reloaded", path=self.path, rules=len(self.rules.names))
+            except Exception as e:
+                # 잘못된 규칙 파일은 무시하고 기존 규칙 유지
+                event_log.emit("shinsal_rules_reload_failed", level="error", path=self.path, error=str(e))
+            finally:
+                self._lock.release()
+        return self.rules
+
+_holder: Optional[_RulesHolder] = None
+
+def get_shinsal_rules() -> CompiledShinsalRules:
+    """
+    현재 적용 중인 컴파일된 신살 규칙 집합
+    """
+    global _holder
+    if _holder is None:
+        _holder = _RulesHolder(DEFAULT_RULES_PATH)
+    return _holder.get()
+
+def pillar_component_indices(pillars: Dict[str, str]) -> Dict[str, int]:
     """
-    천덕귀인(天德貴人) 판정
-    월지와 일간의 조합으로 판정
-    
+    간지를 구성요소 인덱스로 변환
+
     Args:
-        day_stem: 일간
-        month_branch: 월지
-        
+        pillars: {"year": "乙未", "month": "戊子", "day": "癸丑"}
+
     Returns:
-        천덕귀인 여부
+        {"year.stem": 1, "year.branch": 7, "month.stem": 4, ...}
     """
-    monthly_stems = SHINSAL_RULES["천덕귀인"]["monthly_stems"]
-    
-    if month_branch in monthly_stems:
-        return day_stem in monthly_stems[month_branch]
-    
-    return False
+    indices = {}
+    for pillar_type, ganzi in pillars.items():
+        if not ganzi:
+            continue
+        stem = _STEM_INDEX.get(ganzi[0])
+        branch = _BRANCH_INDEX.get(ganzi[1]) if len(ganzi) == 2 else None
+        if stem is None or branch is None:
+            raise ValueError(f"Unknown characters in ganzi: {ganzi}")
+        indices[f"{pillar_type}.stem"] = stem
+        indices[f"{pillar_type}.branch"] = branch
+    return indices
 
 def analyze_all_shinsal(pillars: Dict[str, str]) -> Dict[str, Any]:
     """
     모든 신살을 종합적으로 분석
-    
+
     Args:
-        pillars: {"year": "乙未", "month": "戊子", "day": "癸丑"}
-        
+        pillars: {"year": "乙未", "month": "戊子", "day": "癸丑"} (시주가 있으면 "hour" 포함)
+
     Returns:
         {
             "역마살": {"present": True, "description": "...", "effect": "..."},
@@ -96,65 +256,16 @@ def analyze_all_shinsal(pillars: Dict[str, str]) -> Dict[str, Any]:
             ...
         }
     """
-    # 간지에서 천간과 지지 추출
-    stems_branches = extract_stems_and_branches(pillars)
-    
-    # 필요한 정보 추출
-    day_stem = stems_branches["day"]["stem"]
-    month_branch = stems_branches["month"]["branch"]
-    all_branches = [
-        stems_branches["year"]["branch"],
-        stems_branches["month"]["branch"],
-        stems_branches["day"]["branch"]
-    ]
-    
-    # 각 신살 판정
-    shinsal_results = {}
-    
-    # 역마살
-    shinsal_results["역마살"] = {
-        "present": check_yeokma_sal(all_branches),
-        "description": SHINSAL_RULES["역마살"]["description"],
-        "effect": SHINSAL_RULES["역마살"]["effect"]
-    }
-    
-    # 도화살
-    shinsal_results["도화살"] = {
-        "present": check_dohwa_sal(all_branches),
-        "description": SHINSAL_RULES["도화살"]["description"],
-        "effect": SHINSAL_RULES["도화살"]["effect"]
-    }
-    
-    # 화개살
-    shinsal_results["화개살"] = {
-        "present": check_hwagae_sal(all_branches),
-        "description": SHINSAL_RULES["화개살"]["description"],
-        "effect": SHINSAL_RULES["화개살"]["effect"]
-    }
-    
-    # 문창귀인
-    shinsal_results["문창귀인"] = {
-        "present": check_munchang_gwiin(day_stem),
-        "description": SHINSAL_RULES["문창귀인"]["description"],
-        "effect": SHINSAL_RULES["문창귀인"]["effect"]
-    }
-    
-    # 천덕귀인
-    shinsal_results["천덕귀인"] = {
-        "present": check_cheondeok_gwiin(day_stem, month_branch),
-        "description": SHINSAL_RULES["천덕귀인"]["description"],
-        "effect": SHINSAL_RULES["천덕귀인"]["effect"]
-    }
-    
-    return shinsal_results
+    rules = get_shinsal_rules()
+    return rules.render(rules.evaluate(pillar_component_indices(pillars)))
 
 def get_shinsal_summary(shinsal_results: Dict[str, Any]) -> Dict[str, Any]:
     """
     신살 분석 결과를 요약하여 반환
-    
+
     Args:
         shinsal_results: analyze_all_shinsal 결과
-        
+
     Returns:
         {
             "active_shinsal": ["역마살", "화개살"],
@@ -164,12 +275,12 @@ def get_shinsal_summary(shinsal_results: Dict[str, Any]) -> Dict[str, Any]:
     """
     active_shinsal = []
     effects = []
-    
+
     for shinsal_name, result in shinsal_results.items():
         if result["present"]:
             active_shinsal.append(shinsal_name)
             effects.append(result["effect"])
-    
+
     # 요약 생성
     if not active_shinsal:
         summary = "특별한 신살은 없지만, 안정적이고 균형잡힌 성향을 가지고 있습니다"
@@ -177,10 +288,9 @@ def get_shinsal_summary(shinsal_results: Dict[str, Any]) -> Dict[str, Any]:
         summary = " ".join(effects[:2])  # 최대 2개까지만 요약에 포함
         if len(effects) > 2:
             summary += f" 등 총 {len(active_shinsal)}가지 특별한 성향을 가지고 있습니다"
-    
+
     return {
         "active_shinsal": active_shinsal,
         "total_count": len(active_shinsal),
         "summary": summary
     }
-
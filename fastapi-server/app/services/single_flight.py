@@ -0,0 +1,107 @@
+"""
+동일 요청 병합(single-flight) 서비스
+같은 입력으로 동시에 들어온 계산을 하나만 실행하고 결과(또는 예외)를 함께 기다리던 요청들에 공유
+푸시 알림 직후처럼 같은 날짜 조회가 한꺼번에 몰릴 때 중복 계산을 없앰
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Hashable
+
+from starlette.concurrency import run_in_threadpool
+
+from app.services.event_log import mark, record_stage
+
+# 다른 요청의 계산 결과를 기다리는 최대 시간 (초), 초과하면 직접 계산
+DEFAULT_WAIT_TIMEOUT = float(os.environ.get("PAWSTARS_COALESCE_TIMEOUT", "2"))
+
+class SingleFlight:
+    """
+    키별 진행 중 계산 병합기 (이벤트 루프 하나 안에서 사용)
+
+    - 첫 요청(리더)이 스레드풀에서 계산을 실행하고, 같은 키의 후속 요청은 그 결과를 기다림
+    - 리더의 예외는 기다리던 요청에도 그대로 전달됨
+    - 결과는 계산이 끝나면 바로 버림 (캐시가 아님)
+    """
+
+    def __init__(self, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
+        self.wait_timeout = wait_timeout
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def run(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        key가 같은 진행 중 계산이 있으면 그 결과를 공유하고, 없으면 fn(*args, **kwargs)를 실행
+
+        Args:
+            key: 정규화된 입력으로 만든 키 (예: ("pillars", "2024-01-01"))
+            fn: 스레드풀에서 실행할 동기 함수
+
+        Returns:
+            fn의 결과 (병합된 요청끼리는 같은 객체를 공유하므로 수정하지 말 것)
+        """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                return await self._lead(key, fn, *args, **kwargs)
+
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+            except asyncio.TimeoutError:
+                # 리더가 너무 오래 걸리면 기다림을 멈추고 직접 계산
+                self.timeouts += 1
+                return await run_in_threadpool(fn, *args, **kwargs)
+            except asyncio.CancelledError:
+                # 리더 요청이 취소된 경우 새 리더를 정해 다시 시도 (자신이 취소된 경우는 전파)
+                if future.cancelled():
+                    continue
+                raise
+            self.coalesced += 1
+            mark(coalesced=True)
+            return result
+
+    async def _lead(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.executions += 1
+        started = time.perf_counter()
+        try:
+            result = await run_in_threadpool(fn, *args, **kwargs)
+            record_stage("compute", time.perf_counter() - started)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.errors += 1
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 "예외를 꺼내지 않음" 경고가 나지 않도록 표시
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        병합 카운터 조회
+
+        Returns:
+            {"executions": 실제 실행 수, "coalesced": 결과를 공유받은 요청 수, "timeouts": ..., "errors": ..., "inflight": ...}
+        """
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "inflight": len(self._inflight)
+        }
+
+# 전역 인스턴스 생성
+single_flight = SingleFlight()
@@ -0,0 +1,158 @@
+"""
+만세력 모집단 통계 서비스
+날짜 구간의 오행, 일주, 신살 분포와 오행 x 신살 교차 분포를 년/월 단위로 집계
+만세력 벡터 인덱스와 컴파일된 신살 규칙을 사용해 구간 전체를 한 번에 계산
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.services.event_log import mark
+from app.services.pillars_service import get_pillars_service
+from app.services.shinsal_service import get_shinsal_rules
+from app.utils.mapping_tables import FIVE_ELEMENTS, SEXAGENARY_CYCLE
+
+GROUP_BY_OPTIONS = ("year", "month")
+
+_CACHE_SIZE = 128
+
+class PopulationStatsService:
+
+    def __init__(self):
+        self._cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._masks: Dict[tuple, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _shinsal_masks(self, index, data_version, rules) -> np.ndarray:
+        """
+        만세력 전체 날짜의 신살 비트마스크 (만세력 데이터/규칙 버전별로 한 번 계산)
+        id(index)는 교체로 해제된 인덱스의 주소를 새 인덱스가 재사용할 수 있으므로 키로 쓰지 않음
+        """
+        key = (data_version, rules.version)
+        masks = self._masks.get(key)
+        if masks is None:
+            masks = rules.evaluate_arrays(index.component_arrays())
+            with self._lock:
+                self._masks = {key: masks}
+        return masks
+
+    def get_population_stats(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                             group_by: str = "year", include_pillars: bool = True) -> Dict[str, Any]:
+        """
+        날짜 구간의 오행/일주/신살 분포 집계
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD, 기본값: 데이터 시작)
+            end_date: 종료 날짜 (YYYY-MM-DD, 기본값: 데이터 끝)
+            group_by: "year" 또는 "month"
+            include_pillars: 그룹별 일주(60갑자) 분포 포함 여부
+
+        Returns:
+            {
+                "start_date": ..., "end_date": ..., "group_by": "year", "total": 365,
+                "groups": [{"group": "2023", "count": 365, "elements": {...}, "shinsal": {...},
+                            "element_shinsal": {"수": {"역마살": 12, ...}, ...}, "day_pillars": {...}}]
+            }
+            ("수 또는 역마살" 일수 = elements["수"] + shinsal["역마살"] - element_shinsal["수"]["역마살"])
+        """
+        if group_by not in GROUP_BY_OPTIONS:
+            raise ValueError(f"group_by는 {', '.join(GROUP_BY_OPTIONS)} 중 하나여야 합니다.")
+
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+            end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+        except ValueError:
+            raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+        # 집계 도중 만세력이 교체되어도 한 버전만 사용
+        snapshot = get_pillars_service().snapshot
+        index = snapshot.index
+        rules = get_shinsal_rules()
+        cache_key = (snapshot.data_version, rules.version, start, end, group_by, include_pillars)
+
+        cached = self._cache.get(cache_key)
+        mark(stats_cache_hit=cached is not None)
+        if cached is not None:
+            with self._lock:
+                self._cache.move_to_end(cache_key)
+            return cached
+
+        lo, hi = index.row_range(start, end)
+        result = self._aggregate(index, snapshot.data_version, rules, lo, hi, group_by, include_pillars)
+
+        with self._lock:
+            self._cache[cache_key] = result
+            while len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def _aggregate(self, index, data_version, rules, lo: int, hi: int, group_by: str,
+                   include_pillars: bool) -> Dict[str, Any]:
+        years = index.years[lo:hi].astype(np.int32)
+        keys = years * 100 + index.months[lo:hi] if group_by == "month" else years
+        group_keys, inverse = np.unique(keys, return_inverse=True)
+        group_count = len(group_keys)
+
+        day_codes = index.day_codes[lo:hi].astype(np.int64)
+        counts = np.bincount(inverse, minlength=group_count)
+
+        # 일간 오행 (천간 인덱스 // 2)
+        elements = np.bincount(
+            inverse * 5 + (day_codes % 10) // 2, minlength=group_count * 5
+        ).reshape(group_count, 5)
+
+        # 오행 x 신살 교차 분포: (그룹, 오행, 신살) 칸 번호를 한 번의 bincount로 집계, 신살 분포는 오행 축의 합
+        rule_count = len(rules.names)
+        masks = self._shinsal_masks(index, data_version, rules)[lo:hi]
+        bits = np.arange(rule_count, dtype=np.uint64)
+        present = ((masks[:, None] >> bits) & np.uint64(1)).astype(bool)
+        cells = (inverse * 5 + (day_codes % 10) // 2)[:, None] * rule_count + np.arange(rule_count)
+        joint = np.bincount(
+            cells[present], minlength=group_count * 5 * rule_count
+        ).reshape(group_count, 5, rule_count)
+        shinsal = joint.sum(axis=1)
+
+        pillars = None
+        if include_pillars:
+            pillars = np.bincount(inverse * 60 + day_codes, minlength=group_count * 60).reshape(group_count, 60)
+
+        groups = []
+        for row, key in enumerate(group_keys.tolist()):
+            group = {
+                "group": f"{key // 100}-{key % 100:02d}" if group_by == "month" else str(key),
+                "count": int(counts[row]),
+                "elements": dict(zip(FIVE_ELEMENTS, elements[row].tolist())),
+                "shinsal": dict(zip(rules.names, shinsal[row].tolist())),
+                "element_shinsal": self._crosstab(rules.names, joint[row])
+            }
+            if pillars is not None:
+                group["day_pillars"] = {
+                    SEXAGENARY_CYCLE[code]: count
+                    for code, count in enumerate(pillars[row].tolist()) if count
+                }
+            groups.append(group)
+
+        return {
+            "start_date": str(index.dates[lo]) if hi > lo else "",
+            "end_date": str(index.dates[hi - 1]) if hi > lo else "",
+            "group_by": group_by,
+            "total": int(hi - lo),
+            "elements": dict(zip(FIVE_ELEMENTS, elements.sum(axis=0).tolist())),
+            "shinsal": dict(zip(rules.names, shinsal.sum(axis=0).tolist())),
+            "element_shinsal": self._crosstab(rules.names, joint.sum(axis=0)),
+            "groups": groups
+        }
+
+    @staticmethod
+    def _crosstab(names, table: np.ndarray) -> Dict[str, Dict[str, int]]:
+        return {
+            element: dict(zip(names, counts))
+            for element, counts in zip(FIVE_ELEMENTS, table.tolist())
+        }
+
+# 전역 인스턴스 생성
+stats_service = PopulationStatsService()
@@ -0,0 +1,306 @@
+"""
+요청 추적(tracing) 서비스
+요청마다 라우터 -> 서비스 -> 만세력 조회 -> 간지 파싱 -> 오행/신살 분석 -> 직렬화 단계를 중첩 스팬으로 기록
+
+- 들어온 W3C traceparent 헤더의 trace id와 표본 여부를 이어받고, 없으면 PAWSTARS_TRACE_SAMPLE_RATE 비율로 시작 시 결정
+  (head-based sampling: 표본에서 빠진 요청은 스팬을 만들지 않으므로 비용이 contextvar 조회 한 번)
+- 끝난 요청의 스팬은 크기 제한 큐에 넣고 백그라운드 스레드가 파일(JSON lines) 또는 OTLP/HTTP JSON 수집기로 전송
+- 내보낼 곳(PAWSTARS_TRACE_EXPORT_PATH, PAWSTARS_TRACE_OTLP_ENDPOINT)이 없으면 추적하지 않음
+"""
+
+import functools
+import json
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.event_log import describe_error
+
+TRACE_SAMPLE_RATE = float(os.environ.get("PAWSTARS_TRACE_SAMPLE_RATE", "0.01"))
+TRACE_EXPORT_PATH = os.environ.get("PAWSTARS_TRACE_EXPORT_PATH", "")
+TRACE_OTLP_ENDPOINT = os.environ.get("PAWSTARS_TRACE_OTLP_ENDPOINT", "")
+TRACE_QUEUE_SIZE = int(os.environ.get("PAWSTARS_TRACE_QUEUE_SIZE", "2048"))
+
+SERVICE_NAME = "pawstars-api"
+
+# 한 번에 내보내는 최대 요청(트레이스) 수, OTLP 전송 제한 시간 (초)
+EXPORT_BATCH = 64
+EXPORT_TIMEOUT = 2.0
+
+class Span:
+    """
+    추적 구간 하나 (trace는 같은 요청의 스팬 리스트를 공유)
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes",
+                 "error", "trace")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, trace: List["Span"],
+                 attributes: Dict[str, Any] = None, kind: str = "internal"):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+        self.trace = trace
+        trace.append(self)
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_record(self) -> Dict[str, Any]:
+        end_ns = self.end_ns or time.time_ns()
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": datetime.fromtimestamp(self.start_ns / 1e9, timezone.utc).isoformat(timespec="microseconds"),
+            "duration_ms": round((end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+# 현재 실행 중인 스팬 (스레드풀로 넘어가도 contextvar 복사로 이어짐)
+_current_span: ContextVar[Optional[Span]] = ContextVar("pawstars_current_span", default=None)
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    W3C traceparent 헤더 파싱
+
+    Returns:
+        (trace_id, parent_span_id, sampled) 또는 형식이 잘못되었으면 None
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    trace_id, span_id, flags = parts[1].lower(), parts[2].lower(), parts[3]
+    try:
+        int(trace_id, 16), int(span_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if len(trace_id) != 32 or len(span_id) != 16 or trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id, sampled
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    현재 스팬의 자식 스팬 (표본 추출된 요청이 아니면 아무 일도 하지 않음)
+
+    사용 예시:
+        with span("shinsal", rules=12):
+            ...
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(parent.trace_id, parent.span_id, name, parent.trace, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = describe_error(e)
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+def traced(name: str):
+    """
+    함수 전체를 스팬으로 기록하는 데코레이터 (표본 추출되지 않은 요청은 바로 원래 함수 호출)
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def otlp_payload(traces: List[List[Span]]) -> Dict[str, Any]:
+    """
+    OTLP/HTTP JSON 요청 본문 (ExportTraceServiceRequest)
+    """
+    kinds = {"internal": 1, "server": 2}
+    spans = []
+    for trace in traces:
+        for item in trace:
+            otlp_span = {
+                "traceId": item.trace_id,
+                "spanId": item.span_id,
+                "name": item.name,
+                "kind": kinds.get(item.kind, 1),
+                "startTimeUnixNano": str(item.start_ns),
+                "endTimeUnixNano": str(item.end_ns or item.start_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in item.attributes.items()],
+                "status": {"code": 2, "message": item.error} if item.error else {"code": 1}
+            }
+            if item.parent_id:
+                otlp_span["parentSpanId"] = item.parent_id
+            spans.append(otlp_span)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "pawstars"}, "spans": spans}]
+        }]
+    }
+
+class Tracer:
+    """
+    요청 루트 스팬 생성, 표본 추출, 백그라운드 내보내기
+    """
+
+    def __init__(self, sample_rate: float = TRACE_SAMPLE_RATE, export_path: str = TRACE_EXPORT_PATH,
+                 otlp_endpoint: str = TRACE_OTLP_ENDPOINT, capacity: int = TRACE_QUEUE_SIZE):
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.export_path = export_path
+        self.otlp_endpoint = otlp_endpoint
+        self.enabled = bool(export_path or otlp_endpoint)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=capacity)
+        self._exporter: Optional[threading.Thread] = None
+        self._exporter_lock = threading.Lock()
+
+        self.started = 0
+        self.exported = 0
+        self.dropped = 0
+        self.export_errors = 0
+
+    def start_request(self, name: str, traceparent: Optional[str] = None,
+                      attributes: Dict[str, Any] = None) -> Optional[Tuple[Span, Any]]:
+        """
+        요청 루트 스팬 시작 (표본에서 빠지면 None)
+
+        Returns:
+            (루트 스팬, contextvar 토큰) 또는 None
+        """
+        if not self.enabled:
+            return None
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id, sampled = None, None, random.random() < self.sample_rate
+        if not sampled:
+            return None
+
+        root = Span(trace_id or secrets.token_hex(16), parent_id, name, [], attributes, kind="server")
+        self.started += 1
+        return root, _current_span.set(root)
+
+    def finish_request(self, started: Tuple[Span, Any], error: Optional[str] = None):
+        """
+        루트 스팬을 끝내고 요청의 스팬 전체를 내보내기 큐에 넣음 (가득 차면 버림)
+        """
+        root, token = started
+        root.end_ns = time.time_ns()
+        root.error = error
+        _current_span.reset(token)
+        if self._exporter is None:
+            self._start_exporter()
+        try:
+            self._queue.put_nowait(root.trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start_exporter(self):
+        with self._exporter_lock:
+            if self._exporter is None:
+                self._exporter = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._exporter.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < EXPORT_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._export(batch)
+                self.exported += len(batch)
+            except Exception:
+                self.export_errors += len(batch)
+
+    def _export(self, traces: List[List[Span]]):
+        if self.export_path:
+            lines = [json.dumps(item.to_record(), ensure_ascii=False, default=str)
+                     for trace in traces for item in trace]
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        if self.otlp_endpoint:
+            request = urllib.request.Request(
+                self.otlp_endpoint,
+                data=json.dumps(otlp_payload(traces), default=str).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                method="POST"
+            )
+            with urllib.request.urlopen(request, timeout=EXPORT_TIMEOUT) as response:
+                response.read()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """
+        큐에 들어간 트레이스를 모두 내보낼 때까지 대기 (종료 시 사용)
+        """
+        deadline = time.monotonic() + timeout
+        while self.exported + self.export_errors + self.dropped < self.started:
+            if self._exporter is None or not self._exporter.is_alive() or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        추적 상태
+
+        Returns:
+            {"enabled", "sample_rate", "started", "exported", "dropped", "export_errors", "queued"}
+        """
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "started": self.started,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "export_errors": self.export_errors,
+            "queued": self._queue.qsize()
+        }
+
+# 전역 인스턴스 생성
+tracer = Tracer()
@@ -0,0 +1,37 @@
+"""
+실행 중에 쓰는 데이터 파일 경로
+등록부처럼 바뀌는 파일은 패키지 디렉터리(배포 환경에서는 읽기 전용) 밖에 둠
+"""
+
+import os
+
+# 기본 데이터 디렉터리: PAWSTARS_DATA_DIR, 없으면 $XDG_DATA_HOME/pawstars (기본 ~/.local/share/pawstars)
+DATA_DIR_ENV = "PAWSTARS_DATA_DIR"
+
+def runtime_data_dir() -> str:
+    """
+    쓰기용 데이터 디렉터리 (만들지는 않음, 처음 쓰는 쪽에서 생성)
+    """
+    configured = os.environ.get(DATA_DIR_ENV)
+    if configured:
+        return configured
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data_home, "pawstars")
+
+def runtime_data_path(*parts: str) -> str:
+    """
+    데이터 디렉터리 아래 경로
+    """
+    return os.path.join(runtime_data_dir(), *parts)
+
+class DataPathError(RuntimeError):
+    """쓰기용 데이터 경로를 만들거나 열 수 없음 (읽기 전용 배포 환경 등)"""
+
+def unwritable_path_error(path: str, setting: str, error: BaseException) -> DataPathError:
+    """
+    데이터 경로를 쓸 수 없을 때의 오류 (어떤 환경변수로 바꿀 수 있는지 안내)
+    """
+    return DataPathError(
+        f"데이터 경로에 쓸 수 없습니다: {path} ({error}). "
+        f"{setting} 또는 {DATA_DIR_ENV} 환경변수로 쓰기 가능한 경로를 지정하세요."
+    )
@@ -6,6 +6,10 @@
 import re
 from typing import Dict, Optional
 
+from app.utils.mapping_tables import (
+    SEXAGENARY_CYCLE, SEXAGENARY_CODES, STEM_HANJA, BRANCH_HANJA, STEM_KOREAN, BRANCH_KOREAN
+)
+
 def parse_solar_ganzi(ganzi_str: str) -> Dict[str, str]:
     """
     간지 문자열을 파싱하여 년주, 월주, 일주를 추출
@@ -95,7 +99,7 @@ def get_day_stem(pillars: Dict[str, str]) -> str:
 
 def get_all_branches(pillars: Dict[str, str]) -> list:
     """
-    모든 지지를 리스트로 반환 (신살 판정용)
+    모든 지지를 리스트로 반환 (신살 판정용, 시주가 있으면 시지 포함)
     
     Args:
         pillars: {"year": "乙未", "month": "戊子", "day": "癸丑"}
@@ -105,8 +109,85 @@ def get_all_branches(pillars: Dict[str, str]) -> list:
     """
     stems_branches = extract_stems_and_branches(pillars)
     return [
-        stems_branches["year"]["branch"],
-        stems_branches["month"]["branch"],
-        stems_branches["day"]["branch"]
+        stems_branches[pillar_type]["branch"]
+        for pillar_type in ("year", "month", "day", "hour")
+        if pillar_type in stems_branches
     ]
 
+
+def ganzi_to_code(ganzi: str) -> int:
+    """
+    간지를 육십갑자 코드(0~59)로 변환
+    
+    Args:
+        ganzi: "甲子" 형식의 간지
+        
+    Returns:
+        육십갑자 코드 (예: "甲子" -> 0, "癸亥" -> 59)
+    """
+    code = SEXAGENARY_CODES.get(ganzi)
+    if code is None:
+        raise ValueError(f"Invalid ganzi: {ganzi}")
+    return code
+
+def code_to_ganzi(code: int) -> str:
+    """
+    육십갑자 코드(0~59)를 간지 문자열로 변환
+    
+    Args:
+        code: 육십갑자 코드
+        
+    Returns:
+        "甲子" 형식의 간지
+    """
+    if not 0 <= code < 60:
+        raise ValueError(f"Invalid sexagenary code: {code}")
+    return SEXAGENARY_CYCLE[code]
+
+def pillars_to_codes(pillars: Dict[str, str]) -> Dict[str, int]:
+    """
+    삼주 간지를 육십갑자 코드로 변환
+    
+    Args:
+        pillars: {"year": "乙未", "month": "戊子", "day": "癸丑"}
+        
+    Returns:
+        {"year": 31, "month": 24, "day": 49}
+    """
+    return {pillar_type: ganzi_to_code(ganzi) for pillar_type, ganzi in pillars.items()}
+
+def codes_to_pillars(codes: Dict[str, int]) -> Dict[str, str]:
+    """
+    육십갑자 코드를 삼주 간지로 변환 (pillars_to_codes의 역변환)
+    """
+    return {pillar_type: code_to_ganzi(code) for pillar_type, code in codes.items()}
+
+def stem_index(value: str) -> int:
+    """
+    천간을 인덱스(0~9)로 변환 (한자 "甲" 또는 한글 "갑")
+    """
+    for names in (STEM_HANJA, STEM_KOREAN):
+        if len(value) == 1 and value in names:
+            return names.index(value)
+    raise ValueError(f"Invalid heavenly stem: {value}")
+
+def branch_index(value: str) -> int:
+    """
+    지지를 인덱스(0~11)로 변환 (한자 "子" 또는 한글 "자")
+    """
+    for names in (BRANCH_HANJA, BRANCH_KOREAN):
+        if len(value) == 1 and value in names:
+            return names.index(value)
+    raise ValueError(f"Invalid earthly branch: {value}")
+
+def parse_ganzi_code(value: str) -> int:
+    """
+    한자 또는 한글 간지를 육십갑자 코드로 변환 ("甲子", "갑자" -> 0)
+    """
+    if len(value) != 2:
+        raise ValueError(f"Invalid ganzi: {value}")
+    stem, branch = stem_index(value[0]), branch_index(value[1])
+    if stem % 2 != branch % 2:
+        raise ValueError(f"Invalid ganzi: {value}")
+    # 천간 s, 지지 b를 동시에 만족하는 코드 (6s - 5b) mod 60
+    return (6 * stem - 5 * branch) % 60
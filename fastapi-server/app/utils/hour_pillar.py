@@ -0,0 +1,78 @@
+"""
+시주(時柱) 계산 유틸리티
+만세력 테이블 없이 일간과 2시간 단위 시지(時支)로 시주를 산술 계산
+"""
+
+import os
+from datetime import datetime
+from typing import Tuple
+
+# 자시(子時) 23:00~00:59 중 23시대(야자시) 처리 방식
+#   next_day: 23시부터 다음 날로 보고 일주도 다음 날 일주 사용 (기본값)
+#   same_day: 일주는 당일 그대로 두고 시간만 다음 날 일간 기준의 자시로 계산 (야자시/조자시 구분)
+ZASI_MODES = ("next_day", "same_day")
+DEFAULT_ZASI_MODE = os.environ.get("PAWSTARS_ZASI_MODE", "next_day")
+
+# 표준시와 지방시 차이 보정 (분), 한국 표준시(135°E) 기준 서울 경도 보정 시 30
+DEFAULT_HOUR_OFFSET_MINUTES = int(os.environ.get("PAWSTARS_HOUR_OFFSET_MINUTES", "0"))
+
+def parse_birth_time(birth_time: str) -> Tuple[int, int]:
+    """
+    "HH:MM" 형식의 출생 시각 파싱
+
+    Returns:
+        (시, 분)
+    """
+    try:
+        parsed = datetime.strptime(birth_time, "%H:%M")
+    except (TypeError, ValueError):
+        raise ValueError("출생 시각은 HH:MM 형식이어야 합니다.")
+    return parsed.hour, parsed.minute
+
+def hour_branch_index(hour: int) -> int:
+    """
+    시각(0~23시)의 시지 인덱스 (자=0 ... 해=11), 자시는 23:00~00:59
+    """
+    return ((hour + 1) // 2) % 12
+
+def resolve_hour_pillar(day_code: int, hour: int, minute: int = 0, zasi_mode: str = None,
+                        offset_minutes: int = None) -> Tuple[int, int]:
+    """
+    출생일 일주 코드와 출생 시각으로 시주 코드 계산
+
+    시간(時干)은 일간에서 정해짐 (갑기일 갑자시, 을경일 병자시, 병신일 무자시, 정임일 경자시, 무계일 임자시)
+    즉 시간 인덱스 = (일간 인덱스 % 5) * 2 + 시지 인덱스
+
+    Args:
+        day_code: 출생 날짜(양력)의 일주 육십갑자 코드
+        hour: 시 (0~23)
+        minute: 분
+        zasi_mode: 야자시 처리 방식 (ZASI_MODES, 기본값: PAWSTARS_ZASI_MODE)
+        offset_minutes: 지방시 보정 (분, 기본값: PAWSTARS_HOUR_OFFSET_MINUTES)
+
+    Returns:
+        (일주 보정 일수, 시주 육십갑자 코드)
+        일주 보정 일수가 0이 아니면 출생일 대신 그만큼 이동한 날짜의 삼주를 사용해야 함
+    """
+    zasi_mode = zasi_mode or DEFAULT_ZASI_MODE
+    if zasi_mode not in ZASI_MODES:
+        raise ValueError(f"Unknown zasi mode: {zasi_mode}")
+    if offset_minutes is None:
+        offset_minutes = DEFAULT_HOUR_OFFSET_MINUTES
+
+    # 지방시 보정 후 날짜가 바뀔 수 있음 (예: 보정 30분, 00:10 -> 전날 23:40)
+    day_offset, local_minutes = divmod(hour * 60 + minute - offset_minutes, 24 * 60)
+    local_hour = local_minutes // 60
+
+    branch = hour_branch_index(local_hour)
+    stem_day_code = day_code + day_offset
+
+    if local_hour == 23:
+        # 야자시: 시간은 항상 다음 날 일간 기준, 일주 이동은 모드에 따라 결정
+        stem_day_code += 1
+        if zasi_mode == "next_day":
+            day_offset += 1
+
+    stem = ((stem_day_code % 10) % 5 * 2 + branch) % 10
+    # 천간 인덱스 s, 지지 인덱스 b 인 육십갑자 코드는 (6s - 5b) mod 60
+    return day_offset, (6 * stem - 5 * branch) % 60
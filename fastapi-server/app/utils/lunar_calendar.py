@@ -0,0 +1,124 @@
+"""
+음력 <-> 양력 변환 유틸리티
+연도별 비트필드 테이블(lunar_table.py) 하나로 변환하며, 날짜별 음력 컬럼을 메모리에 두지 않음
+연도 찾기와 달 찾기 모두 반복 횟수가 일정한 상수 시간 계산
+"""
+
+import re
+from datetime import date
+from typing import Tuple
+
+from app.utils.lunar_table import LUNAR_BASE_YEAR, LUNAR_EPOCH_ORDINAL, LUNAR_YEAR_INFO
+
+CALENDAR_TYPES = ("solar", "lunar")
+
+LUNAR_MIN_YEAR = LUNAR_BASE_YEAR
+LUNAR_MAX_YEAR = LUNAR_BASE_YEAR + len(LUNAR_YEAR_INFO) - 1
+
+_DATE_PATTERN = re.compile(r"^\s*(\d{4})-(\d{1,2})-(\d{1,2})\s*$")
+
+def _year_info(year: int) -> int:
+    if not LUNAR_MIN_YEAR <= year <= LUNAR_MAX_YEAR:
+        raise ValueError(f"음력 변환은 {LUNAR_MIN_YEAR}~{LUNAR_MAX_YEAR}년만 지원합니다.")
+    return LUNAR_YEAR_INFO[year - LUNAR_BASE_YEAR]
+
+def _new_year_ordinal(info: int) -> int:
+    return LUNAR_EPOCH_ORDINAL + (info >> 17)
+
+def _days_before(info: int, position: int) -> int:
+    # 앞선 달 수 * 29 + 그중 큰달 수
+    return 29 * position + (info & ((1 << position) - 1)).bit_count()
+
+def leap_month_of(year: int) -> int:
+    """
+    해당 음력 연도의 윤달 (없으면 0)
+    """
+    return (_year_info(year) >> 13) & 0xF
+
+def parse_date_parts(text: str) -> Tuple[int, int, int]:
+    """
+    "YYYY-MM-DD" 문자열을 (연, 월, 일)로 분리 (음력 2월 30일처럼 양력에 없는 날짜도 허용)
+    """
+    match = _DATE_PATTERN.match(text or "")
+    if not match:
+        raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+    return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+def lunar_to_solar(year: int, month: int, day: int, is_leap_month: bool = False) -> date:
+    """
+    음력 날짜를 양력 날짜로 변환
+
+    Args:
+        year, month, day: 음력 연, 월, 일
+        is_leap_month: 윤달 여부
+
+    Raises:
+        ValueError: 지원 범위를 벗어났거나 존재하지 않는 음력 날짜
+    """
+    info = _year_info(year)
+    leap_month = (info >> 13) & 0xF
+    if not 1 <= month <= 12:
+        raise ValueError("음력 월은 1~12 사이여야 합니다.")
+    if is_leap_month and month != leap_month:
+        raise ValueError(f"음력 {year}년에는 윤{month}월이 없습니다.")
+
+    # 윤달은 같은 숫자의 평달 바로 다음 자리
+    position = month - 1
+    if leap_month and (month > leap_month or is_leap_month):
+        position += 1
+
+    length = 29 + ((info >> position) & 1)
+    if not 1 <= day <= length:
+        raise ValueError(f"음력 {year}년 {'윤' if is_leap_month else ''}{month}월은 {length}일까지입니다.")
+
+    return date.fromordinal(_new_year_ordinal(info) + _days_before(info, position) + day - 1)
+
+def solar_to_lunar(solar_day: date) -> Tuple[int, int, int, bool]:
+    """
+    양력 날짜를 음력 날짜로 변환
+
+    Returns:
+        (음력 연, 월, 일, 윤달 여부)
+
+    Raises:
+        ValueError: 지원 범위를 벗어난 날짜
+    """
+    ordinal = solar_day.toordinal()
+    year = solar_day.year
+    # 양력 연도와 같은 음력 연도의 설날 이전이면 전년도
+    if year > LUNAR_MAX_YEAR or (LUNAR_MIN_YEAR <= year and ordinal < _new_year_ordinal(_year_info(year))):
+        year -= 1
+    info = _year_info(year)
+
+    offset = ordinal - _new_year_ordinal(info)
+    leap_month = (info >> 13) & 0xF
+    month_count = 13 if leap_month else 12
+    if offset < 0 or offset >= _days_before(info, month_count):
+        raise ValueError(f"음력 변환은 {LUNAR_MIN_YEAR}~{LUNAR_MAX_YEAR}년만 지원합니다.")
+
+    # 달 길이가 29~30일이므로 offset // 30은 실제 위치와 최대 한 달 차이
+    position = offset // 30
+    if position + 1 < month_count and _days_before(info, position + 1) <= offset:
+        position += 1
+
+    day = offset - _days_before(info, position) + 1
+    if leap_month and position == leap_month:
+        return year, leap_month, day, True
+    month = position if leap_month and position > leap_month else position + 1
+    return year, month, day, False
+
+def resolve_calendar_date(text: str, calendar_type: str = "solar", is_leap_month: bool = False) -> date:
+    """
+    양력/음력 날짜 문자열을 양력 날짜로 변환
+
+    Raises:
+        ValueError: 형식 오류, 존재하지 않는 날짜, 지원 범위 밖
+    """
+    if calendar_type not in CALENDAR_TYPES:
+        raise ValueError("달력 종류는 solar 또는 lunar이어야 합니다.")
+    year, month, day = parse_date_parts(text)
+    if calendar_type == "lunar":
+        return lunar_to_solar(year, month, day, is_leap_month)
+    if is_leap_month:
+        raise ValueError("윤달은 음력 날짜에만 지정할 수 있습니다.")
+    return date(year, month, day)
@@ -0,0 +1,34 @@
+"""
+음력 연도별 변환 테이블 (generate_lunar_table.py로 생성, 직접 수정하지 말 것)
+한국천문연구원 음양력 기준
+
+연도 하나를 정수 하나로 표현
+- 0~12비트: 해당 해의 달(윤달 포함, 순서대로)이 큰달(30일)이면 1, 작은달(29일)이면 0
+- 13~16비트: 윤달이 드는 달 (0이면 윤달 없음)
+- 17비트~: 음력 1월 1일의 양력 날짜 (LUNAR_EPOCH_ORDINAL로부터의 일수)
+"""
+
+LUNAR_BASE_YEAR = 1900
+LUNAR_EPOCH_ORDINAL = 693596  # date(1900, 1, 1).toordinal()
+
+LUNAR_YEAR_INFO = (
+    0x0003d16d2, 0x0033c0752, 0x006000ea5, 0x008c6b64a, 0x00bc4064b, 0x00e880a9b, 0x0114e9556, 0x0144e056a,  # 1900
+    0x017120b59, 0x019d85752, 0x01cd80752, 0x01f9cdb25, 0x0229c0b25, 0x025600a4b, 0x02824b29b, 0x02b240aad,  # 1908
+    0x02dea056a, 0x030ae4b69, 0x033ae0ba9, 0x03674fb52, 0x039740d92, 0x03c380d25, 0x03efcba4d, 0x041fc0956,  # 1916
+    0x044c002b5, 0x0478495ad, 0x04a8606d4, 0x04d4a0da9, 0x050105d92, 0x053100e92, 0x055d4cd26, 0x058d20527,  # 1924
+    0x05b960a57, 0x05e5cb2b6, 0x0615c0ada, 0x0642206d4, 0x066e66ea9, 0x069e60749, 0x06caaf693, 0x06faa0a93,  # 1932
+    0x0726e052b, 0x07532ca5b, 0x07832096d, 0x07af80b6a, 0x07dbe9b54, 0x080be0ba4, 0x083820b49, 0x086465a93,  # 1940
+    0x089460a95, 0x08c0af52b, 0x08f0a052d, 0x091ce0aad, 0x09494b56a, 0x097940db2, 0x09a5a0da4, 0x09d1e7d49,  # 1948
+    0x0a01e0d4a, 0x0a2e31a95, 0x0a5e20a96, 0x0a8a60556, 0x0ab6acab5, 0x0ae6a0ad5, 0x0b13006d2, 0x0b3f48ea5,  # 1956
+    0x0b6f40ea5, 0x0b9ba0e4a, 0x0bc7e6c96, 0x0bf7c0a9b, 0x0c242f556, 0x0c542056a, 0x0c8060b59, 0x0caccb752,  # 1964
+    0x0cdcc0752, 0x0d0900725, 0x0d354964b, 0x0d6540a4b, 0x0d91912ab, 0x0dc1802ad, 0x0dedc056b, 0x0e1a2cb69,  # 1972
+    0x0e4a20da9, 0x0e7680d92, 0x0ea2c9b25, 0x0ed2c0d25, 0x0eff15a4d, 0x0f2f00a56, 0x0f5b402b6, 0x0f878d5ad,  # 1980
+    0x0fb7a06d4, 0x0fe3e0da9, 0x10104bd92, 0x104040e92, 0x106c80d26, 0x1098c6a56, 0x10c8a0a57, 0x10f5112b6,  # 1988
+    0x112500b5a, 0x1151606d4, 0x117daaec9, 0x11ada0749, 0x11d9e0693, 0x120629527, 0x12362052b, 0x126260a5b,  # 1996
+    0x128ec555a, 0x12bec036a, 0x12eb0fb55, 0x131b20ba4, 0x134760b49, 0x1373aba93, 0x13a3a0a95, 0x13cfe052d,  # 2004
+    0x13fc26a5d, 0x142c20aad, 0x1458935aa, 0x1488805d2, 0x14b4c0da5, 0x14e12bd4a, 0x151120d4a, 0x153d60a95,  # 2012
+    0x1569a952d, 0x1599a0556, 0x15c5e0ab5, 0x15f2455aa, 0x1622406d2, 0x164e8cea5, 0x167e80ea5, 0x16aae0e4a,  # 2020
+    0x16d72ac96, 0x170700c9b, 0x17336055a, 0x175fa6ad5, 0x178fa0b69, 0x17bc17752, 0x17ec00752, 0x181840b25,  # 2028
+    0x18448d64b, 0x187480a4b, 0x18a0c04ab, 0x18cd0a55b, 0x18fd0056d, 0x192960b69, 0x1955c5b52, 0x1985c0d92,  # 2036
+    0x19b20fd25, 0x19e200d25, 0x1a0e40a4d, 0x1a3a8b4ad, 0x1a6a802b6, 0x1a96c05b5,  # 2044
+)
@@ -81,37 +81,43 @@ BREED_TRAITS = {
     "믹스": "다양한 성향이 조화된 독특한 매력"
 }
 
-# 신살 판정 규칙
-SHINSAL_RULES = {
-    "역마살": {
-        "description": "이동과 변화를 좋아하는 성향",
-        "branches": ["인", "신", "사", "해"],
-        "effect": "활동적이고 변화를 추구하며, 여행이나 산책을 특히 좋아합니다"
-    },
-    "도화살": {
-        "description": "매력적이고 사교적인 성향",
-        "branches": ["자", "오", "묘", "유"],
-        "effect": "사람들에게 인기가 많고 사교적이며, 관심받는 것을 좋아합니다"
-    },
-    "화개살": {
-        "description": "예술적이고 독특한 성향",
-        "branches": ["진", "술", "축", "미"],
-        "effect": "독특한 매력이 있고 예술적 감각이 뛰어나며, 혼자만의 시간도 즐깁니다"
+# 신살 판정 규칙은 app/rules/shinsal_rules.json 에 선언 (shinsal_service에서 컴파일)
+
+# 일일 운세 메시지 (운세 코드 순서: 0 = 평온, 1 = 일간 일치)
+DAILY_FORTUNE_MESSAGES = [
+    "평온하고 안정적인 하루를 보낼 수 있을 것 같아요. 😊",
+    "오늘은 특히 컨디션이 좋고 활발한 하루가 될 것 같아요! 🌟"
+]
+
+# 천간/지지 한자 및 한글 순서 (육십갑자 코드 계산용)
+STEM_HANJA = "甲乙丙丁戊己庚辛壬癸"
+BRANCH_HANJA = "子丑寅卯辰巳午未申酉戌亥"
+STEM_KOREAN = "갑을병정무기경신임계"
+BRANCH_KOREAN = "자축인묘진사오미신유술해"
+
+# 육십갑자: 코드(0~59) <-> 간지 문자열 ("甲子" = 0, "乙丑" = 1, ...)
+SEXAGENARY_CYCLE = [STEM_HANJA[i % 10] + BRANCH_HANJA[i % 12] for i in range(60)]
+SEXAGENARY_CODES = {ganzi: code for code, ganzi in enumerate(SEXAGENARY_CYCLE)}
+
+# 오행 코드 순서 (천간 인덱스 // 2 와 일치)
+FIVE_ELEMENTS = ["목", "화", "토", "금", "수"]
+
+# 견종 ID (BREED_TRAITS 선언 순서 기준, 프로필 토큰 등 압축 표현용)
+BREED_IDS = {breed: breed_id for breed_id, breed in enumerate(BREED_TRAITS)}
+BREED_NAMES = list(BREED_TRAITS)
+
+# 좋은 날 찾기 목적별 가산점 (그날 일지 기준, 지지 인덱스 -> 점수)
+AUSPICIOUS_PURPOSES = {
+    "grooming": {
+        "label": "미용",
+        "branch_bonus": {"자": 2, "오": 2, "묘": 2, "유": 2}  # 도화 기운이 있는 날
     },
-    "문창귀인": {
-        "description": "학습능력이 뛰어난 성향",
-        "stems": ["갑", "을", "병", "정"],
-        "effect": "훈련을 잘 받아들이고 학습능력이 뛰어나며, 새로운 것을 배우는 것을 좋아합니다"
+    "travel": {
+        "label": "여행",
+        "branch_bonus": {"인": 2, "신": 2, "사": 2, "해": 2}  # 역마 기운이 있는 날
     },
-    "천덕귀인": {
-        "description": "복이 많고 건강한 성향",
-        "monthly_stems": {
-            "인": ["정", "기"], "묘": ["갑", "무"], "진": ["을", "기"],
-            "사": ["병", "경"], "오": ["정", "기"], "미": ["갑", "무"],
-            "신": ["을", "기"], "유": ["병", "경"], "술": ["정", "기"],
-            "해": ["갑", "무"], "자": ["을", "기"], "축": ["병", "경"]
-        },
-        "effect": "건강하고 복이 많으며, 위험한 상황을 잘 피하는 경향이 있습니다"
+    "vet": {
+        "label": "병원",
+        "branch_bonus": {"진": 2, "술": 2, "축": 2, "미": 2}  # 토 기운으로 안정적인 날
     }
 }
-
@@ -0,0 +1,100 @@
+"""
+반려견 프로필 토큰 유틸리티
+분석이 끝난 삼주 코드, 오행, 견종 ID를 몇 바이트로 압축하고 HMAC으로 서명
+토큰만 있으면 만세력 조회와 간지 파싱 없이 운세/궁합 분석을 수행할 수 있음
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import secrets
+import struct
+from typing import Dict
+
+# 토큰 포맷 버전 (포맷이 바뀌면 증가시켜 이전 토큰을 거부)
+TOKEN_VERSION = 2
+
+# 버전, 년주, 월주, 일주, 시주(없으면 0xFF), 오행, 견종 ID (각 1바이트) + 만세력 데이터 버전 (4바이트)
+_PAYLOAD_FORMAT = ">BBBBBBBI"
+_NO_HOUR = 0xFF
+_PAYLOAD_SIZE = struct.calcsize(_PAYLOAD_FORMAT)
+_SIGNATURE_SIZE = 8
+
+# 서명 키: 여러 워커가 같은 토큰을 검증하려면 PAWSTARS_TOKEN_SECRET 환경변수를 설정해야 함
+_SECRET = os.environ.get("PAWSTARS_TOKEN_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+class InvalidProfileTokenError(ValueError):
+    """위조, 손상 또는 만료(만세력 버전 변경)된 프로필 토큰"""
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_SECRET, payload, hashlib.sha256).digest()[:_SIGNATURE_SIZE]
+
+def encode_profile_token(codes: Dict[str, int], element: int, breed_id: int, data_version: int) -> str:
+    """
+    프로필 토큰 생성
+
+    Args:
+        codes: 삼주 육십갑자 코드 {"year": 37, "month": 35, "day": 19} (시주가 있으면 "hour" 포함)
+        element: 오행 코드 (FIVE_ELEMENTS 인덱스)
+        breed_id: 견종 ID (BREED_IDS 값)
+        data_version: 만세력 데이터 버전
+
+    Returns:
+        URL-safe base64 토큰 (28자)
+    """
+    payload = struct.pack(
+        _PAYLOAD_FORMAT,
+        TOKEN_VERSION,
+        codes["year"],
+        codes["month"],
+        codes["day"],
+        codes.get("hour", _NO_HOUR),
+        element,
+        breed_id,
+        data_version & 0xFFFFFFFF
+    )
+    return base64.urlsafe_b64encode(payload + _sign(payload)).decode("ascii")
+
+def decode_profile_token(token: str, data_version: int) -> Dict[str, int]:
+    """
+    프로필 토큰 검증 및 복원
+
+    Args:
+        token: encode_profile_token으로 생성한 토큰
+        data_version: 현재 만세력 데이터 버전
+
+    Returns:
+        {"year": 37, "month": 35, "day": 19, "hour": None, "element": 4, "breed_id": 0}
+
+    Raises:
+        InvalidProfileTokenError: 서명 불일치, 포맷 오류, 만세력 버전 불일치
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii"))
+    except (binascii.Error, UnicodeEncodeError, ValueError):
+        raise InvalidProfileTokenError("프로필 토큰 형식이 올바르지 않습니다.")
+
+    if len(raw) != _PAYLOAD_SIZE + _SIGNATURE_SIZE:
+        raise InvalidProfileTokenError("프로필 토큰 형식이 올바르지 않습니다.")
+
+    payload, signature = raw[:_PAYLOAD_SIZE], raw[_PAYLOAD_SIZE:]
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidProfileTokenError("프로필 토큰 서명이 올바르지 않습니다.")
+
+    version, year, month, day, hour, element, breed_id, token_data_version = struct.unpack(_PAYLOAD_FORMAT, payload)
+    if version != TOKEN_VERSION or token_data_version != (data_version & 0xFFFFFFFF):
+        raise InvalidProfileTokenError("만료된 프로필 토큰입니다. 반려견을 다시 등록해주세요.")
+
+    if max(year, month, day) >= 60 or (hour >= 60 and hour != _NO_HOUR) or element >= 5:
+        raise InvalidProfileTokenError("프로필 토큰 형식이 올바르지 않습니다.")
+
+    return {
+        "year": year,
+        "month": month,
+        "day": day,
+        "hour": None if hour == _NO_HOUR else hour,
+        "element": element,
+        "breed_id": breed_id
+    }
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+반려견 등록부 벤치마크
+등록 수가 늘어날 때의 저장 용량과 조회 지연시간을 측정
+
+사용법:
+    python benchmarks/bench_pet_registry.py --checkpoints 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.five_elements import analyze_temperament
+from app.services.pet_registry import PetRegistry
+from app.services.shinsal_service import analyze_all_shinsal, get_shinsal_summary
+from app.utils.ganzi_parser import codes_to_pillars, get_day_stem
+from app.utils.mapping_tables import BREED_NAMES, STEM_HANJA
+
+def make_sample_analyses(count: int, seed: int = 42) -> list:
+    """
+    만세력 없이 무작위 삼주 코드로 등록 레코드 샘플 생성
+    """
+    rng = random.Random(seed)
+    samples = []
+    for i in range(count):
+        codes = {"year": rng.randrange(60), "month": rng.randrange(60), "day": rng.randrange(60)}
+        pillars = codes_to_pillars(codes)
+        breed = rng.choice(BREED_NAMES)
+        temperament = analyze_temperament(get_day_stem(pillars), breed)
+        shinsal_results = analyze_all_shinsal(pillars)
+        analysis = {
+            "name": f"pet-{i}",
+            "breed": breed,
+            "gender": rng.choice(["male", "female"]),
+            "birth_date": f"{rng.randrange(1990, 2025)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "pillars": pillars,
+            "five_element": temperament["five_element"],
+            "temperament": temperament["temperament"],
+            "activity_tip": temperament["activity_tip"],
+            "shinsal": {name: result["present"] for name, result in shinsal_results.items()},
+            "shinsal_details": shinsal_results,
+            "shinsal_summary": get_shinsal_summary(shinsal_results)["summary"],
+            "analysis_date": "2025-01-01T00:00:00",
+            "jeolki": ""
+        }
+        element = STEM_HANJA.index(pillars["day"][0]) // 2
+        samples.append({"analysis": analysis, "codes": codes, "element": element, "data_version": 0})
+    return samples
+
+def file_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def measure(fn, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), percentile(timings, 0.99)
+
+def main():
+    parser = argparse.ArgumentParser(description="반려견 등록부 저장 용량/조회 지연 벤치마크")
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch", type=int, default=10_000, help="save_many 배치 크기")
+    parser.add_argument("--owners", type=int, default=200_000, help="보호자 수")
+    parser.add_argument("--queries", type=int, default=1_000, help="지연시간 측정 쿼리 수")
+    parser.add_argument("--db", help="DB 파일 경로 (기본값: 임시 디렉토리)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="pawstars-bench-"), "registry.sqlite3")
+    registry = PetRegistry(db_path=db_path, pool_size=4)
+    samples = make_sample_analyses(600)
+    rng = random.Random(7)
+
+    print(f"DB: {db_path}")
+    print(f"{'pets':>10} {'insert/s':>10} {'size(MB)':>9} {'B/pet':>7} "
+          f"{'get p50':>8} {'get p99':>8} {'owner p50':>9} {'owner p99':>9} {'day p50':>8} {'page p50':>8}")
+
+    inserted = 0
+    pet_ids = []
+    for checkpoint in sorted(args.checkpoints):
+        segment_start = inserted
+        start = time.perf_counter()
+        while inserted < checkpoint:
+            size = min(args.batch, checkpoint - inserted)
+            records = []
+            for i in range(size):
+                sample = samples[(inserted + i) % len(samples)]
+                records.append({**sample, "owner_id": f"owner-{rng.randrange(args.owners)}"})
+            ids = registry.save_many(records)
+            pet_ids.extend(rng.sample(ids, min(len(ids), 100)))
+            inserted += size
+        insert_rate = (checkpoint - segment_start) / max(time.perf_counter() - start, 1e-9)
+
+        size_bytes = file_size(db_path)
+        get_p50, get_p99 = measure(lambda: registry.get(rng.choice(pet_ids)), args.queries)
+        owner_p50, owner_p99 = measure(
+            lambda: registry.list_by_owner(f"owner-{rng.randrange(args.owners)}"), args.queries
+        )
+
+        def count_day_pillar():
+            with registry._connection() as conn:
+                conn.execute("SELECT COUNT(*) FROM pets WHERE day_code = ?", (rng.randrange(60),)).fetchone()
+
+        day_p50, _ = measure(count_day_pillar, min(args.queries, 100))
+
+        # 일주 일치 키셋 페이지 하나 (등록부 크기와 관계없이 일정해야 함)
+        page_p50, _ = measure(
+            lambda: next(registry.iter_matching_pages("day_pillar", rng.randrange(60), 0, limit=1000), None),
+            min(args.queries, 100)
+        )
+
+        print(f"{checkpoint:>10,} {insert_rate:>10,.0f} "
+              f"{size_bytes / 1e6:>9.1f} {size_bytes / checkpoint:>7.0f} "
+              f"{get_p50:>7.3f}ms {get_p99:>7.3f}ms {owner_p50:>8.3f}ms {owner_p99:>8.3f}ms {day_p50:>7.2f}ms {page_p50:>7.2f}ms")
+
+    registry.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+응답 모델 직렬화 벤치마크
+FastAPI 기본 경로(응답 모델 재검증 + 직렬화 + JSONResponse)와
+검증 생략 경로(model_construct + 공유 하위 객체 + 직접 직렬화)의 요청당 CPU 시간과 메모리 할당을 비교
+
+사용법:
+    python benchmarks/bench_response_models.py --iterations 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.schemas import PetAnalysisResponse
+from app.models.trusted import json_response, trusted_pet_analysis
+from app.services.analysis_pipeline import build_analysis
+from app.utils.ganzi_parser import codes_to_pillars
+
+def make_analysis() -> dict:
+    """
+    만세력 없이 고정 사주로 /pet/register 결과와 같은 형태의 분석 결과 생성
+    """
+    analysis = build_analysis(
+        name="초코",
+        breed="푸들",
+        gender="male",
+        birth_date="2021-12-01",
+        pillars=codes_to_pillars({"year": 37, "month": 35, "day": 19, "hour": 12}),
+        birth_time="10:30"
+    )
+    analysis["profile_token"] = "A" * 28
+    return analysis
+
+def fastapi_default(field, analysis: dict) -> bytes:
+    """
+    response_model이 있는 라우트가 dict를 반환할 때 FastAPI가 수행하는 과정
+    """
+    # is_coroutine=True이면 내부에서 await하지 않으므로 이벤트 루프 없이 한 번에 실행
+    coroutine = serialize_response(field=field, response_content=analysis, is_coroutine=True)
+    try:
+        coroutine.send(None)
+    except StopIteration as result:
+        return JSONResponse(result.value).body
+    raise RuntimeError("serialize_response가 대기 상태가 되었습니다")
+
+def trusted(analysis: dict) -> bytes:
+    return json_response(trusted_pet_analysis(analysis)).body
+
+def measure(name: str, fn, iterations: int):
+    fn()  # 캐시 준비
+
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    cpu_us = (time.process_time() - start) / iterations * 1e6
+
+    # 요청당 할당량: 반복마다 최대 사용량을 초기화하고 한 번 실행했을 때의 최대치
+    tracemalloc.start()
+    samples = []
+    for _ in range(min(iterations, 2000)):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        samples.append(peak - base)
+    tracemalloc.stop()
+    samples.sort()
+
+    print(f"{name:<16} cpu {cpu_us:8.1f} us/req   peak alloc p50 {samples[len(samples) // 2]:7d} B/req")
+    return cpu_us, samples[len(samples) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 모델 직렬화 벤치마크")
+    parser.add_argument("--iterations", type=int, default=20000, help="반복 횟수")
+    args = parser.parse_args()
+
+    analysis = make_analysis()
+    field = create_model_field(name="Response", type_=PetAnalysisResponse, mode="serialization")
+
+    # 두 경로의 출력이 같은지 먼저 확인
+    assert fastapi_default(field, analysis) == trusted(analysis), "직렬화 결과가 다릅니다"
+
+    default_cpu, default_alloc = measure("fastapi default", lambda: fastapi_default(field, analysis), args.iterations)
+    trusted_cpu, trusted_alloc = measure("trusted", lambda: trusted(analysis), args.iterations)
+
+    print("-" * 60)
+    print(f"CPU 절감: {(1 - trusted_cpu / default_cpu) * 100:.0f}%   할당 절감: {(1 - trusted_alloc / max(1, default_alloc)) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
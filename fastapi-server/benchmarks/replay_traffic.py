@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+운영 트래픽 재생 벤치마크
+익명화된 접근 로그(JSONL)를 원래 시간 간격(또는 배속)으로 개방 루프(open-loop)로 재생하여
+라우트별 지연시간 백분위, 오류율, 서버 자원 사용량을 측정 (릴리스 전 용량 산정용)
+
+로그 형식 (한 줄에 하나):
+    {"ts": 1735689600.123, "method": "GET", "path": "/pillars/", "query": "date=2021-12-01", "body": null}
+    - ts: 요청 시각 (epoch 초 또는 ISO 8601), query: 문자열 또는 객체, body: JSON 본문 (없으면 null)
+
+대상:
+    - 기본: 프로세스 내 앱 (httpx ASGITransport, 부하 생성과 앱이 같은 이벤트 루프를 사용하므로 상대 비교용)
+    - --server: 로컬 uvicorn을 띄워 실제 소켓으로 재생 (--server-workers로 워커 수 지정)
+    - --url: 이미 떠 있는 서버 (자원 사용량은 측정하지 않음)
+
+개방 루프: 응답을 기다리지 않고 로그의 시각에 맞춰 요청을 보내므로, 서버가 느려지면 동시 요청이 쌓임
+지연시간은 예정 시각 기준(대기열 포함)과 실제 전송 기준(서비스 시간)을 모두 기록
+
+사용법:
+    python benchmarks/replay_traffic.py --synthesize traffic.jsonl --count 20000 --rate 200
+    python benchmarks/replay_traffic.py traffic.jsonl --speed 2
+    python benchmarks/replay_traffic.py traffic.jsonl --server --server-workers 4 --report report.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+SERVER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_ROOT)
+
+from app.utils.mapping_tables import BREED_NAMES, SEXAGENARY_CYCLE
+
+PERCENTILES = (50, 90, 99)
+
+def load_log(path: str, limit: int = None) -> List[Dict[str, Any]]:
+    """
+    접근 로그를 읽어 첫 요청 기준 오프셋(초) 순으로 정렬
+
+    Returns:
+        [{"offset": 0.0, "method": "GET", "path": "/pillars/", "query": "date=...", "body": None}, ...]
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                ts = entry["ts"]
+                if isinstance(ts, str):
+                    ts = datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+                query = entry.get("query") or ""
+                if isinstance(query, dict):
+                    query = str(httpx.QueryParams(query))
+                records.append({
+                    "ts": float(ts),
+                    "method": entry.get("method", "GET").upper(),
+                    "path": entry["path"],
+                    "query": query.lstrip("?"),
+                    "body": entry.get("body")
+                })
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{line_number} 로그 형식 오류: {e}")
+
+    records.sort(key=lambda record: record["ts"])
+    if limit:
+        records = records[:limit]
+    if records:
+        first = records[0]["ts"]
+        for record in records:
+            record["offset"] = record.pop("ts") - first
+    return records
+
+def synthesize_log(path: str, count: int, rate: float, seed: int = 42):
+    """
+    운영 트래픽과 비슷한 구성의 합성 로그 생성 (실제 로그가 없을 때의 대체용)
+
+    - 생년월일: 최근 몇 년에 몰린 분포 (강아지 나이 분포)
+    - 견종: 인기 견종에 몰리고 드문 견종이 길게 이어지는 분포 (Zipf)
+    - /pillars/search: 평소에는 드물다가 몇 초 동안 몰리는 버스트
+    """
+    rng = random.Random(seed)
+    today = date(2025, 1, 1)
+    rare_breeds = [f"희귀견종{i}" for i in range(200)]
+    breeds = BREED_NAMES + rare_breeds
+    breed_weights = [1 / (rank + 1) ** 1.1 for rank in range(len(breeds))]
+
+    def birth_date():
+        age_days = min(int(rng.expovariate(1 / (4 * 365))), 20 * 365)
+        return (today - timedelta(days=age_days)).isoformat()
+
+    def pet():
+        return {"name": f"pet{rng.randrange(100_000)}",
+                "breed": rng.choices(breeds, breed_weights)[0],
+                "gender": rng.choice(("male", "female")),
+                "birth_date": birth_date()}
+
+    routes = [
+        (0.35, lambda: ("GET", "/pillars/", f"date={birth_date()}", None)),
+        (0.25, lambda: ("POST", "/pet/register", "", dict(pet(), birth_time=rng.choice((None, f"{rng.randrange(24):02d}:{rng.randrange(60):02d}"))))),
+        (0.15, lambda: ("GET", f"/pet/daily-fortune/{pet()['name']}", f"birth_date={birth_date()}", None)),
+        (0.10, lambda: ("POST", "/pet/compatibility", "", {"pet1_name": pet()["name"], "pet1_birth_date": birth_date(),
+                                                         "pet2_name": pet()["name"], "pet2_birth_date": birth_date()})),
+        (0.05, lambda: ("GET", "/pillars/date-range", "", None)),
+        (0.05, lambda: ("GET", "/pillars/search", f"pattern={rng.choice(SEXAGENARY_CYCLE)}{rng.choice('年月日')}", None)),
+        (0.05, lambda: ("GET", "/health", "", None)),
+    ]
+    weights = [weight for weight, _ in routes]
+
+    ts = time.time()
+    burst_until = 0.0
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(count):
+            ts += rng.expovariate(rate)
+            if ts > burst_until and rng.random() < 0.0005:
+                burst_until = ts + rng.uniform(1.0, 3.0)
+            if ts < burst_until and rng.random() < 0.6:
+                method, route_path, query, body = routes[5][1]()
+            else:
+                method, route_path, query, body = rng.choices(routes, weights)[0][1]()
+            f.write(json.dumps({"ts": round(ts, 6), "method": method, "path": route_path, "query": query,
+                                "body": body}, ensure_ascii=False) + "\n")
+
+def route_matcher():
+    """
+    요청 경로를 라우트 템플릿으로 묶는 함수 (/pet/daily-fortune/초코 -> GET /pet/daily-fortune/{pet_name})
+    """
+    from app.main import app
+
+    routes = [(route.path_regex, route.path, getattr(route, "methods", None) or set()) for route in app.routes
+              if hasattr(route, "path_regex")]
+
+    def match(method: str, request_path: str) -> str:
+        for regex, template, methods in routes:
+            if method in methods and regex.match(request_path):
+                return f"{method} {template}"
+        return f"{method} (unmatched)"
+
+    return match
+
+class ProcessSampler:
+    """
+    /proc으로 서버 프로세스 트리(uvicorn 부모 + 워커)의 CPU 시간과 RSS 측정 (Linux 전용)
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.peak_rss = 0
+        self.cpu_start = None
+
+    def _pids(self) -> List[int]:
+        pids, stack = [], [self.pid]
+        while stack:
+            pid = stack.pop()
+            pids.append(pid)
+            try:
+                with open(f"/proc/{pid}/task/{pid}/children") as f:
+                    stack.extend(int(child) for child in f.read().split())
+            except OSError:
+                pass
+        return pids
+
+    def sample(self):
+        cpu, rss = 0.0, 0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                cpu += (int(fields[11]) + int(fields[12])) / self.ticks
+                with open(f"/proc/{pid}/statm") as f:
+                    rss += int(f.read().split()[1]) * self.page_size
+            except (OSError, IndexError, ValueError):
+                continue
+        self.peak_rss = max(self.peak_rss, rss)
+        if self.cpu_start is None:
+            self.cpu_start = cpu
+        return cpu, rss
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    position = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[position]
+
+async def replay(records: List[Dict[str, Any]], client: httpx.AsyncClient, speed: float,
+                 max_in_flight: int, sampler: Optional[ProcessSampler] = None) -> Dict[str, Any]:
+    """
+    개방 루프 재생: 로그 시각(/speed)에 맞춰 요청을 보내고 응답은 기다리지 않음
+
+    Returns:
+        {"samples": [(라우트, 상태 코드, 예정 기준 지연, 서비스 시간)], "dropped", "max_in_flight",
+         "max_send_lag", "elapsed", "cpu_seconds", "peak_rss"}
+    """
+    match = route_matcher()
+    samples = []
+    in_flight = set()
+    state = {"dropped": 0, "max_in_flight": 0, "max_send_lag": 0.0}
+    loop = asyncio.get_running_loop()
+
+    async def send(record, route, scheduled):
+        sent = loop.time()
+        state["max_send_lag"] = max(state["max_send_lag"], sent - scheduled)
+        try:
+            response = await client.request(
+                record["method"], record["path"] + ("?" + record["query"] if record["query"] else ""),
+                json=record["body"] if record["body"] is not None else None
+            )
+            await response.aread()
+            status_code = response.status_code
+        except httpx.HTTPError:
+            status_code = 0
+        done = loop.time()
+        samples.append((route, status_code, done - scheduled, done - sent))
+
+    async def sample_resources(stop: asyncio.Event):
+        while not stop.is_set():
+            sampler.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), 0.5)
+            except asyncio.TimeoutError:
+                pass
+
+    stop = asyncio.Event()
+    sampler_task = asyncio.create_task(sample_resources(stop)) if sampler else None
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+    start = loop.time()
+    for record in records:
+        scheduled = start + record["offset"] / speed
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            # 보호용 상한: 넘치면 보내지 않고 기록 (개방 루프에서 서버가 완전히 밀린 상태)
+            state["dropped"] += 1
+            continue
+        task = asyncio.create_task(send(record, match(record["method"], record["path"]), scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        state["max_in_flight"] = max(state["max_in_flight"], len(in_flight))
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    elapsed = loop.time() - start
+    stop.set()
+
+    if sampler:
+        await sampler_task
+        cpu, _ = sampler.sample()
+        cpu_seconds, peak_rss = cpu - sampler.cpu_start, sampler.peak_rss
+    else:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        cpu_seconds = usage.ru_utime + usage.ru_stime - usage_start.ru_utime - usage_start.ru_stime
+        peak_rss = usage.ru_maxrss * 1024  # Linux: KB
+
+    return dict(state, samples=samples, elapsed=elapsed, cpu_seconds=cpu_seconds, peak_rss=peak_rss)
+
+def summarize(result: Dict[str, Any], requests: int) -> Dict[str, Any]:
+    """
+    라우트별 지연시간 백분위/오류율과 전체 요약
+    """
+    by_route = defaultdict(list)
+    for sample in result["samples"]:
+        by_route[sample[0]].append(sample)
+
+    routes = {}
+    for route, samples in sorted(by_route.items(), key=lambda item: -len(item[1])):
+        latencies = sorted(sample[2] * 1000 for sample in samples)
+        service = sorted(sample[3] * 1000 for sample in samples)
+        statuses = [sample[1] for sample in samples]
+        routes[route] = {
+            "count": len(samples),
+            **{f"p{pct}_ms": round(percentile(latencies, pct), 2) for pct in PERCENTILES},
+            "max_ms": round(latencies[-1], 2),
+            "service_p99_ms": round(percentile(service, 99), 2),
+            "client_errors": sum(1 for code in statuses if 400 <= code < 500),
+            "error_rate": round(sum(1 for code in statuses if code == 0 or code >= 500) / len(samples), 4),
+            "statuses": {str(code): statuses.count(code) for code in sorted(set(statuses))}
+        }
+
+    elapsed = result["elapsed"]
+    completed = len(result["samples"])
+    return {
+        "requests": requests,
+        "completed": completed,
+        "dropped": result["dropped"],
+        "elapsed_sec": round(elapsed, 3),
+        "throughput_rps": round(completed / max(elapsed, 1e-9), 1),
+        "max_in_flight": result["max_in_flight"],
+        "max_send_lag_ms": round(result["max_send_lag"] * 1000, 2),
+        "cpu_seconds": round(result["cpu_seconds"], 3),
+        "cpu_utilization": round(result["cpu_seconds"] / max(elapsed, 1e-9), 3),
+        "peak_rss_mb": round(result["peak_rss"] / 1024 / 1024, 1),
+        "routes": routes
+    }
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n요청 {report['requests']:,} / 완료 {report['completed']:,} / 미전송 {report['dropped']:,}  "
+          f"{report['elapsed_sec']:.1f}s  {report['throughput_rps']:,.1f} rps  "
+          f"최대 동시 {report['max_in_flight']}  최대 전송 지연 {report['max_send_lag_ms']:.1f}ms")
+    print(f"서버 CPU {report['cpu_seconds']:.2f}s (사용률 {report['cpu_utilization']:.0%})  "
+          f"최대 RSS {report['peak_rss_mb']:.1f}MB\n")
+    print(f"{'route':<42} {'count':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'svc p99':>8} {'4xx':>6} {'err%':>6}")
+    for route, stats in report["routes"].items():
+        print(f"{route[:42]:<42} {stats['count']:>7,} {stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} "
+              f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f} {stats['service_p99_ms']:>8.1f} "
+              f"{stats['client_errors']:>6,} {stats['error_rate']:>6.1%}")
+
+def start_server(workers: int) -> (subprocess.Popen, str):
+    """
+    로컬 uvicorn 실행 후 /health/ready가 200이 될 때까지 대기
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=SERVER_ROOT
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn이 시작 중 종료되었습니다")
+        try:
+            if httpx.get(base_url + "/health/ready", timeout=1.0).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn이 60초 안에 준비되지 않았습니다")
+
+async def run(args, records):
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    timeout = httpx.Timeout(args.timeout)
+    if args.url or args.server:
+        process, base_url = (None, args.url) if args.url else start_server(args.server_workers)
+        sampler = ProcessSampler(process.pid) if process else None
+        try:
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+                return await replay(records, client, args.speed, args.max_in_flight, sampler)
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+
+    from app.main import app
+    from app.services.pillars_service import get_pillars_service
+
+    get_pillars_service().warmup()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=timeout) as client:
+        return await replay(records, client, args.speed, args.max_in_flight)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="운영 트래픽 재생 벤치마크")
+    parser.add_argument("log", nargs="?", help="접근 로그 (JSONL)")
+    parser.add_argument("--synthesize", metavar="PATH", help="합성 로그를 PATH에 생성하고 종료")
+    parser.add_argument("--count", type=int, default=10_000, help="합성 로그 요청 수")
+    parser.add_argument("--rate", type=float, default=100.0, help="합성 로그 평균 초당 요청 수")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (2 = 두 배 빠르게)")
+    parser.add_argument("--limit", type=int, help="재생할 최대 요청 수")
+    parser.add_argument("--server", action="store_true", help="로컬 uvicorn을 띄워 재생")
+    parser.add_argument("--server-workers", type=int, default=1, help="--server 워커 수")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (예: http://127.0.0.1:8000)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="동시 요청 상한 (넘으면 미전송으로 기록)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--report", help="JSON 보고서 저장 경로")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize_log(args.synthesize, args.count, args.rate)
+        print(f"합성 로그 {args.count:,}건 -> {args.synthesize}")
+        sys.exit(0)
+    if not args.log:
+        parser.error("접근 로그 경로 또는 --synthesize가 필요합니다")
+
+    records = load_log(args.log, args.limit)
+    if not records:
+        parser.error("재생할 요청이 없습니다")
+    span = records[-1]["offset"] / args.speed
+    print(f"요청 {len(records):,}건 재생 ({span:.1f}초 예정, {args.speed}배속, "
+          f"대상: {args.url or ('로컬 uvicorn' if args.server else '프로세스 내 앱')})")
+
+    report = summarize(asyncio.run(run(args, records)), len(records))
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+연도별 만세력 정적 샤드 생성
+현재 만세력 데이터를 연도별 JSON 샤드(내용 해시 파일 이름)와 manifest.json으로 기록하여
+CDN/정적 호스팅에서 영구 캐시로 제공 (서버의 /calendar/* 와 같은 내용)
+
+사용 예시:
+    python build_calendar_shards.py                      # public/calendar/ 에 기록
+    python build_calendar_shards.py --output dist/calendar
+"""
+
+import argparse
+import os
+import sys
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.calendar_shards import MANIFEST_NAME, get_calendar_shards
+
+if __name__ == "__main__":
+    default_output = os.path.join(os.path.dirname(os.path.abspath(__file__)), "public", "calendar")
+    parser = argparse.ArgumentParser(description="🐾 PawStars 만세력 정적 샤드 생성")
+    parser.add_argument("--output", "-o", default=default_output, help="출력 디렉터리 (기본값: public/calendar)")
+    args = parser.parse_args()
+
+    print("📅 만세력 샤드 생성 중...")
+    shards = get_calendar_shards()
+    count = shards.write(args.output)
+    shard_bytes = sum(len(body) for name, body in shards.files.items() if name != MANIFEST_NAME)
+    print(f"✅ 샤드 {count - 1}개 + {MANIFEST_NAME} -> {args.output} "
+          f"(샤드 합계 {shard_bytes / 1024:,.1f}KB, 연평균 {shard_bytes / max(count - 1, 1) / 1024:,.2f}KB)")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+반려견 기록 오프라인 일괄 분석
+CSV/JSONL 파일의 반려견 기록을 프로세스 풀에서 분석하여 /pet/roster와 같은 형식(NDJSON/CSV)으로 저장
+데이터 이전, 백필 등 HTTP를 거치지 않는 대량 처리용
+
+사용 예시:
+    python bulk_analyze.py pets.csv more_pets.jsonl --output results.ndjson --workers 8
+    python bulk_analyze.py pets.csv --output results.csv --format csv
+"""
+
+import argparse
+import os
+import sys
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.bulk_analysis import INPUT_FORMATS, run_bulk_analysis
+
+def print_progress(stats):
+    print(f"  {stats['total']:>12,}건 (성공 {stats['ok']:,} / 오류 {stats['errors']:,})  "
+          f"{stats['pets_per_sec']:>10,.0f} pets/s  {stats['elapsed_sec']:.1f}s", flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="🐾 PawStars 반려견 기록 일괄 분석")
+    parser.add_argument("inputs", nargs="+", help="입력 파일 (CSV 또는 JSONL)")
+    parser.add_argument("--output", "-o", required=True, help="결과 파일 경로")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="결과 형식 (기본값: 출력 파일 확장자, 없으면 ndjson)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="입력 형식 (기본값: 파일 확장자)")
+    parser.add_argument("--workers", type=int, help="프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=2_000, help="작업 단위 기록 수")
+    args = parser.parse_args()
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "ndjson")
+
+    print("🔮 일괄 분석 시작...")
+    stats = run_bulk_analysis(
+        inputs=args.inputs,
+        output=args.output,
+        output_format=output_format,
+        input_format=args.input_format,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        progress=print_progress
+    )
+    print(f"✅ 완료: {stats['total']:,}건 (오류 {stats['errors']:,}건), {stats['elapsed_sec']:.2f}초, "
+          f"{stats['pets_per_sec']:,.0f} pets/s, 프로세스 {stats['workers']}개 -> {args.output}")
@@ -78,7 +78,7 @@ def generate_manseryeok_data():
             "solar_date": current_date.strftime("%Y-%m-%d"),
             "solar_ganzi": solar_ganzi,
             "jeolki": jeolki if jeolki else "",  # 빈 문자열로 명시적 처리
-            "lunar_date": "",  # 음력은 복잡하므로 생략
+            "lunar_date": "",  # 음력은 서버에서 app/utils/lunar_table.py로 계산
             "lunar_ganzi": ""
         })
         
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+음력 변환 테이블 생성 스크립트 (개발용)
+한국천문연구원(KASI) 기준 음양력 변환 라이브러리로 연도별 음력 달 크기/윤달/설날 위치를 구해
+app/utils/lunar_table.py의 비트필드 상수로 기록
+
+서버 실행에는 필요하지 않으며, 테이블 범위를 늘리거나 검증할 때만 사용
+    pip install korean-lunar-calendar
+    python generate_lunar_table.py --start 1900 --end 2049
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+try:
+    from korean_lunar_calendar import KoreanLunarCalendar
+except ImportError:
+    KoreanLunarCalendar = None
+
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "utils", "lunar_table.py")
+
+HEADER = '''"""
+음력 연도별 변환 테이블 (generate_lunar_table.py로 생성, 직접 수정하지 말 것)
+한국천문연구원 음양력 기준
+
+연도 하나를 정수 하나로 표현
+- 0~12비트: 해당 해의 달(윤달 포함, 순서대로)이 큰달(30일)이면 1, 작은달(29일)이면 0
+- 13~16비트: 윤달이 드는 달 (0이면 윤달 없음)
+- 17비트~: 음력 1월 1일의 양력 날짜 (LUNAR_EPOCH_ORDINAL로부터의 일수)
+"""
+
+'''
+
+def collect_years(start_year: int, end_year: int):
+    """
+    양력 날짜를 하루씩 음력으로 변환하여 음력 연도별 달 목록과 설날 수집
+
+    Returns:
+        {음력 연도: {"new_year": date, "months": [(월, 윤달 여부, 일수), ...]}}
+    """
+    calendar = KoreanLunarCalendar()
+    years = {}
+    day = date(start_year, 1, 1)
+    # 마지막 해의 마지막 달까지 포함하도록 다음 해 설날 이후까지 변환
+    last = date(end_year + 1, 3, 1)
+    while day <= last:
+        if not calendar.setSolarDate(day.year, day.month, day.day):
+            raise ValueError(f"변환할 수 없는 날짜: {day}")
+        year, month, leap = calendar.lunarYear, calendar.lunarMonth, bool(calendar.isIntercalation)
+        info = years.setdefault(year, {"new_year": None, "months": []})
+        if month == 1 and not leap and calendar.lunarDay == 1:
+            info["new_year"] = day
+        months = info["months"]
+        if months and months[-1][:2] == (month, leap):
+            months[-1] = (month, leap, months[-1][2] + 1)
+        else:
+            months.append((month, leap, 1))
+        day += timedelta(days=1)
+
+    return {
+        year: info for year, info in years.items()
+        if start_year <= year <= end_year and info["new_year"] is not None
+    }
+
+def encode_year(info, epoch: date) -> int:
+    months = info["months"]
+    if len(months) not in (12, 13) or months[0][:2] != (1, False):
+        raise ValueError(f"음력 달 목록이 올바르지 않습니다: {months}")
+
+    sizes = 0
+    leap_month = 0
+    for position, (month, leap, length) in enumerate(months):
+        if length not in (29, 30):
+            raise ValueError(f"음력 달 길이가 올바르지 않습니다: {month}월 {length}일")
+        if length == 30:
+            sizes |= 1 << position
+        if leap:
+            leap_month = month
+    return ((info["new_year"] - epoch).days << 17) | (leap_month << 13) | sizes
+
+def main():
+    parser = argparse.ArgumentParser(description="음력 변환 테이블 생성")
+    parser.add_argument("--start", type=int, default=1900, help="첫 음력 연도")
+    parser.add_argument("--end", type=int, default=2049, help="마지막 음력 연도")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="출력 파일 경로")
+    args = parser.parse_args()
+
+    if KoreanLunarCalendar is None:
+        sys.exit("korean-lunar-calendar 패키지가 필요합니다: pip install korean-lunar-calendar")
+
+    epoch = date(args.start, 1, 1)
+    years = collect_years(args.start, args.end)
+    missing = [year for year in range(args.start, args.end + 1) if year not in years]
+    if missing:
+        sys.exit(f"음력 연도 데이터가 없습니다: {missing}")
+
+    encoded = [encode_year(years[year], epoch) for year in range(args.start, args.end + 1)]
+
+    lines = [HEADER]
+    lines.append(f"LUNAR_BASE_YEAR = {args.start}\n")
+    lines.append(f"LUNAR_EPOCH_ORDINAL = {epoch.toordinal()}  # date({epoch.year}, 1, 1).toordinal()\n\n")
+    lines.append("LUNAR_YEAR_INFO = (\n")
+    for offset in range(0, len(encoded), 8):
+        row = ", ".join(f"0x{value:09x}" for value in encoded[offset:offset + 8])
+        lines.append(f"    {row},  # {args.start + offset}\n")
+    lines.append(")\n")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    print(f"✅ {args.start}~{args.end}년 음력 테이블 저장: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+일일 운세 사전 계산 작업
+등록부의 모든 반려견에 대해 해당 날짜 운세를 미리 계산하여 날짜별 저장소에 기록
+
+cron 예시 (매일 00:05):
+    5 0 * * * cd /path/to/fastapi-server && python precompute_fortunes.py
+
+만세력을 교체한 뒤에는 --refresh-stale로 이전 버전으로 분석된 반려견을 먼저 다시 분석합니다.
+"""
+
+import argparse
+import os
+import sys
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.daily_fortune import precompute_daily_fortunes
+
+def print_progress(stats):
+    total = stats["total"] or 1
+    print(f"  {stats['processed']:>10,} / {stats['total']:,} "
+          f"({stats['processed'] / total:6.1%})  {stats['pets_per_sec']:>12,.0f} pets/s  "
+          f"{stats['elapsed_sec']:.1f}s", flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="🐾 PawStars 일일 운세 사전 계산")
+    parser.add_argument("--date", help="운세 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    parser.add_argument("--workers", type=int, help="프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="작업 단위 크기")
+    parser.add_argument("--refresh-stale", action="store_true",
+                        help="계산 전에 이전 만세력 버전으로 분석된 반려견을 다시 분석")
+    args = parser.parse_args()
+
+    if args.refresh_stale:
+        from app.services.pet_service import pet_service
+
+        print("🔄 이전 만세력 버전으로 분석된 반려견 갱신 중...")
+        refreshed = pet_service.refresh_stale_pets()
+        print(f"   갱신 {refreshed['refreshed']:,}마리, 실패 {refreshed['failed']:,}마리")
+
+    print("🔮 일일 운세 사전 계산 시작...")
+    stats = precompute_daily_fortunes(
+        target_date=args.date,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        progress=print_progress
+    )
+    print(f"✅ {stats['target_date']} 완료: {stats['processed']:,}마리, "
+          f"{stats['elapsed_sec']:.2f}초, {stats['pets_per_sec']:,.0f} pets/s")
+    if stats["stale"]:
+        print(f"⚠️  이전 만세력 버전으로 분석된 {stats['stale']:,}마리는 건너뜀 (--refresh-stale로 갱신)")
@@ -23,6 +23,7 @@ if __name__ == "__main__":
         port=8000,
         reload=True,
         log_level="info",
-        access_log=True
+        # 요청 로그는 RequestLogMiddleware가 백그라운드 스레드로 기록 (uvicorn 접근 로그는 요청 경로에서 동기 기록)
+        access_log=False
     )
 
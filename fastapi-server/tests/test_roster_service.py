@@ -0,0 +1,25 @@
+"""
+명단 CSV 증분 파서 회귀 테스트
+
+실행:
+    cd fastapi-server && python -m pytest tests
+"""
+
+from app.services.roster_service import CsvRecordReader
+
+def feed_all(*chunks: bytes):
+    reader = CsvRecordReader()
+    records = []
+    for chunk in chunks:
+        records.extend(reader.feed(chunk))
+    records.extend(reader.feed(b"", final=True))
+    return records
+
+def test_crlf_split_between_chunks_does_not_add_empty_record():
+    assert feed_all(b"name,breed\r", b"\na,b\r\n") == [["name", "breed"], ["a", "b"]]
+
+def test_cr_only_line_endings_across_chunks():
+    assert feed_all(b"name,breed\r", b"a,b\r") == [["name", "breed"], ["a", "b"]]
+
+def test_quoted_line_break_split_between_chunks():
+    assert feed_all(b'name,"x\r', b'\ny",z\r\n') == [["name", "x\r\ny", "z"]]
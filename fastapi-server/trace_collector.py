@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+로컬 추적 수집기 (OTLP/HTTP JSON 수집기 대용)
+POST /v1/traces 로 받은 스팬을 JSON lines로 저장하고, 요청(트레이스)별 스팬 트리를 화면에 출력
+운영 수집기 없이 개발/부하 테스트 중에 느린 요청의 구간을 확인할 때 사용
+
+사용 예시:
+    python trace_collector.py --port 4318 --output traces.jsonl
+    PAWSTARS_TRACE_OTLP_ENDPOINT=http://127.0.0.1:4318/v1/traces PAWSTARS_TRACE_SAMPLE_RATE=1 python run_server.py
+"""
+
+import argparse
+import json
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def _attribute_value(value: dict):
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+def flatten_spans(payload: dict) -> list:
+    """
+    OTLP ExportTraceServiceRequest(JSON)의 스팬을 평평한 딕셔너리 리스트로 변환
+    """
+    spans = []
+    for resource_spans in payload.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for item in scope_spans.get("spans", []):
+                start_ns = int(item.get("startTimeUnixNano", 0))
+                end_ns = int(item.get("endTimeUnixNano", start_ns))
+                status = item.get("status") or {}
+                spans.append({
+                    "trace_id": item.get("traceId"),
+                    "span_id": item.get("spanId"),
+                    "parent_span_id": item.get("parentSpanId"),
+                    "name": item.get("name"),
+                    "start_ns": start_ns,
+                    "duration_ms": round((end_ns - start_ns) / 1e6, 3),
+                    "attributes": {attribute["key"]: _attribute_value(attribute.get("value", {}))
+                                   for attribute in item.get("attributes", [])},
+                    "error": status.get("message") if status.get("code") == 2 else None
+                })
+    return spans
+
+def format_trace(spans: list) -> str:
+    """
+    트레이스 하나의 스팬을 부모-자식 트리로 들여쓰기하여 문자열로 변환
+    """
+    span_ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    roots = []
+    for span in sorted(spans, key=lambda span: span["start_ns"]):
+        if span["parent_span_id"] in span_ids:
+            children[span["parent_span_id"]].append(span)
+        else:
+            roots.append(span)
+
+    lines = []
+    def walk(span, depth):
+        error = f"  ❌ {span['error']}" if span["error"] else ""
+        lines.append(f"{'  ' * depth}{span['name']:<{48 - 2 * depth}} {span['duration_ms']:>9.3f}ms{error}")
+        for child in children[span["span_id"]]:
+            walk(child, depth + 1)
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    output = None
+    quiet = False
+    lock = threading.Lock()
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/traces":
+            self.send_error(404)
+            return
+        if "json" not in self.headers.get("Content-Type", ""):
+            self.send_error(415, "OTLP/HTTP JSON만 지원합니다")
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            spans = flatten_spans(payload)
+        except (ValueError, TypeError, AttributeError) as e:
+            self.send_error(400, f"잘못된 요청 본문: {e}")
+            return
+
+        traces = defaultdict(list)
+        for span in spans:
+            traces[span["trace_id"]].append(span)
+        with self.lock:
+            if self.output:
+                with open(self.output, "a", encoding="utf-8") as f:
+                    for span in spans:
+                        f.write(json.dumps(span, ensure_ascii=False) + "\n")
+            if not self.quiet:
+                for trace_id, trace_spans in traces.items():
+                    print(f"── trace {trace_id} ({len(trace_spans)} spans)")
+                    print(format_trace(trace_spans), flush=True)
+
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="🐾 PawStars 로컬 추적 수집기 (OTLP/HTTP JSON)")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩 주소")
+    parser.add_argument("--port", type=int, default=4318, help="포트 (OTLP/HTTP 기본값 4318)")
+    parser.add_argument("--output", "-o", help="받은 스팬을 JSON lines로 추가 기록할 파일")
+    parser.add_argument("--quiet", action="store_true", help="스팬 트리를 출력하지 않음")
+    args = parser.parse_args()
+
+    CollectorHandler.output = args.output
+    CollectorHandler.quiet = args.quiet
+    server = ThreadingHTTPServer((args.host, args.port), CollectorHandler)
+    print(f"📡 추적 수집기 시작: http://{args.host}:{args.port}/v1/traces")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass